@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+In-memory access to Office files (.docx, .pptx, .xlsx) for scripted edits.
+
+OfficePackage opens a package as a lazy map of parts: XML parts are parsed
+with lxml on first access, and only parts that were modified are serialized
+(and condensed like pack.py does) when saving. Everything else is copied from
+the original archive untouched, so a scripted edit never materializes an
+unpacked directory.
+
+Example:
+    from office_package import OfficePackage
+
+    with OfficePackage("deck.pptx") as package:
+        slide = package["ppt/slides/slide1.xml"]
+        for t in slide.iter("{http://schemas.openxmlformats.org/drawingml/2006/main}t"):
+            t.text = t.text.replace("2024", "2025")
+        if package.validate():
+            package.save("deck-2025.pptx")
+"""
+
+import copy
+import hashlib
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+
+import lxml.etree
+
+from pack import condense_xml_bytes, validate_document
+from unpack import is_xml_part
+
+# Parser for package parts: no entity expansion and no network access
+XML_PARSER = lxml.etree.XMLParser(resolve_entities=False, no_network=True)
+
+
+class OfficePackage:
+    """An Office file opened as a lazy, writable map of part names to content.
+
+    Indexing an XML part returns its parsed lxml root element, which can be
+    edited in place. Modified trees are detected when saving, so no explicit
+    bookkeeping is needed. Binary parts are returned as bytes. Assigning bytes
+    or an element replaces a part (or adds a new one); `del` removes a part.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        if self.path.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
+            raise ValueError(f"{self.path} must be a .docx, .pptx, or .xlsx file")
+        self._open()
+
+    def _open(self):
+        self._zip = zipfile.ZipFile(self.path)
+        self._infos = {info.filename: info for info in self._zip.infolist()}
+        # Parsed XML trees and the digest of their serialization at parse time
+        self._trees = {}
+        self._parsed_digests = {}
+        # Parts replaced or added by assignment (bytes or elements)
+        self._replaced = {}
+        self._deleted = set()
+
+    def close(self):
+        """Close the underlying archive."""
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Mapping interface
+
+    def names(self):
+        """Return all part names, in archive order, with added parts last."""
+        names = [n for n in self._infos if n not in self._deleted]
+        names.extend(n for n in self._replaced if n not in self._infos)
+        return names
+
+    def __iter__(self):
+        return iter(self.names())
+
+    def __len__(self):
+        return len(self.names())
+
+    def __contains__(self, name):
+        return name not in self._deleted and (
+            name in self._infos or name in self._replaced
+        )
+
+    def __getitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        if name in self._trees:
+            return self._trees[name]
+        if not is_xml_part(name):
+            return self.read(name)
+
+        root = lxml.etree.fromstring(self.read(name), XML_PARSER)
+        self._trees[name] = root
+        if self._replaced.pop(name, None) is None and name in self._infos:
+            # Parsed from the original archive: remember its state for is_dirty
+            self._parsed_digests[name] = self._digest(root)
+        return root
+
+    def __setitem__(self, name, content):
+        self._deleted.discard(name)
+        self._trees.pop(name, None)
+        self._parsed_digests.pop(name, None)
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        if lxml.etree.iselement(content):
+            self._trees[name] = content
+        else:
+            self._replaced[name] = bytes(content)
+
+    def __delitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        self._trees.pop(name, None)
+        self._parsed_digests.pop(name, None)
+        self._replaced.pop(name, None)
+        if name in self._infos:
+            self._deleted.add(name)
+
+    def read(self, name):
+        """Return the current content of a part as bytes."""
+        if name not in self:
+            raise KeyError(name)
+        if name in self._trees:
+            return self._serialize(self._trees[name])
+        if name in self._replaced:
+            return self._replaced[name]
+        return self._zip.read(self._infos[name])
+
+    # Change tracking
+
+    def is_dirty(self, name):
+        """Check whether a part differs from the original archive."""
+        if name in self._deleted:
+            return True
+        if name not in self._infos:
+            return name in self
+        if name in self._replaced:
+            return True
+        if name in self._trees:
+            digest = self._parsed_digests.get(name)
+            return digest is None or digest != self._digest(self._trees[name])
+        return False
+
+    def dirty_parts(self):
+        """Return the names of parts that were modified, added or deleted."""
+        candidates = set(self._trees) | set(self._replaced) | self._deleted
+        return sorted(name for name in candidates if self.is_dirty(name))
+
+    # Validation and saving
+
+    def validate(self, schema=False, verbose=False):
+        """Validate the package the way the unpack/pack workflow does.
+
+        Every modified XML part is re-parsed, then the package is converted
+        with soffice (pack.validate_document). With schema=True the XSD
+        validators of validate.py also run; they operate on files, so this
+        one check unpacks a temporary copy.
+
+        Returns:
+            bool: True if all checks pass
+        """
+        for name in self.dirty_parts():
+            if name in self and is_xml_part(name):
+                try:
+                    lxml.etree.fromstring(self.read(name), XML_PARSER)
+                except lxml.etree.XMLSyntaxError as e:
+                    print(f"Validation error: {name}: {e}")
+                    return False
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            candidate = Path(temp_dir) / f"candidate{self.path.suffix}"
+            self._write(candidate)
+
+            if schema and not self._validate_schemas(candidate, temp_dir, verbose):
+                return False
+            return validate_document(candidate)
+
+    def _validate_schemas(self, candidate, temp_dir, verbose):
+        from unpack import unpack_document
+        from validation import (
+            DOCXSchemaValidator,
+            PPTXSchemaValidator,
+            RedliningValidator,
+        )
+
+        match self.path.suffix.lower():
+            case ".docx":
+                validators = [DOCXSchemaValidator, RedliningValidator]
+            case ".pptx":
+                validators = [PPTXSchemaValidator]
+            case _:
+                return True
+
+        unpacked_dir = Path(temp_dir) / "unpacked"
+        unpack_document(candidate, unpacked_dir)
+        return all(
+            V(unpacked_dir, self.path, verbose=verbose).validate() for V in validators
+        )
+
+    def save(self, path=None):
+        """Write the package, serializing only modified parts.
+
+        Args:
+            path: Output file (default: overwrite the opened file)
+        """
+        path = Path(path) if path else self.path
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, temp_name = tempfile.mkstemp(suffix=path.suffix, dir=path.parent)
+        os.close(fd)
+        try:
+            self._write(Path(temp_name))
+            os.replace(temp_name, path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+        if path.resolve() == self.path.resolve():
+            # The saved file is now the baseline for further edits
+            self.close()
+            self._open()
+
+    def _write(self, output_file):
+        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name in self.names():
+                if name in self._infos and not self.is_dirty(name):
+                    info = self._infos[name]
+                    # writestr updates the ZipInfo it is given, so pass a copy
+                    zf.writestr(copy.copy(info), self._zip.read(info))
+                elif is_xml_part(name):
+                    zf.writestr(name, condense_xml_bytes(self.read(name)))
+                else:
+                    zf.writestr(name, self.read(name))
+
+    @staticmethod
+    def _serialize(root):
+        return lxml.etree.tostring(
+            root, xml_declaration=True, encoding="UTF-8", standalone=True
+        )
+
+    @staticmethod
+    def _digest(root):
+        return hashlib.sha1(lxml.etree.tostring(root)).digest()
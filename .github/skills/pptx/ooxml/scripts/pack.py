@@ -3,7 +3,13 @@
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--original <file>]
+
+Directories produced by a partial unpack (unpack.py --parts/--slides) are
+recombined with the untouched entries of the original file automatically.
+When the original file is still in place, parts that were not edited since
+unpacking (see unpack.changed_parts) are copied from it unchanged, so only
+edited parts are condensed and recompressed.
 """
 
 import argparse
@@ -15,17 +21,28 @@ import defusedxml.minidom
 import zipfile
 from pathlib import Path
 
+from soffice_service import ConversionError, convert_document
+from unpack import MANIFEST_NAME, changed_parts, read_manifest, source_unchanged
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "--original",
+        help="Original Office file to take parts missing from the directory from "
+        "(defaults to the source of a partial unpack)",
+    )
     args = parser.parse_args()
 
     try:
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            original=args.original,
         )
 
         # Show warning if validation was skipped
@@ -42,13 +59,16 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(input_dir, output_file, validate=False, original=None):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        original: Optional original Office file. Entries the directory does not
+            contain are copied from it unchanged, in their original order.
+            Defaults to the source recorded by a partial unpack.
 
     Returns:
         bool: True if successful, False if validation failed
@@ -61,10 +81,35 @@ def pack_document(input_dir, output_file, validate=False):
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
+    # A partial unpack can only be packed together with its original file
+    manifest = read_manifest(input_dir)
+    if original is None and manifest and manifest["partial"]:
+        original = manifest["source"]
+    if original is not None and not Path(original).is_file():
+        raise ValueError(f"Original file {original} not found")
+    extracted = set(manifest["extracted"]) if manifest else set()
+
+    # Parts nobody touched since unpacking are copied from the original file
+    # as they are instead of being condensed again
+    unchanged = set()
+    if manifest and source_unchanged(manifest):
+        if original is None or Path(original).resolve() == Path(manifest["source"]):
+            original = manifest["source"]
+            unchanged = extracted - set(changed_parts(input_dir, manifest))
+            extracted -= unchanged
+
+    def ignore(directory, names):
+        relative = Path(directory).relative_to(input_dir)
+        return {
+            n
+            for n in names
+            if n == MANIFEST_NAME or (relative / n).as_posix() in unchanged
+        }
+
     # Work in temporary directory to avoid modifying original
     with tempfile.TemporaryDirectory() as temp_dir:
         temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
+        shutil.copytree(input_dir, temp_content_dir, ignore=ignore)
 
         # Process XML files to remove pretty-printing whitespace
         for pattern in ["*.xml", "*.rels"]:
@@ -74,9 +119,12 @@ def pack_document(input_dir, output_file, validate=False):
         # Create final Office file as zip archive
         output_file.parent.mkdir(parents=True, exist_ok=True)
         with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
+            if original is not None:
+                merge_original_entries(zf, temp_content_dir, Path(original), extracted)
+            else:
+                for f in temp_content_dir.rglob("*"):
+                    if f.is_file():
+                        zf.write(f, f.relative_to(temp_content_dir))
 
         # Validate if requested
         if validate:
@@ -87,8 +135,37 @@ def pack_document(input_dir, output_file, validate=False):
     return True
 
 
+def merge_original_entries(zf, content_dir, original_file, extracted):
+    """Write the directory contents merged with the entries of the original file.
+
+    Entries keep the order of the original archive. Files present in the
+    directory replace the original entry; entries that were never extracted
+    are copied from the original; extracted entries that were deleted from the
+    directory stay deleted. New files are appended at the end.
+    """
+    written = set()
+    with zipfile.ZipFile(original_file) as original:
+        for info in original.infolist():
+            local_file = content_dir / info.filename
+            if local_file.is_file():
+                zf.write(local_file, info.filename)
+            elif info.filename not in extracted:
+                zf.writestr(info, original.read(info))
+            written.add(info.filename)
+
+    for f in content_dir.rglob("*"):
+        if f.is_file():
+            name = f.relative_to(content_dir).as_posix()
+            if name not in written:
+                zf.write(f, name)
+
+
 def validate_document(doc_path):
-    """Validate document by converting to HTML with soffice."""
+    """Validate document by converting to HTML with soffice.
+
+    Uses the conversion service (soffice_service.py) when it is running, so
+    no soffice cold start is paid per pack; otherwise spawns soffice once.
+    """
     # Determine the correct filter based on file extension
     match doc_path.suffix.lower():
         case ".docx":
@@ -100,24 +177,7 @@ def validate_document(doc_path):
 
     with tempfile.TemporaryDirectory() as temp_dir:
         try:
-            result = subprocess.run(
-                [
-                    "soffice",
-                    "--headless",
-                    "--convert-to",
-                    filter_name,
-                    "--outdir",
-                    temp_dir,
-                    str(doc_path),
-                ],
-                capture_output=True,
-                timeout=10,
-                text=True,
-            )
-            if not (Path(temp_dir) / f"{doc_path.stem}.html").exists():
-                error_msg = result.stderr.strip() or "Document validation failed"
-                print(f"Validation error: {error_msg}", file=sys.stderr)
-                return False
+            convert_document(doc_path, temp_dir, filter_name, timeout=10)
             return True
         except FileNotFoundError:
             print("Warning: soffice not found. Skipping validation.", file=sys.stderr)
@@ -125,6 +185,9 @@ def validate_document(doc_path):
         except subprocess.TimeoutExpired:
             print("Validation error: Timeout during conversion", file=sys.stderr)
             return False
+        except ConversionError as e:
+            print(f"Validation error: {e}", file=sys.stderr)
+            return False
         except Exception as e:
             print(f"Validation error: {e}", file=sys.stderr)
             return False
@@ -135,6 +198,22 @@ def condense_xml(xml_file):
     with open(xml_file, "r", encoding="utf-8") as f:
         dom = defusedxml.minidom.parse(f)
 
+    condense_dom(dom)
+
+    # Write back the condensed XML
+    with open(xml_file, "wb") as f:
+        f.write(dom.toxml(encoding="UTF-8"))
+
+
+def condense_xml_bytes(content):
+    """Return XML content (bytes) with whitespace and comments stripped."""
+    dom = defusedxml.minidom.parseString(content)
+    condense_dom(dom)
+    return dom.toxml(encoding="UTF-8")
+
+
+def condense_dom(dom):
+    """Remove whitespace-only text nodes and comments from a minidom document."""
     # Process each element to remove whitespace and comments
     for element in dom.getElementsByTagName("*"):
         # Skip w:t elements and their processing
@@ -150,10 +229,6 @@ def condense_xml(xml_file):
             ) or child.nodeType == child.COMMENT_NODE:
                 element.removeChild(child)
 
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
-
 
 if __name__ == "__main__":
     main()
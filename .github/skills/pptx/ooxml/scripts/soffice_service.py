@@ -0,0 +1,586 @@
+#!/usr/bin/env python3
+"""
+Long-lived LibreOffice conversion service shared by pack.py and thumbnail.py.
+
+Starting soffice takes several seconds, which dominates one-off conversions
+and makes short timeouts fail under load. This service keeps a pool of
+headless office workers behind a local socket and queues conversions for
+them. Clients call convert_document(), which uses the service when it is
+running and falls back to a one-shot `soffice --convert-to` otherwise.
+
+Each worker owns a private user profile. When the LibreOffice Python bridge
+(`uno`) is importable, the worker keeps one soffice process listening and
+converts through it; otherwise it spawns soffice per conversion against its
+already-initialized profile, which still skips first-start profile creation.
+Workers are health-checked periodically and restarted when soffice dies or a
+conversion times out.
+
+Usage:
+    python soffice_service.py start [--workers N] [--socket PATH]
+    python soffice_service.py status
+    python soffice_service.py stop
+    python soffice_service.py convert <file> --to pdf [--outdir DIR]
+"""
+
+import argparse
+import json
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+SOFFICE = "soffice"
+
+# Environment variable overriding the service socket path
+SOCKET_ENV = "SOFFICE_SERVICE_SOCKET"
+
+DEFAULT_WORKERS = 2
+DEFAULT_TIMEOUT = 60  # Seconds per conversion (queue wait not included)
+HEALTH_CHECK_INTERVAL = 30  # Seconds between worker health checks
+STARTUP_TIMEOUT = 60  # Seconds to wait for a worker's soffice to come up
+QUEUE_WAIT_LIMIT = 600  # Seconds a client waits for a queued conversion
+
+# Export filters used with the uno backend when --convert-to names only an
+# extension (soffice picks these itself on the command line)
+DEFAULT_FILTERS = {
+    ("pdf", ".pptx"): "impress_pdf_Export",
+    ("pdf", ".docx"): "writer_pdf_Export",
+    ("pdf", ".xlsx"): "calc_pdf_Export",
+}
+
+
+class ConversionError(RuntimeError):
+    """Raised when a document could not be converted."""
+
+
+class ServiceUnavailable(OSError):
+    """Raised when no conversion service accepts connections on the socket."""
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Persistent LibreOffice conversion service"
+    )
+    parser.add_argument("--socket", default=None, help="Service socket path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    start_parser = subparsers.add_parser("start", help="Run the service")
+    start_parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Number of office workers (default: {DEFAULT_WORKERS})",
+    )
+    start_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"Default per-conversion timeout in seconds (default: {DEFAULT_TIMEOUT})",
+    )
+    subparsers.add_parser("status", help="Show worker and queue status")
+    subparsers.add_parser("stop", help="Stop a running service")
+
+    convert_parser = subparsers.add_parser("convert", help="Convert a document")
+    convert_parser.add_argument("input", help="Document to convert")
+    convert_parser.add_argument(
+        "--to", required=True, help="soffice --convert-to target (e.g. pdf)"
+    )
+    convert_parser.add_argument("--outdir", default=".", help="Output directory")
+    convert_parser.add_argument("--timeout", type=float, default=None)
+    args = parser.parse_args()
+
+    socket_path = Path(args.socket) if args.socket else default_socket_path()
+
+    if args.command == "start":
+        if socket_path is None:
+            sys.exit("Error: local sockets are not supported on this platform")
+        ConversionService(socket_path, args.workers, args.timeout).serve_forever()
+    elif args.command in ("status", "stop"):
+        try:
+            response = send_request({"command": args.command}, socket_path)
+        except OSError:
+            sys.exit("Conversion service is not running")
+        print(json.dumps(response, indent=2))
+    else:
+        try:
+            output = convert_document(
+                args.input,
+                args.outdir,
+                args.to,
+                timeout=args.timeout,
+                socket_path=socket_path,
+            )
+        except (ConversionError, subprocess.TimeoutExpired) as e:
+            sys.exit(f"Error: {e}")
+        print(output)
+
+
+def default_socket_path():
+    """Return the per-user service socket path, or None without AF_UNIX support."""
+    if os.environ.get(SOCKET_ENV):
+        return Path(os.environ[SOCKET_ENV])
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    return Path(tempfile.gettempdir()) / f"soffice-service-{os.getuid()}.sock"
+
+
+def output_path_for(doc_path, outdir, convert_to):
+    """Return the file soffice writes for a --convert-to target."""
+    extension = convert_to.split(":", 1)[0]
+    return Path(outdir) / f"{Path(doc_path).stem}.{extension}"
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+
+def convert_document(doc_path, outdir, convert_to, timeout=None, socket_path=None):
+    """Convert a document with soffice, preferring the running service.
+
+    Args:
+        doc_path: Document to convert
+        outdir: Directory to write the converted file to
+        convert_to: soffice --convert-to target (e.g. "pdf" or "html:HTML")
+        timeout: Seconds allowed for the conversion itself. Time spent waiting
+            in the service queue does not count against it.
+        socket_path: Service socket (default: default_socket_path())
+
+    Returns:
+        Path: The converted file
+
+    Raises:
+        ConversionError: If the conversion failed
+        subprocess.TimeoutExpired: If the conversion timed out, or the
+            service did not answer within QUEUE_WAIT_LIMIT
+        FileNotFoundError: If soffice is not installed (one-shot fallback only)
+    """
+    doc_path = Path(doc_path).resolve()
+    outdir = Path(outdir).resolve()
+    socket_path = socket_path or default_socket_path()
+
+    request = {
+        "command": "convert",
+        "input": str(doc_path),
+        "outdir": str(outdir),
+        "convert_to": convert_to,
+        "timeout": timeout,
+    }
+    try:
+        response = send_request(request, socket_path)
+    except ServiceUnavailable:
+        # Service not running (or not supported here): spawn soffice once
+        return convert_once(doc_path, outdir, convert_to, timeout)
+    except socket.timeout:
+        # The request was sent and may still be queued or running, so it is
+        # not repeated
+        raise subprocess.TimeoutExpired(SOFFICE, QUEUE_WAIT_LIMIT)
+    except (OSError, ValueError) as e:
+        raise ConversionError(f"Conversion service failed: {e}") from e
+
+    if response.get("timeout"):
+        raise subprocess.TimeoutExpired(SOFFICE, timeout or DEFAULT_TIMEOUT)
+    if not response.get("ok"):
+        raise ConversionError(response.get("error") or "Conversion failed")
+    return Path(response["output"])
+
+
+def send_request(request, socket_path=None):
+    """Send one JSON request to the service and return its JSON response.
+
+    Raises:
+        ServiceUnavailable: If the service is not reachable (nothing was sent)
+        socket.timeout: If no response came within QUEUE_WAIT_LIMIT
+        OSError: If the connection failed after the request was sent
+    """
+    socket_path = socket_path or default_socket_path()
+    if socket_path is None or not Path(socket_path).exists():
+        raise ServiceUnavailable("Conversion service socket not found")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(QUEUE_WAIT_LIMIT)
+        try:
+            sock.connect(str(socket_path))
+        except OSError as e:
+            raise ServiceUnavailable(f"Conversion service not reachable: {e}") from e
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("Conversion service closed the connection")
+    return json.loads(line)
+
+
+def convert_once(doc_path, outdir, convert_to, timeout=None, profile_dir=None):
+    """Convert a document by spawning soffice for this one conversion."""
+    command = [SOFFICE]
+    if profile_dir is not None:
+        command.append(f"-env:UserInstallation={Path(profile_dir).as_uri()}")
+    command += ["--headless", "--convert-to", convert_to, "--outdir", str(outdir)]
+    command.append(str(doc_path))
+
+    result = subprocess.run(command, capture_output=True, timeout=timeout, text=True)
+    output = output_path_for(doc_path, outdir, convert_to)
+    if not output.exists():
+        raise ConversionError(result.stderr.strip() or "Conversion produced no output")
+    return output
+
+
+# ---------------------------------------------------------------------------
+# Service
+# ---------------------------------------------------------------------------
+
+
+class _ConversionJob:
+    """A queued conversion request and its eventual response."""
+
+    def __init__(self, request):
+        self.request = request
+        self.response = None
+        self.done = threading.Event()
+
+
+class _SpawnBackend:
+    """Spawn soffice per conversion against the worker's warm profile."""
+
+    name = "spawn"
+
+    def __init__(self, profile_dir):
+        self.profile_dir = profile_dir
+
+    def start(self):
+        # First start creates the profile; later conversions reuse it
+        subprocess.run(
+            [
+                SOFFICE,
+                f"-env:UserInstallation={self.profile_dir.as_uri()}",
+                "--headless",
+                "--terminate_after_init",
+            ],
+            capture_output=True,
+            timeout=STARTUP_TIMEOUT,
+        )
+
+    def stop(self):
+        pass
+
+    def healthy(self):
+        return shutil.which(SOFFICE) is not None
+
+    def convert(self, doc_path, outdir, convert_to, timeout):
+        return convert_once(doc_path, outdir, convert_to, timeout, self.profile_dir)
+
+
+class _UnoBackend:
+    """Keep one soffice process listening and convert through the uno bridge."""
+
+    name = "uno"
+
+    def __init__(self, profile_dir):
+        self.profile_dir = profile_dir
+        self.process = None
+        self.desktop = None
+        self.timed_out = False
+
+    def start(self):
+        import uno
+
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        connection = (
+            f"socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"
+        )
+
+        self.process = subprocess.Popen(
+            [
+                SOFFICE,
+                f"-env:UserInstallation={self.profile_dir.as_uri()}",
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--nodefault",
+                "--norestore",
+                f"--accept={connection}",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            try:
+                context = resolver.resolve(f"uno:{connection}")
+                break
+            except Exception:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.stop()
+                    raise ConversionError("soffice did not start")
+                time.sleep(0.25)
+        self.desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            try:
+                self.desktop.terminate()
+                self.process.wait(timeout=10)
+            except Exception:
+                self.process.kill()
+                self.process.wait()
+        self.process = None
+        self.desktop = None
+
+    def healthy(self):
+        if self.process is None or self.process.poll() is not None:
+            return False
+        try:
+            self.desktop.getComponents()
+            return True
+        except Exception:
+            return False
+
+    def convert(self, doc_path, outdir, convert_to, timeout):
+        import uno
+        from com.sun.star.beans import PropertyValue
+
+        def prop(name, value):
+            p = PropertyValue()
+            p.Name, p.Value = name, value
+            return p
+
+        extension, _, filter_name = convert_to.partition(":")
+        filter_name = filter_name or DEFAULT_FILTERS.get(
+            (extension, Path(doc_path).suffix.lower())
+        )
+        if not filter_name:
+            raise ConversionError(f"No export filter known for '{convert_to}'")
+        output = output_path_for(doc_path, outdir, convert_to)
+
+        # Killing soffice makes the blocking uno call fail, which is how a
+        # timeout is enforced; the worker restarts the backend afterwards
+        self.timed_out = False
+        timer = threading.Timer(timeout, self._kill_on_timeout)
+        timer.start()
+        try:
+            document = self.desktop.loadComponentFromURL(
+                uno.systemPathToFileUrl(str(doc_path)),
+                "_blank",
+                0,
+                (prop("Hidden", True),),
+            )
+            try:
+                document.storeToURL(
+                    uno.systemPathToFileUrl(str(output)),
+                    (prop("FilterName", filter_name),),
+                )
+            finally:
+                document.close(True)
+        except Exception as e:
+            if self.timed_out:
+                raise subprocess.TimeoutExpired(SOFFICE, timeout)
+            raise ConversionError(str(e) or type(e).__name__)
+        finally:
+            timer.cancel()
+
+        if not output.exists():
+            raise ConversionError("Conversion produced no output")
+        return output
+
+    def _kill_on_timeout(self):
+        self.timed_out = True
+        if self.process is not None:
+            self.process.kill()
+
+
+class _Worker(threading.Thread):
+    """Takes jobs from the shared queue and runs them on its own backend."""
+
+    def __init__(self, index, jobs, default_timeout, root_dir):
+        super().__init__(name=f"soffice-worker-{index}", daemon=True)
+        self.index = index
+        self.jobs = jobs
+        self.default_timeout = default_timeout
+        self.lock = threading.Lock()
+        self.conversions = 0
+        self.restarts = 0
+        self.last_error = None
+
+        profile_dir = Path(root_dir) / f"profile-{index}"
+        try:
+            import uno  # noqa: F401
+
+            self.backend = _UnoBackend(profile_dir)
+        except ImportError:
+            self.backend = _SpawnBackend(profile_dir)
+
+    def run(self):
+        self._start_backend()
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            with self.lock:
+                job.response = self._convert(job.request)
+            job.done.set()
+        self.backend.stop()
+
+    def _start_backend(self):
+        try:
+            self.backend.start()
+        except Exception as e:
+            self.last_error = f"start failed: {e}"
+
+    def restart(self):
+        """Restart the backend (caller must hold self.lock)."""
+        self.backend.stop()
+        self.restarts += 1
+        self._start_backend()
+
+    def check_health(self):
+        """Restart the backend if it is unhealthy and not busy."""
+        if not self.lock.acquire(blocking=False):
+            return  # Busy converting, which is a health signal in itself
+        try:
+            if not self.backend.healthy():
+                self.restart()
+        finally:
+            self.lock.release()
+
+    def _convert(self, request):
+        timeout = request.get("timeout") or self.default_timeout
+        try:
+            output = self.backend.convert(
+                Path(request["input"]),
+                Path(request["outdir"]),
+                request["convert_to"],
+                timeout,
+            )
+            self.conversions += 1
+            return {"ok": True, "output": str(output)}
+        except subprocess.TimeoutExpired:
+            self.last_error = "timeout"
+            self.restart()
+            return {"ok": False, "timeout": True, "error": "Timeout during conversion"}
+        except Exception as e:
+            self.last_error = str(e)
+            if not self.backend.healthy():
+                self.restart()
+            return {"ok": False, "error": str(e)}
+
+    def status(self):
+        return {
+            "name": self.name,
+            "backend": self.backend.name,
+            "busy": self.lock.locked(),
+            "conversions": self.conversions,
+            "restarts": self.restarts,
+            "last_error": self.last_error,
+        }
+
+
+class ConversionService:
+    """Worker pool serving conversion requests on a Unix socket."""
+
+    def __init__(self, socket_path, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT):
+        self.socket_path = Path(socket_path)
+        self.jobs = queue.Queue()
+        self.worker_count = max(1, workers)
+        self.timeout = timeout
+        # Created by serve_forever once no other service is running
+        self.root_dir = None
+        self.workers = []
+        self.stopping = threading.Event()
+
+    def serve_forever(self):
+        if self.socket_path.exists():
+            try:
+                send_request({"command": "status"}, self.socket_path)
+                sys.exit(f"Error: service already running on {self.socket_path}")
+            except ServiceUnavailable:
+                self.socket_path.unlink()  # Stale socket from a dead service
+
+        self.root_dir = tempfile.mkdtemp(prefix="soffice-service-")
+        self.workers = [
+            _Worker(i, self.jobs, self.timeout, self.root_dir)
+            for i in range(self.worker_count)
+        ]
+        for worker in self.workers:
+            worker.start()
+        threading.Thread(target=self._monitor, daemon=True).start()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(self.socket_path))
+        server.listen()
+        server.settimeout(1.0)
+        print(
+            f"Conversion service listening on {self.socket_path} "
+            f"with {len(self.workers)} worker(s)"
+        )
+        try:
+            while not self.stopping.is_set():
+                try:
+                    connection, _ = server.accept()
+                except socket.timeout:
+                    continue
+                threading.Thread(
+                    target=self._handle, args=(connection,), daemon=True
+                ).start()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+            self.socket_path.unlink(missing_ok=True)
+            for _ in self.workers:
+                self.jobs.put(None)
+            for worker in self.workers:
+                worker.join(timeout=15)
+            shutil.rmtree(self.root_dir, ignore_errors=True)
+
+    def _handle(self, connection):
+        with connection, connection.makefile("rwb") as stream:
+            try:
+                request = json.loads(stream.readline())
+                response = self._dispatch(request)
+            except Exception as e:
+                response = {"ok": False, "error": f"Bad request: {e}"}
+            stream.write(json.dumps(response).encode("utf-8") + b"\n")
+            stream.flush()
+
+    def _dispatch(self, request):
+        command = request.get("command")
+        if command == "convert":
+            job = _ConversionJob(request)
+            self.jobs.put(job)
+            job.done.wait()
+            return job.response
+        if command == "status":
+            return {
+                "ok": True,
+                "queued": self.jobs.qsize(),
+                "workers": [worker.status() for worker in self.workers],
+            }
+        if command == "stop":
+            self.stopping.set()
+            return {"ok": True}
+        return {"ok": False, "error": f"Unknown command '{command}'"}
+
+    def _monitor(self):
+        while not self.stopping.wait(HEALTH_CHECK_INTERVAL):
+            for worker in self.workers:
+                worker.check_health()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,603 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""
+Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
 
+Example usage:
+    python unpack.py <office_file> <output_dir>
+    python unpack.py <office_file> <output_dir> --slides 3-5
+    python unpack.py <office_file> <output_dir> --parts ppt/slides/slide3.xml
+    python unpack.py <office_file> <output_dir> --encoding utf-8
+
+With --parts or --slides only the requested parts and their relationship
+closure are extracted. Binary parts in the closure (images, media, embedded
+objects) are left in the original file and listed as lazy entries; request
+them explicitly with --parts to materialize them later. pack.py recombines a
+partial unpack with the untouched entries of the original file.
+
+XML parts are pretty-printed while streaming out of the archive, so memory
+use stays bounded regardless of part size. By default non-ASCII characters are
+written as numeric character references; --encoding utf-8 keeps them as text,
+which keeps e.g. Japanese decks readable and several times smaller.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import posixpath
 import random
+import re
 import sys
 import defusedxml.minidom
+import defusedxml.sax
 import zipfile
 from pathlib import Path
+from xml.sax.handler import ContentHandler, property_lexical_handler
+from xml.sax.saxutils import escape
+
+# Written into the output directory so pack.py can find the original file
+MANIFEST_NAME = ".unpack.json"
+
+# Hash used for the canonical content of parts recorded in the manifest
+HASH_ALGORITHM = "sha256"
+
+# Chunk size for copying and hashing binary parts
+COPY_CHUNK_SIZE = 1024 * 1024
+
+XML_SUFFIXES = (".xml", ".rels")
+
+ENCODINGS = ("ascii", "utf-8")
+
+# Characters escaped in attribute values so they survive a parse round-trip
+ATTRIBUTE_ENTITIES = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#9;"}
+
+# Relationship types that are never followed when computing the closure
+# (a hyperlink from one slide to another does not make it part of the edit)
+SKIPPED_RELATIONSHIP_TYPES = {
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Unpack an Office file and pretty-print its XML parts"
+    )
+    parser.add_argument("office_file", help="Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_dir", help="Directory to unpack into")
+    parser.add_argument(
+        "--parts",
+        help="Comma-separated part names to extract with their relationship closure "
+        "(e.g. ppt/slides/slide3.xml,ppt/media/image1.png)",
+    )
+    parser.add_argument(
+        "--slides",
+        help="Slide numbers to extract with their relationship closure, matching "
+        "ppt/slides/slide{N}.xml (e.g. 3-5 or 1,4,7-9)",
+    )
+    parser.add_argument(
+        "--encoding",
+        choices=ENCODINGS,
+        default="ascii",
+        help="Encoding of the pretty-printed XML (default: ascii, which writes "
+        "non-ASCII characters as character references)",
+    )
+    args = parser.parse_args()
+
+    parts = None
+    try:
+        if args.parts or args.slides:
+            parts = []
+            if args.parts:
+                parts.extend(p.strip() for p in args.parts.split(",") if p.strip())
+            if args.slides:
+                parts.extend(
+                    f"ppt/slides/slide{n}.xml" for n in parse_slide_numbers(args.slides)
+                )
+        extracted = unpack_document(
+            args.office_file, args.output_dir, parts=parts, encoding=args.encoding
+        )
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+
+    if parts is not None:
+        print(f"Extracted {len(extracted)} part(s) to {args.output_dir}")
+
+    # For .docx files, suggest an RSID for tracked changes
+    if args.office_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+def unpack_document(input_file, output_dir, parts=None, encoding="ascii"):
+    """Unpack an Office file and pretty-print its XML parts.
+
+    Args:
+        input_file: Path to the Office file (.docx/.pptx/.xlsx)
+        output_dir: Directory to unpack into
+        parts: Optional list of part names. When given, only these parts and
+            the XML parts of their relationship closure are extracted; binary
+            parts of the closure are recorded as lazy entries instead.
+        encoding: Encoding of the pretty-printed XML ("ascii" or "utf-8")
+
+    Returns:
+        list: Names of the parts written to output_dir
+    """
+    input_file = Path(input_file)
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    with zipfile.ZipFile(input_file) as zf:
+        # Directory entries (as written by zip -r) are not parts
+        names = [info.filename for info in zf.infolist() if not info.is_dir()]
+
+        if parts is None:
+            selected, lazy = names, []
+        else:
+            missing = [p for p in parts if p not in names]
+            if missing:
+                raise ValueError(
+                    f"Part(s) not found in {input_file}: {', '.join(missing)}"
+                )
+
+            closure = relationship_closure(zf, parts)
+            closure.add("[Content_Types].xml")
+            requested = set(parts)
+            selected = [
+                n for n in names if n in requested or (n in closure and is_xml_part(n))
+            ]
+            lazy = [n for n in names if n in closure and n not in selected]
+
+        records = {}
+        for name in selected:
+            target = safe_member_path(output_path, name)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            digest = hashlib.new(HASH_ALGORITHM)
+            with zf.open(name) as source, open(target, "wb") as destination:
+                if is_xml_part(name):
+                    pretty_print_xml(source, destination, encoding, digest=digest)
+                else:
+                    copy_and_hash(source, destination, digest)
+
+            info = zf.getinfo(name)
+            stat = target.stat()
+            records[name] = {
+                "offset": info.header_offset,
+                "crc": info.CRC,
+                "compress_size": info.compress_size,
+                "file_size": info.file_size,
+                "hash": digest.hexdigest(),
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+
+    write_manifest(output_path, input_file, records, lazy, partial=parts is not None)
+    return selected
+
+
+def parse_slide_numbers(spec):
+    """Parse a slide selection such as '3-5' or '1,4,7-9' into sorted numbers."""
+    numbers = set()
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        match = re.fullmatch(r"(\d+)(?:-(\d+))?", item)
+        if not match:
+            raise ValueError(f"Invalid slide selection '{item}'")
+        start = int(match.group(1))
+        end = int(match.group(2) or start)
+        if end < start:
+            raise ValueError(f"Invalid slide range '{item}'")
+        numbers.update(range(start, end + 1))
+    return sorted(numbers)
+
+
+def safe_member_path(output_path, name):
+    """Resolve an archive member name below output_path, rejecting path traversal."""
+    root = output_path.resolve()
+    target = (root / name).resolve()
+    if root not in target.parents:
+        raise ValueError(f"Refusing to extract {name} outside {output_path}")
+    return target
+
+
+def is_xml_part(name):
+    """Check whether a part is an XML or relationships part."""
+    return name.endswith(XML_SUFFIXES)
+
+
+def rels_path_for(name):
+    """Return the relationships part name for a part (e.g. ppt/_rels/presentation.xml.rels)."""
+    directory, filename = posixpath.split(name)
+    return posixpath.join(directory, "_rels", f"{filename}.rels")
+
+
+def relationship_closure(zf, roots):
+    """Collect all parts reachable from roots through internal relationships.
+
+    Args:
+        zf: Open zipfile.ZipFile of the Office document
+        roots: Part names to start from
+
+    Returns:
+        set: Part names in the closure, including the roots and .rels parts
+    """
+    names = set(zf.namelist())
+    closure = set()
+    pending = list(roots)
+
+    while pending:
+        name = pending.pop()
+        if name in closure or name not in names:
+            continue
+        closure.add(name)
+
+        rels_name = rels_path_for(name)
+        if rels_name not in names:
+            continue
+        closure.add(rels_name)
+
+        dom = defusedxml.minidom.parseString(zf.read(rels_name))
+        source_dir = posixpath.dirname(name)
+        for rel in dom.getElementsByTagName("Relationship"):
+            if rel.getAttribute("TargetMode") == "External":
+                continue
+            if rel.getAttribute("Type") in SKIPPED_RELATIONSHIP_TYPES:
+                continue
+            target = rel.getAttribute("Target")
+            if target.startswith("/"):
+                target = target.lstrip("/")
+            else:
+                target = posixpath.normpath(posixpath.join(source_dir, target))
+            pending.append(target)
+
+    return closure
+
+
+def copy_and_hash(source, destination, digest):
+    """Copy a binary stream to another while feeding it to a hash object."""
+    while chunk := source.read(COPY_CHUNK_SIZE):
+        digest.update(chunk)
+        destination.write(chunk)
+
+
+def canonical_hash(path):
+    """Return the canonical content hash of a part file, as recorded by unpack.
+
+    Binary parts hash their bytes. XML parts hash their element, attribute and
+    text content, ignoring what pack.py strips anyway (comments and
+    whitespace-only text outside *:t elements) and attribute order, so
+    re-indenting or reformatting a part does not change its hash.
+    """
+    path = Path(path)
+    digest = hashlib.new(HASH_ALGORITHM)
+    with open(path, "rb") as f:
+        if is_xml_part(path.name):
+            parser = defusedxml.sax.make_parser()
+            parser.setContentHandler(_CanonicalHashHandler(digest))
+            parser.parse(f)
+        else:
+            copy_and_hash(f, io.BytesIO(), digest)
+    return digest.hexdigest()
+
+
+def pretty_print_xml(source, destination, encoding="ascii", indent="  ", digest=None):
+    """Pretty-print XML from a binary stream to a binary stream.
+
+    The document is parsed with SAX and written as it is read, so memory use
+    is bounded by the nesting depth rather than the document size. Elements
+    containing only text stay on one line with their text untouched, and
+    elements with mixed content are written without added whitespace.
+
+    Args:
+        source: Binary file object to read XML from
+        destination: Binary file object to write the formatted XML to
+        encoding: "ascii" (non-ASCII as character references) or "utf-8"
+        indent: Indentation per nesting level
+        digest: Optional hash object to feed the canonical content to (see
+            canonical_hash), computed in the same pass
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unsupported encoding '{encoding}'")
+
+    writer = io.TextIOWrapper(
+        destination,
+        encoding=encoding,
+        errors="xmlcharrefreplace",
+        newline="\n",
+        write_through=False,
+    )
+    handler = _PrettyPrintHandler(writer, indent)
+    parser = defusedxml.sax.make_parser()
+    parser.setProperty(property_lexical_handler, handler)
+    if digest is not None:
+        handler = _TeeHandler(handler, _CanonicalHashHandler(digest))
+    parser.setContentHandler(handler)
+
+    writer.write(f'<?xml version="1.0" encoding="{encoding}"?>')
+    parser.parse(source)
+    writer.write("\n")
+    writer.flush()
+    writer.detach()
+
+
+class _PrettyPrintHandler(ContentHandler):
+    """SAX handler that writes indented XML as events arrive."""
+
+    def __init__(self, writer, indent):
+        super().__init__()
+        self.writer = writer
+        self.indent = indent
+        self.depth = 0
+        # Start tag written without its closing ">" yet (may become "/>")
+        self.open_tag = False
+        # Whitespace-only text that is dropped if a child element follows
+        self.pending_text = []
+        # Per open element: whether it has element children
+        self.has_children = []
+        # Depth below which formatting is off because of mixed content
+        self.inline_depth = None
+
+    def _close_open_tag(self):
+        if self.open_tag:
+            self.writer.write(">")
+            self.open_tag = False
+
+    def _newline(self, depth):
+        if self.inline_depth is None:
+            self.writer.write("\n" + self.indent * depth)
+
+    def startElement(self, name, attrs):
+        self._close_open_tag()
+        self.pending_text = []
+        if self.has_children:
+            self.has_children[-1] = True
+
+        self._newline(self.depth)
+        self.writer.write("<" + name)
+        for attr_name, value in attrs.items():
+            self.writer.write(f' {attr_name}="{escape(value, ATTRIBUTE_ENTITIES)}"')
+        self.open_tag = True
+        self.has_children.append(False)
+        self.depth += 1
+
+    def endElement(self, name):
+        self.depth -= 1
+        had_children = self.has_children.pop()
+
+        if self.open_tag and not self.pending_text:
+            self.writer.write("/>")
+            self.open_tag = False
+        else:
+            self._close_open_tag()
+            if had_children:
+                self.pending_text = []
+                self._newline(self.depth)
+            else:
+                self._flush_text()
+            self.writer.write(f"</{name}>")
+
+        if self.inline_depth is not None and self.depth < self.inline_depth:
+            self.inline_depth = None
+
+    def characters(self, content):
+        self.pending_text.append(content)
+        if self.inline_depth is None and content.isspace():
+            # Possibly indentation between elements; decided by the next event
+            return
+
+        # Real text: write it through untouched and stop formatting inside this
+        # element, so whitespace in mixed content is never added or dropped
+        self._close_open_tag()
+        if self.inline_depth is None and self.depth:
+            self.inline_depth = self.depth
+        self._flush_text()
+
+    def _flush_text(self):
+        for text in self.pending_text:
+            self.writer.write(escape(text))
+        self.pending_text = []
+
+    def processingInstruction(self, target, data):
+        self._close_open_tag()
+        self._newline(self.depth)
+        self.writer.write(f"<?{target} {data}?>" if data else f"<?{target}?>")
+
+    # Lexical handler callbacks (comments are kept, CDATA is written as text)
+    def comment(self, content):
+        self._close_open_tag()
+        self.pending_text = []
+        if self.has_children:
+            self.has_children[-1] = True
+        self._newline(self.depth)
+        self.writer.write(f"<!--{content}-->")
+
+    def startCDATA(self):
+        pass
+
+    def endCDATA(self):
+        pass
+
+    def startDTD(self, name, public_id, system_id):
+        pass
+
+    def endDTD(self):
+        pass
+
+
+class _CanonicalHashHandler(ContentHandler):
+    """SAX handler that feeds a canonical form of the document to a hash."""
+
+    def __init__(self, digest):
+        super().__init__()
+        self.digest = digest
+        # Names of the open elements
+        self.stack = []
+        # Text seen since the last element event (SAX may split text nodes)
+        self.text = []
+
+    def _update(self, *fields):
+        for field in fields:
+            self.digest.update(field.encode("utf-8"))
+            self.digest.update(b"\0")
+
+    def _flush_text(self):
+        text = "".join(self.text)
+        self.text = []
+        if not text:
+            return
+        # Same rule as pack.condense_dom: whitespace-only text is formatting
+        # unless it belongs to a *:t element
+        if text.isspace() and not (self.stack and self.stack[-1].endswith(":t")):
+            return
+        self._update("T", text)
+
+    def startElement(self, name, attrs):
+        self._flush_text()
+        self.stack.append(name)
+        self._update("S", name)
+        for attr_name in sorted(attrs.keys()):
+            self._update("A", attr_name, attrs[attr_name])
+
+    def endElement(self, name):
+        self._flush_text()
+        self.stack.pop()
+        self._update("E")
+
+    def characters(self, content):
+        self.text.append(content)
+
+    def processingInstruction(self, target, data):
+        self._flush_text()
+        self._update("P", target, data)
+
+
+class _TeeHandler(ContentHandler):
+    """SAX handler that forwards content events to two handlers."""
+
+    def __init__(self, first, second):
+        super().__init__()
+        self.first = first
+        self.second = second
+
+    def startElement(self, name, attrs):
+        self.first.startElement(name, attrs)
+        self.second.startElement(name, attrs)
+
+    def endElement(self, name):
+        self.first.endElement(name)
+        self.second.endElement(name)
+
+    def characters(self, content):
+        self.first.characters(content)
+        self.second.characters(content)
+
+    def processingInstruction(self, target, data):
+        self.first.processingInstruction(target, data)
+        self.second.processingInstruction(target, data)
+
+
+def read_manifest(unpacked_dir):
+    """Read the unpack manifest of a directory, or None if there is none."""
+    manifest_path = Path(unpacked_dir) / MANIFEST_NAME
+    if not manifest_path.is_file():
+        return None
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_manifest(output_path, input_file, records, lazy, partial):
+    """Record which parts were extracted and which were left in the original.
+
+    For every extracted part the manifest keeps its zip entry metadata
+    (local header offset, CRC and sizes), the canonical hash of its content
+    and the size and mtime of the written file, which changed_parts() uses.
+
+    Repeated partial unpacks into the same directory accumulate, so requesting
+    a lazy part later materializes it without re-extracting everything else.
+    """
+    input_file = Path(input_file)
+    source = str(input_file.resolve())
+    previous = read_manifest(output_path)
+    if partial and previous and previous.get("source") == source:
+        records = {**previous["parts"], **records}
+        lazy = set(previous["lazy"]) | set(lazy)
+        partial = previous["partial"]
+
+    source_stat = input_file.stat()
+    manifest = {
+        "source": source,
+        "source_size": source_stat.st_size,
+        "source_mtime_ns": source_stat.st_mtime_ns,
+        "partial": partial,
+        "extracted": sorted(records),
+        "lazy": sorted(set(lazy) - set(records)),
+        "hash_algorithm": HASH_ALGORITHM,
+        "parts": {name: records[name] for name in sorted(records)},
+    }
+    with open(Path(output_path) / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def source_unchanged(manifest):
+    """Check whether the file a manifest was unpacked from is still the same."""
+    try:
+        stat = os.stat(manifest["source"])
+    except (KeyError, OSError):
+        return False
+    return stat.st_size == manifest.get(
+        "source_size"
+    ) and stat.st_mtime_ns == manifest.get("source_mtime_ns")
+
+
+def changed_parts(unpacked_dir, manifest=None):
+    """Return the parts of an unpacked directory that differ from what unpack wrote.
+
+    Files are checked stat-first: a file whose size and mtime still match the
+    manifest is unchanged without being read, so only edited files are hashed
+    (with canonical_hash, so reformatting alone is not a change).
+
+    Args:
+        unpacked_dir: Directory written by unpack_document
+        manifest: The directory's manifest, if already read
+
+    Returns:
+        list: Sorted names of modified, added and deleted parts
+    """
+    unpacked_dir = Path(unpacked_dir)
+    manifest = manifest or read_manifest(unpacked_dir)
+    if manifest is None:
+        raise ValueError(f"{unpacked_dir} has no {MANIFEST_NAME}; was it unpacked?")
+    records = manifest.get("parts")
+    if records is None:
+        raise ValueError(f"Invalid {MANIFEST_NAME} in {unpacked_dir}: no part records")
+
+    changed = set()
+    present = set()
+    for root, _, files in os.walk(unpacked_dir):
+        relative = Path(root).relative_to(unpacked_dir)
+        for file_name in files:
+            name = (relative / file_name).as_posix()
+            if name == MANIFEST_NAME:
+                continue
+            present.add(name)
+            record = records.get(name)
+            if record is None:
+                changed.add(name)
+                continue
+            stat = os.stat(os.path.join(root, file_name))
+            if (
+                stat.st_size == record["size"]
+                and stat.st_mtime_ns == record["mtime_ns"]
+            ):
+                continue
+            if canonical_hash(unpacked_dir / name) != record["hash"]:
+                changed.add(name)
+
+    changed.update(name for name in records if name not in present)
+    return sorted(changed)
+
 
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
-
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
-
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
-    content = xml_file.read_text(encoding="utf-8")
-    dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
-
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,9 @@
 Base validator with common validation logic for document files.
 """
 
+import json
 import re
+import zipfile
 from pathlib import Path
 
 import lxml.etree
@@ -81,6 +83,9 @@ class BaseSchemaValidator:
         "http://schemas.openxmlformats.org/package/2006/content-types"
     )
 
+    # Manifest written by unpack.py (not part of the document)
+    UNPACK_MANIFEST = ".unpack.json"
+
     # Folders where we should clean ignorable namespaces
     MAIN_CONTENT_FOLDERS = {"word", "ppt", "xl"}
 
@@ -120,6 +125,21 @@ class BaseSchemaValidator:
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        # Parts a partial unpack left in the original file (pack.py adds them back)
+        self.parts_left_in_original = self._get_parts_left_in_original()
+
+    def _get_parts_left_in_original(self):
+        """Return part names that a partial unpack did not extract."""
+        manifest_path = self.unpacked_dir / self.UNPACK_MANIFEST
+        if not manifest_path.is_file():
+            return set()
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if not manifest.get("partial") or not self.original_file.is_file():
+            return set()
+        with zipfile.ZipFile(self.original_file) as zf:
+            return set(zf.namelist()) - set(manifest["extracted"])
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
@@ -294,6 +314,7 @@ class BaseSchemaValidator:
             if (
                 file_path.is_file()
                 and file_path.name != "[Content_Types].xml"
+                and file_path.name != self.UNPACK_MANIFEST
                 and not file_path.name.endswith(".rels")
             ):  # This file is not referenced by .rels
                 all_files.append(file_path.resolve())
@@ -343,6 +364,8 @@ class BaseSchemaValidator:
                             if target_path.exists() and target_path.is_file():
                                 referenced_files.add(target_path)
                                 all_referenced_files.add(target_path)
+                            elif self._is_left_in_original(target_path):
+                                pass  # Not extracted by a partial unpack
                             else:
                                 broken_refs.append((target, rel.sourceline))
                         except (OSError, ValueError):
@@ -360,6 +383,9 @@ class BaseSchemaValidator:
                 rel_path = rels_file.relative_to(self.unpacked_dir)
                 errors.append(f"  Error parsing {rel_path}: {e}")
 
+        # Files may also be referenced by .rels a partial unpack did not extract
+        all_referenced_files |= self._get_targets_left_in_original()
+
         # Check for unreferenced files (files that exist but are not referenced anywhere)
         unreferenced_files = set(all_files) - all_referenced_files
 
@@ -385,6 +411,41 @@ class BaseSchemaValidator:
                 )
             return True
 
+    def _is_left_in_original(self, target_path):
+        """Check whether a missing target is a part a partial unpack left out."""
+        if not self.parts_left_in_original:
+            return False
+        try:
+            name = target_path.relative_to(self.unpacked_dir).as_posix()
+        except ValueError:
+            return False
+        return name in self.parts_left_in_original
+
+    def _get_targets_left_in_original(self):
+        """Resolve the targets of .rels parts that a partial unpack left out."""
+        targets = set()
+        rels_names = [n for n in self.parts_left_in_original if n.endswith(".rels")]
+        if not rels_names:
+            return targets
+
+        with zipfile.ZipFile(self.original_file) as zf:
+            for rels_name in rels_names:
+                # e.g. ppt/_rels/presentation.xml.rels -> targets relative to ppt/
+                base_dir = self.unpacked_dir / Path(rels_name).parent.parent
+                rels_root = lxml.etree.fromstring(zf.read(rels_name))
+                for rel in rels_root.findall(
+                    ".//ns:Relationship",
+                    namespaces={"ns": self.PACKAGE_RELATIONSHIPS_NAMESPACE},
+                ):
+                    target = rel.get("Target")
+                    if not target or rel.get("TargetMode") == "External":
+                        continue
+                    if target.startswith("/"):
+                        targets.add((self.unpacked_dir / target.lstrip("/")).resolve())
+                    else:
+                        targets.add((base_dir / target).resolve())
+        return targets
+
     def validate_all_relationship_ids(self):
         """
         Validate that all r:id attributes in XML files reference existing IDs
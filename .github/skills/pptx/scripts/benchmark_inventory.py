@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark the inventory engines on a deck and check that they agree.
+
+Runs inventory extraction with python-pptx (--engine pptx) and with the lxml
+reader (--engine xml) for each field selection, checks that both produce
+identical inventories, and prints the timings. The cache is not used.
+
+Usage:
+    python benchmark_inventory.py deck.pptx
+    python benchmark_inventory.py deck.pptx --fields all text geometry --repeat 3
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from inventory import get_inventory_as_dict, parse_fields
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inventory engines")
+    parser.add_argument("input", help="Input PowerPoint file (.pptx)")
+    parser.add_argument(
+        "--fields",
+        nargs="+",
+        default=["all", "text", "geometry,text,formatting"],
+        help="Field selections to compare (default: all, text, "
+        "geometry,text,formatting)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Runs per engine, best time is reported"
+    )
+    args = parser.parse_args()
+
+    pptx_path = Path(args.input)
+    if not pptx_path.exists():
+        sys.exit(f"Error: Input file not found: {args.input}")
+
+    print(f"{'fields':<26} {'shapes':>7} {'pptx':>9} {'xml':>9} {'speedup':>8}")
+    for spec in args.fields:
+        fields = None if spec == "all" else parse_fields(spec)
+        pptx_time, expected = best_of(args.repeat, pptx_path, fields, "pptx")
+        xml_time, actual = best_of(args.repeat, pptx_path, fields, "xml")
+
+        if actual != expected:
+            sys.exit(f"Error: engines disagree with --fields {spec}")
+        shapes = sum(len(slide_shapes) for _, slide_shapes in actual)
+        print(
+            f"{spec:<26} {shapes:>7} {pptx_time:>8.2f}s {xml_time:>8.2f}s "
+            f"{pptx_time / xml_time:>7.1f}x"
+        )
+
+
+def best_of(repeat, pptx_path, fields, engine):
+    """Extract the inventory repeat times; return (best time, inventory)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        inventory = get_inventory_as_dict(pptx_path, fields=fields, engine=engine)
+        best = min(best, time.perf_counter() - start)
+    # Compare key order too, as it shows up in the JSON output
+    return best, [
+        (slide_key, list(shapes.items())) for slide_key, shapes in inventory.items()
+    ]
+
+
+if __name__ == "__main__":
+    main()
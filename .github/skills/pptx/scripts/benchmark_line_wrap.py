@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Check that wrap_line breaks lines where exact measurement would, and time it.
+
+wrap_line adds up cached word widths and only measures a candidate line
+exactly when the sum is within KERNING_TOLERANCE of the available width.
+This script wraps random lines with it and with the reference algorithm it
+replaced, which measures every candidate line exactly (the former
+_wrap_text_line of inventory.py, breaking at split_word's CJK opportunities
+as well as at spaces), checks that both produce the same lines, and prints
+the timings. Lines mix words with kerning pairs and ligatures, repeated
+spaces and CJK text, and are wrapped with the DejaVu faces at several sizes
+and with PIL's default fonts.
+
+Exits with status 1 if any line wraps differently.
+
+Usage:
+    python benchmark_line_wrap.py
+    python benchmark_line_wrap.py --lines 1000 --seed 3
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import List
+
+import text_layout
+from fonts import find_font, load_font
+from text_layout import measure, set_measure_backend, split_word, wrap_line
+
+# Font families and sizes (pixels) the lines are wrapped with
+FAMILIES = ("DejaVu Sans", "DejaVu Serif", "DejaVu Sans Mono")
+SIZES = (8, 11, 12, 14, 18, 24, 36, 44)
+
+# Words of the random lines: kerning pairs, ligatures, accents, punctuation,
+# empty words (repeated spaces) and CJK text
+WORDS = (
+    "AV To Wa Ty Yo LT fi ffl a the quick brown fox jumps over lazy dog. "
+    "Lorem ipsum dolor «AVA» W VAWAV 1,234 — Überprüfung naïve (see) x! "
+    "日本語 テキスト 「重要」 、 。 ー っ （注） 処理 ことができます １２３"
+).split() + ["", ""]
+
+# Number of mismatches printed before giving up on details
+MAX_REPORTED = 5
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark wrap_line")
+    parser.add_argument(
+        "--lines", type=int, default=400, help="Random lines per font (default: 400)"
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    args = parser.parse_args()
+
+    set_measure_backend("pil")
+    text_layout._widths.clear()
+    rnd = random.Random(args.seed)
+
+    cases = mismatches = 0
+    reference_time = wrap_time = 0.0
+    for name, font in load_fonts():
+        for _ in range(args.lines):
+            line = random_line(rnd)
+            max_width_px = rnd.uniform(10, 700)
+
+            start = time.perf_counter()
+            expected = reference_wrap(line, max_width_px, font)
+            middle = time.perf_counter()
+            actual = wrap_line(line, max_width_px, font)
+            reference_time += middle - start
+            wrap_time += time.perf_counter() - middle
+
+            cases += 1
+            if actual != expected:
+                mismatches += 1
+                if mismatches <= MAX_REPORTED:
+                    print(
+                        f"Mismatch: {name} at {max_width_px:.1f}px, {line!r}: "
+                        f"{len(expected)} lines expected, {len(actual)} wrapped"
+                    )
+
+    print(
+        f"{cases} lines, {mismatches} wrapped differently; "
+        f"reference {reference_time:.2f}s, wrap_line {wrap_time:.2f}s"
+    )
+    if mismatches:
+        sys.exit(1)
+
+
+def load_fonts():
+    """Yield (name, font) for PIL's default fonts and the installed faces."""
+    yield "PIL default", load_font(None)
+    for size in (9, 14, 30):
+        yield f"PIL default {size}px", load_font(None, size)
+    for family in FAMILIES:
+        for bold in (False, True):
+            face = find_font(family, bold=bold)
+            if face is None:
+                continue
+            for size in SIZES:
+                style = " Bold" if bold else ""
+                yield (
+                    f"{family}{style} {size}px",
+                    load_font(face.path, size, face.index),
+                )
+
+
+def random_line(rnd: random.Random) -> str:
+    """Join 0 to 60 random words, with spaces or, at times, without."""
+    separator = "" if rnd.random() < 0.2 else " "
+    line = separator.join(rnd.choice(WORDS) for _ in range(rnd.randint(0, 60)))
+    if rnd.random() < 0.1:
+        line = f"  {line}  "
+    return line
+
+
+def reference_wrap(line: str, max_width_px: float, font) -> List[str]:
+    """Wrap a line by measuring every candidate line exactly."""
+    if not line:
+        return [""]
+
+    if measure(line, font) <= max_width_px:
+        return [line]
+
+    wrapped = []
+    current_line = ""
+    for word in line.split(" "):
+        for i, cluster in enumerate(split_word(word)):
+            if not current_line:
+                current_line = cluster
+                continue
+            test_line = current_line + (" " if i == 0 else "") + cluster
+            if measure(test_line, font) <= max_width_px:
+                current_line = test_line
+            else:
+                wrapped.append(current_line)
+                current_line = cluster
+
+    if current_line:
+        wrapped.append(current_line)
+
+    return wrapped
+
+
+if __name__ == "__main__":
+    main()
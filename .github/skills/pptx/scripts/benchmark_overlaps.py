@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark inventory.detect_overlaps on synthetic dense slides.
+
+Generates slides with hundreds of text boxes (a dashboard-like grid with
+jitter plus randomly scattered boxes), runs the sweep-line detect_overlaps
+and the pairwise comparison it replaced, checks that both produce identical
+overlapping_shapes dictionaries, and prints the timings.
+
+Usage:
+    python benchmark_overlaps.py
+    python benchmark_overlaps.py --shapes 300 800 1500 --repeat 5
+"""
+
+import argparse
+import random
+import sys
+import time
+from types import SimpleNamespace
+from typing import List
+
+from inventory import calculate_overlap, detect_overlaps, sort_shapes_by_position
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark overlap detection")
+    parser.add_argument(
+        "--shapes",
+        type=int,
+        nargs="+",
+        default=[100, 300, 800],
+        help="Numbers of text boxes per synthetic slide (default: 100 300 800)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs per size, best time is reported"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    print(f"{'shapes':>7} {'pairs':>7} {'pairwise':>10} {'sweep':>10} {'speedup':>8}")
+    for count in args.shapes:
+        shapes = make_slide(count, random.Random(args.seed + count))
+        pairwise_time, expected = best_of(args.repeat, shapes, detect_overlaps_pairwise)
+        sweep_time, actual = best_of(args.repeat, shapes, detect_overlaps)
+
+        if actual != expected:
+            sys.exit(f"Error: results differ from pairwise comparison ({count} shapes)")
+        pairs = sum(len(overlaps) for overlaps in actual) // 2
+        print(
+            f"{count:>7} {pairs:>7} {pairwise_time * 1000:>8.1f}ms "
+            f"{sweep_time * 1000:>8.1f}ms {pairwise_time / sweep_time:>7.1f}x"
+        )
+
+
+def make_slide(count: int, rnd: random.Random) -> List[SimpleNamespace]:
+    """Create shape stand-ins for a 13.33" x 7.5" slide crowded with text boxes."""
+    shapes = []
+    columns = max(1, int((count * 0.75) ** 0.5 * 1.6))
+    for k in range(count):
+        if k % 4:
+            # Dashboard grid cells, slightly jittered so neighbours touch
+            row, col = divmod(k, columns)
+            width, height = 13.33 / columns, 7.5 / max(1, count // columns)
+            left = col * width + rnd.uniform(-0.1, 0.1)
+            top = row * height + rnd.uniform(-0.1, 0.1)
+        else:
+            # Labels and callouts scattered over the grid
+            width, height = rnd.uniform(0.3, 2.5), rnd.uniform(0.2, 1.0)
+            left, top = rnd.uniform(0, 12), rnd.uniform(0, 7)
+        shapes.append(
+            SimpleNamespace(
+                left=round(left, 2),
+                top=round(top, 2),
+                width=round(width, 2),
+                height=round(height, 2),
+                shape_id=None,
+                overlapping_shapes={},
+            )
+        )
+
+    shapes = sort_shapes_by_position(shapes)
+    for idx, shape in enumerate(shapes):
+        shape.shape_id = f"shape-{idx}"
+    return shapes
+
+
+def best_of(repeat, shapes, detect):
+    """Run detect on fresh copies of the shapes; return (best time, results)."""
+    best = float("inf")
+    for _ in range(repeat):
+        for shape in shapes:
+            shape.overlapping_shapes = {}
+        start = time.perf_counter()
+        detect(shapes)
+        best = min(best, time.perf_counter() - start)
+    # Compare insertion order too, as it shows up in the JSON output
+    return best, [list(shape.overlapping_shapes.items()) for shape in shapes]
+
+
+def detect_overlaps_pairwise(shapes) -> None:
+    """Reference: compare every pair of shapes (the previous implementation)."""
+    n = len(shapes)
+    for i in range(n):
+        for j in range(i + 1, n):
+            shape1, shape2 = shapes[i], shapes[j]
+            rect1 = (shape1.left, shape1.top, shape1.width, shape1.height)
+            rect2 = (shape2.left, shape2.top, shape2.width, shape2.height)
+            overlaps, overlap_area = calculate_overlap(rect1, rect2)
+            if overlaps:
+                shape1.overlapping_shapes[shape2.shape_id] = overlap_area
+                shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+
+
+if __name__ == "__main__":
+    main()
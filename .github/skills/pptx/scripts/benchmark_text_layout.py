@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark the text measurement backends used for overflow estimates.
+
+Wraps synthetic paragraphs (Latin words of varying length, Japanese text,
+and mixed text) at several widths with the exact PIL backend and the glyph
+advance backends (see glyph_layout.py), and prints the timings and how
+often the wrapped lines agree with PIL. With --deck, the overflow estimates
+of a presentation are compared as well.
+
+Usage:
+    python benchmark_text_layout.py
+    python benchmark_text_layout.py --paragraphs 2000 --font "DejaVu Sans"
+    python benchmark_text_layout.py --deck deck.pptx
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import text_layout
+from fonts import find_font, load_font
+from text_layout import MEASURE_BACKENDS, set_measure_backend, wrap_line
+
+# Widths (pixels) the paragraphs are wrapped at
+WIDTHS = (120, 300, 640)
+
+# Text measured in the benchmark
+LATIN_WORDS = (
+    "the quarterly revenue growth exceeded expectations across all regions "
+    "while operating margins improved despite supply chain constraints and "
+    "AVAILABILITY WAVE Type LTA office efficient fluffy"
+).split()
+JAPANESE = (
+    "売上高は前年同期比で増加し、営業利益率も改善しました。「新製品」の販売が好調です。"
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark text measurement")
+    parser.add_argument(
+        "--paragraphs", type=int, default=600, help="Synthetic paragraphs per kind"
+    )
+    parser.add_argument("--font", default="DejaVu Sans", help="Font family to use")
+    parser.add_argument("--size", type=int, default=18, help="Font size in pixels")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--deck", help="Also compare overflow estimates of a .pptx")
+    args = parser.parse_args()
+
+    face = find_font(args.font)
+    font = load_font(face.path, args.size, face.index) if face else load_font(None)
+    print(f"Font: {face.path if face else 'PIL default'} at {args.size}px")
+
+    paragraphs = make_paragraphs(args.paragraphs, random.Random(args.seed))
+    lines = sum(len(texts) for texts in paragraphs.values()) * len(WIDTHS)
+    print(f"{lines} wraps ({len(WIDTHS)} widths)\n")
+
+    print(
+        f"{'backend':<16} {'kind':<9} {'time':>9} {'same lines':>11} {'same count':>11}"
+    )
+    for backend in MEASURE_BACKENDS:
+        for kind, texts in paragraphs.items():
+            set_measure_backend("pil")
+            expected = wrap_all(texts, font)
+            set_measure_backend(backend)
+            clear_caches()
+            start = time.perf_counter()
+            actual = wrap_all(texts, font)
+            elapsed = time.perf_counter() - start
+
+            same = sum(a == e for a, e in zip(actual, expected))
+            same_count = sum(len(a) == len(e) for a, e in zip(actual, expected))
+            print(
+                f"{backend:<16} {kind:<9} {elapsed * 1000:>7.1f}ms "
+                f"{same / len(expected):>10.1%} {same_count / len(expected):>10.1%}"
+            )
+
+    if args.deck:
+        compare_deck(Path(args.deck))
+
+
+def make_paragraphs(count: int, rnd: random.Random) -> Dict[str, List[str]]:
+    """Create Latin, Japanese and mixed paragraphs of 5 to 120 words."""
+    latin, japanese, mixed = [], [], []
+    for _ in range(count):
+        words = rnd.choices(LATIN_WORDS, k=rnd.randint(5, 120))
+        latin.append(" ".join(words))
+        start = rnd.randrange(len(JAPANESE))
+        japanese.append((JAPANESE * 8)[start : start + rnd.randint(10, 300)])
+        mixed.append(
+            " ".join(
+                w if rnd.random() < 0.7 else JAPANESE[: rnd.randint(2, 12)]
+                for w in words
+            )
+        )
+    return {"latin": latin, "japanese": japanese, "mixed": mixed}
+
+
+def wrap_all(texts: List[str], font) -> List[List[str]]:
+    return [wrap_line(text, width, font) for width in WIDTHS for text in texts]
+
+
+def clear_caches() -> None:
+    """Drop measured widths so each backend starts cold."""
+    text_layout._widths.clear()
+    if "glyph_layout" in sys.modules:
+        sys.modules["glyph_layout"]._advances.clear()
+        sys.modules["glyph_layout"]._kerning.clear()
+
+
+def compare_deck(pptx_path: Path) -> None:
+    """Compare the frame overflow estimates of a deck between backends."""
+    from inventory import get_inventory_as_dict
+
+    print(f"\nOverflow estimates of {pptx_path}")
+    print(f"{'backend':<16} {'time':>8} {'shapes':>7} {'differ':>7} {'max diff':>9}")
+    results: Dict[str, Dict[Tuple[str, str], float]] = {}
+    for backend in MEASURE_BACKENDS:
+        set_measure_backend(backend)
+        clear_caches()
+        start = time.perf_counter()
+        inventory = get_inventory_as_dict(pptx_path, fields={"overflow"})
+        elapsed = time.perf_counter() - start
+        results[backend] = {
+            (slide_key, shape_key): shape.get("overflow", {})
+            .get("frame", {})
+            .get("overflow_bottom", 0.0)
+            for slide_key, shapes in inventory.items()
+            for shape_key, shape in shapes.items()
+        }
+        expected = results["pil"]
+        differ = [
+            abs(value - expected.get(key, 0.0))
+            for key, value in results[backend].items()
+            if value != expected.get(key, 0.0)
+        ]
+        print(
+            f"{backend:<16} {elapsed:>7.2f}s {len(expected):>7} {len(differ):>7} "
+            f'{max(differ, default=0.0):>8.2f}"'
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Locate installed font files by family name.
+
+Scanning font directories for every paragraph is expensive on hosts with
+thousands of fonts, so the directories are indexed once: every font file
+(including each face of .ttc collections, in nested subdirectories) is
+recorded with the family and style names from its `name` table. The index is
+cached on disk and rebuilt only when the modification time of an indexed
+directory changes; lookups are dictionary accesses.
+
+Loaded FreeType fonts are kept in a bounded LRU cache keyed by (path, size,
+face index) that every script in the process shares, so a large font file is
+parsed once per size rather than once per paragraph.
+
+Usage:
+    from fonts import find_font, load_font
+
+    face = find_font("Noto Sans CJK JP", bold=True)
+    if face:
+        font = load_font(face.path, 18, face.index)
+
+    python fonts.py "Noto Sans CJK JP"    # Show what a family resolves to
+    python fonts.py --rebuild             # Rebuild the cached index
+"""
+
+import argparse
+import functools
+import json
+import os
+import platform
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+# Bump when the cached index format or the indexing rules change
+INDEX_VERSION = 1
+
+# Where the index is cached between runs
+CACHE_PATH = (
+    Path(os.environ.get("XDG_CACHE_HOME", "~/.cache")).expanduser()
+    / "pptx-skill"
+    / "font-index.json"
+)
+
+# Font directories (searched recursively, in priority order) and file types
+if platform.system() == "Darwin":
+    FONT_DIRS = ["/System/Library/Fonts/", "/Library/Fonts/", "~/Library/Fonts/"]
+    FONT_EXTENSIONS = (".ttf", ".otf", ".ttc", ".dfont")
+else:
+    FONT_DIRS = [
+        "/usr/share/fonts/",
+        "/usr/local/share/fonts/",
+        "~/.fonts/",
+        "~/.local/share/fonts/",
+    ]
+    FONT_EXTENSIONS = (".ttf", ".otf", ".ttc")
+
+# Maximum number of loaded (path, size, index) fonts kept in memory
+FONT_CACHE_SIZE = 64
+
+# `name` table IDs: family, subfamily (style), full name, typographic family
+# and typographic subfamily
+NAME_FAMILY, NAME_STYLE, NAME_FULL = 1, 2, 4
+NAME_TYPO_FAMILY, NAME_TYPO_STYLE = 16, 17
+
+# Style names that denote the plain face of a family
+REGULAR_STYLES = {"regular", "normal", "book", "roman", "plain", "medium"}
+
+
+class FontFace(NamedTuple):
+    """A face in a font file: the file path and the face index within it."""
+
+    path: str
+    index: int
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Look up installed font files")
+    parser.add_argument("family", nargs="?", help="Font family to look up")
+    parser.add_argument("--bold", action="store_true", help="Look up the bold face")
+    parser.add_argument("--italic", action="store_true", help="Look up the italic face")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="Rebuild the cached font index"
+    )
+    args = parser.parse_args()
+
+    index = FontIndex.build() if args.rebuild else get_font_index()
+    if args.rebuild:
+        index.save()
+        print(f"Indexed {len(index.faces)} faces in {len(index.dirs)} directories")
+    if args.family:
+        face = index.find(args.family, bold=args.bold, italic=args.italic)
+        if face is None:
+            sys.exit(f"Error: No font found for '{args.family}'")
+        print(f"{face.path} (face {face.index})")
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a family or file name for matching ("Noto Sans" -> "notosans")."""
+    return "".join(c for c in name.lower() if c not in " -_")
+
+
+def style_flags(style: str) -> tuple[bool, bool]:
+    """Return (bold, italic) for a style name such as "Bold Italic"."""
+    style = style.lower()
+    return "bold" in style, "italic" in style or "oblique" in style
+
+
+class FontIndex:
+    """Index of installed font faces by family name and file name.
+
+    Attributes:
+        dirs: Modification time (ns) of every indexed directory, by path
+        faces: One entry per face: {"path", "index", "family", "style",
+            "names"}, where names holds every family and full name of the face
+            in any language
+    """
+
+    def __init__(self, dirs: Dict[str, int], faces: List[dict]):
+        self.dirs = dirs
+        self.faces = faces
+        self._lookups: Dict[tuple, Optional[FontFace]] = {}
+
+        # Family and full names -> faces, and file names -> first face
+        self._by_name: Dict[str, List[dict]] = {}
+        self._by_file: Dict[str, dict] = {}
+        for face in faces:
+            for name in face["names"]:
+                self._by_name.setdefault(normalize_name(name), []).append(face)
+            stem = normalize_name(Path(face["path"]).stem)
+            self._by_file.setdefault(stem, face)
+
+    @classmethod
+    def build(cls, font_dirs: Optional[List[str]] = None) -> "FontIndex":
+        """Scan the font directories and read the names of every font face."""
+        dirs: Dict[str, int] = {}
+        faces: List[dict] = []
+        seen = set()
+        for font_dir in font_dirs or FONT_DIRS:
+            root = Path(font_dir).expanduser()
+            if not root.is_dir():
+                continue
+            for directory, subdirs, files in os.walk(root, followlinks=True):
+                real = os.path.realpath(directory)
+                if real in seen:
+                    subdirs.clear()
+                    continue
+                seen.add(real)
+                dirs[directory] = os.stat(directory).st_mtime_ns
+                subdirs.sort()
+                for file_name in sorted(files):
+                    if file_name.lower().endswith(FONT_EXTENSIONS):
+                        faces.extend(
+                            read_font_faces(os.path.join(directory, file_name))
+                        )
+        return cls(dirs, faces)
+
+    @classmethod
+    def load(cls, cache_path: Path = CACHE_PATH) -> Optional["FontIndex"]:
+        """Load a cached index, or None if it is missing or out of date."""
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != INDEX_VERSION or data.get("roots") != FONT_DIRS:
+            return None
+
+        # Adding, removing or renaming a font changes its directory's mtime
+        for directory, mtime_ns in data["dirs"].items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime_ns:
+                    return None
+            except OSError:
+                return None
+        for font_dir in FONT_DIRS:
+            root = Path(font_dir).expanduser()
+            if root.is_dir() and str(root) not in data["dirs"]:
+                return None
+        return cls(data["dirs"], data["faces"])
+
+    def save(self, cache_path: Path = CACHE_PATH) -> None:
+        """Write the index to the cache (silently skipped if not writable)."""
+        data = {
+            "version": INDEX_VERSION,
+            "roots": FONT_DIRS,
+            "dirs": self.dirs,
+            "faces": self.faces,
+        }
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(temp_name, cache_path)
+        except OSError:
+            pass
+
+    def find(
+        self, font_name: str, bold: bool = False, italic: bool = False
+    ) -> Optional[FontFace]:
+        """Find the face for a font family (or full name) and style.
+
+        Family and full names from the font files match first, then file names
+        ("DejaVuSans-Bold.ttf" for "DejaVu Sans Bold"), then file names that
+        contain the requested name.
+
+        Returns:
+            FontFace, or None if no installed font matches
+        """
+        key = (font_name, bold, italic)
+        if key not in self._lookups:
+            self._lookups[key] = self._find(font_name, bold, italic)
+        return self._lookups[key]
+
+    def _find(self, font_name: str, bold: bool, italic: bool) -> Optional[FontFace]:
+        name = normalize_name(font_name)
+        if not name:
+            return None
+
+        candidates = self._by_name.get(name)
+        if candidates:
+            face = min(candidates, key=lambda f: _style_rank(f["style"], bold, italic))
+            return FontFace(face["path"], face["index"])
+
+        face = self._by_file.get(name)
+        if face is None:
+            # Fuzzy match on the file name, as for fonts without readable names
+            fragment = font_name.lower().replace(" ", "")
+            face = next(
+                (
+                    f
+                    for f in self.faces
+                    if fragment in Path(f["path"]).name.lower() and f["index"] == 0
+                ),
+                None,
+            )
+        return FontFace(face["path"], face["index"]) if face else None
+
+
+def _style_rank(style: str, bold: bool, italic: bool) -> tuple:
+    """Sort key preferring the requested style, then the plainest variant."""
+    face_bold, face_italic = style_flags(style)
+    plain = style.lower().replace("bold", "").replace("italic", "").strip()
+    return (
+        face_bold != bold or face_italic != italic,
+        bool(plain) and plain not in REGULAR_STYLES,
+        len(style),
+    )
+
+
+def read_font_faces(path: str) -> List[dict]:
+    """Read the family and style names of every face in a font file.
+
+    Files whose names cannot be read (e.g. .dfont resource forks) are still
+    indexed by file name as a single face.
+    """
+    try:
+        with open(path, "rb") as f:
+            if f.read(4) == b"ttcf":
+                _, count = struct.unpack(">II", f.read(8))
+                offsets = struct.unpack(f">{count}I", f.read(4 * count))
+            else:
+                offsets = (0,)
+            return [_read_face(f, path, i, offset) for i, offset in enumerate(offsets)]
+    except (OSError, struct.error, UnicodeDecodeError):
+        return [{"path": path, "index": 0, "family": None, "style": "", "names": []}]
+
+
+def _read_face(f, path: str, index: int, offset: int) -> dict:
+    """Read the `name` table of the face whose offset table is at offset."""
+    f.seek(offset + 4)
+    (num_tables,) = struct.unpack(">H", f.read(2))
+    f.seek(offset + 12)
+    name_offset = None
+    for _ in range(num_tables):
+        tag, _, table_offset, _ = struct.unpack(">4sIII", f.read(16))
+        if tag == b"name":
+            name_offset = table_offset
+            break
+    if name_offset is None:
+        return {"path": path, "index": index, "family": None, "style": "", "names": []}
+
+    f.seek(name_offset)
+    _, count, string_offset = struct.unpack(">HHH", f.read(6))
+    records = [struct.unpack(">HHHHHH", f.read(12)) for _ in range(count)]
+
+    # name ID -> [(is English, string)]
+    names: Dict[int, List[tuple]] = {}
+    for platform_id, encoding_id, language_id, name_id, length, str_offset in records:
+        if name_id not in (
+            NAME_FAMILY,
+            NAME_STYLE,
+            NAME_FULL,
+            NAME_TYPO_FAMILY,
+            NAME_TYPO_STYLE,
+        ):
+            continue
+        if platform_id in (0, 3):
+            codec, english = "utf-16-be", language_id == 0x409 or platform_id == 0
+        elif platform_id == 1 and encoding_id == 0:
+            codec, english = "mac_roman", language_id == 0
+        else:
+            continue
+        f.seek(name_offset + string_offset + str_offset)
+        value = f.read(length).decode(codec, errors="replace").strip("\0 ")
+        if value:
+            names.setdefault(name_id, []).append((english, value))
+
+    def pick(*name_ids):
+        for name_id in name_ids:
+            values = names.get(name_id)
+            if values:
+                return max(values, key=lambda v: v[0])[1]
+        return None
+
+    all_names = {
+        value
+        for name_id in (NAME_FAMILY, NAME_TYPO_FAMILY, NAME_FULL)
+        for _, value in names.get(name_id, [])
+    }
+    return {
+        "path": path,
+        "index": index,
+        "family": pick(NAME_TYPO_FAMILY, NAME_FAMILY),
+        "style": pick(NAME_TYPO_STYLE, NAME_STYLE) or "",
+        "names": sorted(all_names),
+    }
+
+
+_font_index: Optional[FontIndex] = None
+
+
+def get_font_index() -> FontIndex:
+    """Return the process-wide font index, loading or building it once."""
+    global _font_index
+    if _font_index is None:
+        _font_index = FontIndex.load()
+        if _font_index is None:
+            _font_index = FontIndex.build()
+            _font_index.save()
+    return _font_index
+
+
+def find_font(
+    font_name: str, bold: bool = False, italic: bool = False
+) -> Optional[FontFace]:
+    """Find an installed font face by family name (see FontIndex.find)."""
+    return get_font_index().find(font_name, bold=bold, italic=italic)
+
+
+@functools.lru_cache(maxsize=FONT_CACHE_SIZE)
+def load_font(path: Optional[str], size: Optional[int] = None, index: int = 0):
+    """Load a font for PIL text measurement, reusing already loaded fonts.
+
+    Args:
+        path: Font file, or None for PIL's default font
+        size: Size in pixels (the default font is the bitmap font if None)
+        index: Face index within a .ttc collection
+
+    Returns:
+        PIL ImageFont (raises OSError if the file cannot be loaded)
+    """
+    from PIL import ImageFont  # Only needed when measuring text
+
+    if path is None:
+        return ImageFont.load_default(size) if size else ImageFont.load_default()
+    return ImageFont.truetype(path, size=size, index=index)
+
+
+def font_cache_info() -> Dict[str, float]:
+    """Return hit/miss counters of the load_font cache."""
+    info = load_font.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    main()
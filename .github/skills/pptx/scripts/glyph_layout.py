@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Approximate line wrapping from cached glyph advances, vectorized with NumPy.
+
+text_layout.wrap_line measures words with PIL, which goes into FreeType for
+every new word and for every candidate line near a break point. Here each
+character is measured once per font and size and kept in an advance table;
+a line's pixel positions are then the cumulative sum of its characters'
+advances, and the break after each wrapped line is found with a binary
+search over the break opportunities. Optionally the kerning adjustment of
+each character pair is measured once and added the same way.
+
+Widths are sums of single glyph advances, so kerning (unless enabled),
+ligatures and shaping are not accounted for, and a line whose width lands
+within a fraction of a glyph of the available width may break differently
+than with PIL. Break opportunities and kinsoku rules are those of
+text_layout.wrap_line. benchmark_text_layout.py compares both.
+
+Usage:
+    from glyph_layout import wrap_line_glyphs
+
+    lines = wrap_line_glyphs("Some long text", max_width_px=240, font=font)
+
+    # Or for all of inventory.py's overflow estimates:
+    python inventory.py deck.pptx inventory.json --measure glyphs
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+from text_layout import CJK_RANGES, NO_BREAK_AFTER, NO_BREAK_BEFORE, font_key
+
+# Maximum number of cached advances or kerning pairs per font before that
+# font's table is reset
+GLYPH_TABLE_SIZE = 50_000
+
+# CJK ranges as (first, last) code points; CJK_RANGES is "a-b" triples
+CJK_CODEPOINTS = np.array(
+    [(ord(CJK_RANGES[i]), ord(CJK_RANGES[i + 2])) for i in range(0, len(CJK_RANGES), 3)]
+)
+NO_BREAK_BEFORE_CODEPOINTS = np.array(sorted(map(ord, NO_BREAK_BEFORE)))
+NO_BREAK_AFTER_CODEPOINTS = np.array(sorted(map(ord, NO_BREAK_AFTER)))
+
+SPACE = ord(" ")
+
+# Font key -> {code point -> advance}, and {(code point, code point) -> kerning}
+_advances: Dict[Tuple, Dict[int, float]] = {}
+_kerning: Dict[Tuple, Dict[Tuple[int, int], float]] = {}
+
+
+def wrap_line_glyphs(
+    line: str, max_width_px: float, font, kerning: bool = False
+) -> List[str]:
+    """Wrap a single line of text like text_layout.wrap_line, from glyph advances.
+
+    Args:
+        line: Text without newlines
+        max_width_px: Available width in pixels
+        font: Loaded PIL font
+        kerning: Also add the kerning adjustment of each character pair
+
+    Returns:
+        list: The wrapped lines ([""] for an empty line)
+    """
+    if not line:
+        return [""]
+
+    codepoints = np.frombuffer(line.encode("utf-32-le"), dtype=np.uint32).astype(
+        np.int64
+    )
+    key = font_key(font)
+    # Pixel position of each character boundary
+    positions = np.concatenate(
+        ([0.0], np.cumsum(glyph_advances(codepoints, font, key)))
+    )
+    if kerning and len(codepoints) > 1:
+        # Kerning between characters i and i + 1 applies from boundary i + 1 on
+        positions[2:] += np.cumsum(pair_kerning(codepoints, font, key))
+
+    if positions[-1] <= max_width_px:
+        return [line]
+
+    starts, ends = break_pieces(codepoints)
+    # Lines are measured from their first character, so a piece fits when its
+    # end position is within max_width_px of the line start; the running
+    # maximum keeps the search monotonic when kerning is negative
+    end_positions = np.maximum.accumulate(positions[ends])
+
+    wrapped = []
+    piece = 0
+    while piece < len(starts):
+        if starts[piece] == ends[piece]:
+            # Empty pieces (from repeated spaces) do not start a line
+            piece += 1
+            continue
+        limit = positions[starts[piece]] + max_width_px
+        # First piece that does not fit; the first piece always goes on the line
+        next_piece = max(
+            int(np.searchsorted(end_positions, limit, side="right")), piece + 1
+        )
+        wrapped.append(line[starts[piece] : ends[next_piece - 1]])
+        piece = next_piece
+
+    return wrapped
+
+
+def break_pieces(codepoints: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Split a line into the pieces text_layout.wrap_line places.
+
+    Pieces are separated by spaces (which are dropped at a line break) and by
+    CJK break opportunities (see text_layout.split_word).
+
+    Returns:
+        tuple: (start, end) character offsets of the pieces, as arrays
+    """
+    is_space = codepoints == SPACE
+    is_cjk = np.zeros(len(codepoints), dtype=bool)
+    for first, last in CJK_CODEPOINTS:
+        is_cjk |= (codepoints >= first) & (codepoints <= last)
+
+    before, after = codepoints[:-1], codepoints[1:]
+    cjk_break = (
+        ~is_space[:-1]
+        & ~is_space[1:]
+        & (is_cjk[:-1] | is_cjk[1:])
+        & ~np.isin(after, NO_BREAK_BEFORE_CODEPOINTS)
+        & ~np.isin(before, NO_BREAK_AFTER_CODEPOINTS)
+    )
+    spaces = np.flatnonzero(is_space)
+    breaks = np.flatnonzero(cjk_break) + 1
+
+    starts = np.sort(np.concatenate(([0], spaces + 1, breaks)))
+    ends = np.sort(np.concatenate((spaces, breaks, [len(codepoints)])))
+    return starts, ends
+
+
+def glyph_advances(codepoints: np.ndarray, font, key: Tuple = None) -> np.ndarray:
+    """Return the advance width of each character, measuring new ones once per font."""
+    table = _font_table(_advances, key or font_key(font))
+    unique, inverse = np.unique(codepoints, return_inverse=True)
+    values = []
+    for codepoint in unique.tolist():
+        advance = table.get(codepoint)
+        if advance is None:
+            advance = table[codepoint] = font.getlength(chr(codepoint))
+        values.append(advance)
+    return np.array(values)[inverse]
+
+
+def pair_kerning(codepoints: np.ndarray, font, key: Tuple = None) -> np.ndarray:
+    """Return the kerning adjustment between each pair of adjacent characters."""
+    table = _font_table(_kerning, key or font_key(font))
+    pairs = codepoints[:-1] << 21 | codepoints[1:]
+    unique, inverse = np.unique(pairs, return_inverse=True)
+    values = []
+    for pair in unique.tolist():
+        first, second = pair >> 21, pair & 0x1FFFFF
+        adjustment = table.get((first, second))
+        if adjustment is None:
+            adjustment = table[(first, second)] = (
+                font.getlength(chr(first) + chr(second))
+                - font.getlength(chr(first))
+                - font.getlength(chr(second))
+            )
+        values.append(adjustment)
+    return np.array(values)[inverse]
+
+
+def _font_table(tables: Dict[Tuple, Dict], key: Tuple) -> Dict:
+    table = tables.get(key)
+    if table is None or len(table) >= GLYPH_TABLE_SIZE:
+        table = tables[key] = {}
+    return table
@@ -16,24 +16,43 @@ Classes:
 
 Main Functions:
     extract_text_inventory: Extract all text from a presentation
+    iter_inventory_dicts: Extract slide by slide as JSON-ready dictionaries
     save_inventory: Save extracted data to JSON
 
 Usage:
-    python inventory.py input.pptx output.json
+    python inventory.py input.pptx output.json [--issues-only] [--jobs N]
+        [--fields text,geometry] [--format jsonl] [--slides 10-40] [--engine xml]
+        [--measure glyphs] [--profile] [--profile-stats out.prof]
+    python inventory.py diff before.pptx after.pptx [--format json]
 """
 
 import argparse
+import contextlib
+import functools
+import heapq
 import json
-import platform
+import multiprocessing
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
-
-from PIL import Image, ImageDraw, ImageFont
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from fonts import find_font, font_cache_info, get_font_index, load_font
+from inventory_cache import content_key, load_entry, store_entries
 from pptx import Presentation
 from pptx.enum.text import PP_ALIGN
 from pptx.shapes.base import BaseShape
+from profiling import PhaseProfiler, phase
 
 # Type aliases for cleaner signatures
 JsonValue = Union[str, int, float, bool, None]
@@ -46,9 +65,44 @@ InventoryData = Dict[
 ]  # Dict of slide_id -> {shape_id -> ShapeData}
 InventoryDict = Dict[str, Dict[str, ShapeDict]]  # JSON-serializable inventory
 
+# Fields that can be selected for extraction (see ShapeData):
+#   geometry   - position, size and placeholder type
+#   text       - paragraph text
+#   formatting - paragraph formatting and layout default font size (with text)
+#   overflow   - text frame overflow (measured with PIL) and slide overflow
+#   overlap    - overlapping shapes on the same slide
+#   warnings   - formatting warnings such as manual bullet symbols
+FIELDS = ("geometry", "text", "formatting", "overflow", "overlap", "warnings")
+ALL_FIELDS = frozenset(FIELDS)
+# Fields --issues-only filters on; computed whenever issues_only is set
+ISSUE_FIELDS = frozenset({"overflow", "overlap", "warnings"})
+# Shape dict keys each field produces ("paragraphs" comes from text/formatting)
+FIELD_KEYS = {
+    "geometry": ("left", "top", "width", "height", "placeholder_type"),
+    "formatting": ("default_font_size",),
+    "overflow": ("overflow",),
+    "overlap": ("overlap",),
+    "warnings": ("warnings",),
+}
+
+# Extraction engines: python-pptx objects, or the slide XML read with lxml
+# (inventory_xml.py)
+ENGINES = ("pptx", "xml")
+
+# Bump when extraction rules or the output schema change, so cached
+# inventories (see inventory_cache.py) are no longer used
+INVENTORY_VERSION = 1
+
 
 def main():
     """Main entry point for command-line usage."""
+    if sys.argv[1:2] == ["diff"]:
+        # Comparing two decks is a separate command (see inventory_diff.py)
+        from inventory_diff import main as diff_main
+
+        diff_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         description="Extract text inventory from PowerPoint with proper GroupShape support.",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -60,6 +114,27 @@ Examples:
   python inventory.py presentation.pptx inventory.json --issues-only
     Extracts only text shapes that have overflow or overlap issues
 
+  python inventory.py presentation.pptx inventory.json --jobs 4
+    Distributes slides over 4 worker processes (same output, faster on large decks)
+
+  python inventory.py presentation.pptx inventory.json --fields text,geometry
+    Extracts only text and positions, skipping overflow measurement and checks
+
+  python inventory.py presentation.pptx inventory.jsonl --format jsonl --slides 10-40
+    Analyzes only slides 10 to 40 and writes one JSON record per slide as it is done
+
+Results are cached per slide by the content of the slide and its layout and
+master (see inventory_cache.py), so after an edit only the changed slides are
+analyzed again, also by replace.py and thumbnail.py; --no-cache bypasses this.
+
+  python inventory.py diff template.pptx output.pptx
+    Lists the text and formatting changes between two decks, reading only
+    the slides that differ (see inventory_diff.py)
+
+  python inventory.py presentation.pptx inventory.json --profile --no-cache
+    Reports the time spent in each phase (loading, shape collection, font
+    lookup, text measurement, overlap detection, serialization)
+
 The output JSON includes:
   - All text content organized by slide and shape
   - Correct absolute positions for shapes in groups
@@ -76,8 +151,81 @@ The output JSON includes:
         action="store_true",
         help="Include only text shapes that have overflow or overlap issues",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Number of worker processes to distribute slides over (default: 1)",
+    )
+
+    parser.add_argument(
+        "--fields",
+        type=parse_fields,
+        default=None,
+        help="Comma-separated fields to extract: "
+        + ",".join(FIELDS)
+        + " (default: all)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "jsonl"],
+        default="json",
+        help="Output format: json (one nested object, default) or jsonl "
+        '(one {"slide": ..., "shapes": ...} record per line, written per slide)',
+    )
+    parser.add_argument(
+        "--slides",
+        type=parse_slide_range,
+        default=None,
+        metavar="RANGE",
+        help="0-based slide indices to analyze, e.g. 10-40 or 0,3,5- (default: all)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="pptx",
+        help="How slides are read: pptx (python-pptx, default) or xml "
+        "(lxml directly, faster; same output)",
+    )
+    parser.add_argument(
+        "--measure",
+        default=None,
+        metavar="BACKEND",
+        help="Text measurement for overflow estimates: pil (exact, default), "
+        "glyphs or glyphs-kerning (summed glyph advances with NumPy; faster, "
+        "approximate)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Analyze all slides even if cached results exist, and do not store them",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Report wall time, calls and peak RSS growth per phase, and the "
+        "font cache hit rate (--jobs worker processes are not included)",
+    )
+    parser.add_argument(
+        "--profile-stats",
+        default=None,
+        metavar="FILE",
+        help="Like --profile, and write the cProfile stats of the slowest phase "
+        "to FILE for pstats (slows the run down)",
+    )
 
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.measure:
+        # Only needed to select the backend; PIL is imported lazily otherwise
+        from text_layout import set_measure_backend
+
+        try:
+            set_measure_backend(args.measure)
+        except ValueError as e:
+            parser.error(str(e))
 
     input_path = Path(args.input)
     if not input_path.exists():
@@ -94,17 +242,50 @@ The output JSON includes:
             print(
                 "Filtering to include only text shapes with issues (overflow/overlap)"
             )
-        inventory = extract_text_inventory(input_path, issues_only=args.issues_only)
-
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        save_inventory(inventory, output_path)
+        reuse = None if args.no_cache else SlideReuse()
+        profiler = None
+        if args.profile or args.profile_stats:
+            profiler = PhaseProfiler(cprofile=args.profile_stats is not None)
+            profiler.start()
+        if args.format == "jsonl":
+            total_slides, total_shapes = save_inventory_jsonl(
+                iter_inventory_dicts(
+                    input_path,
+                    issues_only=args.issues_only,
+                    jobs=args.jobs,
+                    fields=args.fields,
+                    slides=args.slides,
+                    cache=not args.no_cache,
+                    engine=args.engine,
+                    reuse=reuse,
+                ),
+                output_path,
+            )
+        else:
+            inventory = get_inventory_as_dict(
+                input_path,
+                issues_only=args.issues_only,
+                jobs=args.jobs,
+                fields=args.fields,
+                slides=args.slides,
+                cache=not args.no_cache,
+                engine=args.engine,
+                reuse=reuse,
+            )
+            save_inventory_dict(inventory, output_path)
+            total_slides = len(inventory)
+            total_shapes = sum(len(shapes) for shapes in inventory.values())
 
         print(f"Output saved to: {args.output}")
+        if reuse is not None:
+            print(reuse.summary())
+        if profiler is not None:
+            profiler.stop()
+            print_profile(profiler, args.profile_stats)
 
         # Report statistics
-        total_slides = len(inventory)
-        total_shapes = sum(len(shapes) for shapes in inventory.values())
         if args.issues_only:
             if total_shapes > 0:
                 print(
@@ -125,6 +306,99 @@ The output JSON includes:
         sys.exit(1)
 
 
+def print_profile(profiler: PhaseProfiler, stats_path: Optional[str]) -> None:
+    """Print a profiler's report, writing the slowest phase's stats if requested."""
+    print(profiler.report())
+    fonts = font_cache_info()
+    if fonts["hits"] or fonts["misses"]:
+        print(
+            f"Font cache: {fonts['hits']} hits, {fonts['misses']} misses "
+            f"({fonts['hit_rate']:.1%} hit rate), {fonts['size']} of "
+            f"{fonts['maxsize']} fonts loaded"
+        )
+    if stats_path:
+        slowest = profiler.dump_stats(stats_path)
+        if slowest:
+            print(
+                f"cProfile stats of the slowest phase ({slowest}) saved to: {stats_path}"
+            )
+
+
+def parse_fields(spec: str) -> frozenset:
+    """Parse a --fields value such as "text,geometry"."""
+    fields = frozenset(f.strip() for f in spec.split(",") if f.strip())
+    unknown = sorted(fields - ALL_FIELDS)
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown field(s) {', '.join(unknown)}; choose from {', '.join(FIELDS)}"
+        )
+    if not fields:
+        raise argparse.ArgumentTypeError("no fields given")
+    return fields
+
+
+def parse_slide_range(spec: str) -> "SlideSelection":
+    """Parse a --slides value such as "10-40" or "0,3,5-" (0-based, inclusive)."""
+    ranges = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, dash, stop = part.partition("-")
+        try:
+            first = int(start)
+            last = (int(stop) if stop.strip() else None) if dash else first
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid slide range '{part}'")
+        if first < 0 or (last is not None and last < first):
+            raise argparse.ArgumentTypeError(f"invalid slide range '{part}'")
+        ranges.append((first, last))
+    if not ranges:
+        raise argparse.ArgumentTypeError("no slides given")
+    return SlideSelection(tuple(ranges))
+
+
+@dataclass(frozen=True)
+class SlideSelection:
+    """Inclusive ranges of 0-based slide indices; an open range runs to the end."""
+
+    ranges: Tuple[Tuple[int, Optional[int]], ...]
+
+    def indices(self, slide_count: int) -> List[int]:
+        """Return the selected indices of a deck with slide_count slides, in order."""
+        selected = set()
+        for first, last in self.ranges:
+            stop = slide_count if last is None else min(last + 1, slide_count)
+            selected.update(range(first, stop))
+        return sorted(selected)
+
+    def __contains__(self, slide_idx: int) -> bool:
+        return any(
+            first <= slide_idx and (last is None or slide_idx <= last)
+            for first, last in self.ranges
+        )
+
+
+@dataclass
+class SlideReuse:
+    """Slides an inventory run took from the cache and slides it analyzed."""
+
+    reused: List[int] = field(default_factory=list)
+    recomputed: List[int] = field(default_factory=list)
+
+    def summary(self) -> str:
+        """Describe the reuse in one line, e.g. for the command-line output."""
+        total = len(self.reused) + len(self.recomputed)
+        text = (
+            f"Reused {len(self.reused)} of {total} slides from the cache, "
+            f"recomputed {len(self.recomputed)}"
+        )
+        if 0 < len(self.recomputed) <= 10:
+            label = "slide" if len(self.recomputed) == 1 else "slides"
+            text += f" ({label} {', '.join(map(str, self.recomputed))})"
+        return text
+
+
 @dataclass
 class ShapeWithPosition:
     """A shape with its absolute position on the slide."""
@@ -135,15 +409,41 @@ class ShapeWithPosition:
 
 
 class ParagraphData:
-    """Data structure for paragraph properties extracted from a PowerPoint paragraph."""
+    """Data structure for paragraph properties extracted from a PowerPoint paragraph.
+
+    Shapes keep one instance per paragraph for their lifetime, so attributes
+    are stored in slots rather than a per-instance dict.
+    """
 
-    def __init__(self, paragraph: Any):
+    __slots__ = (
+        "index",
+        "raw_text",
+        "text",
+        "bullet",
+        "level",
+        "alignment",
+        "space_before",
+        "space_after",
+        "font_name",
+        "font_size",
+        "bold",
+        "italic",
+        "underline",
+        "color",
+        "theme_color",
+        "line_spacing",
+    )
+
+    def __init__(self, paragraph: Any, index: int = 0):
         """Initialize from a PowerPoint paragraph object.
 
         Args:
             paragraph: The PowerPoint paragraph object
+            index: Position of the paragraph in its text frame
         """
-        self.text: str = paragraph.text.strip()
+        self.index = index
+        self.raw_text: str = paragraph.text  # Unstripped, as measured for overflow
+        self.text: str = self.raw_text.strip()
         self.bullet: bool = False
         self.level: Optional[int] = None
         self.alignment: Optional[str] = None
@@ -263,6 +563,73 @@ class ParagraphData:
         return result
 
 
+class StyleResolver:
+    """Default font sizes from slide layouts and masters, indexed once per deck.
+
+    Every placeholder used to walk its layout's placeholders, and every text
+    shape the whole slide-master tree. Slides share a handful of layouts and
+    masters, so each layout and master is indexed on first use and later
+    lookups are dictionary accesses. The lookup rules are unchanged: the first
+    defRPr with a size in the layout placeholder of the same type, and the
+    first size in the master's titleStyle/bodyStyle.
+    """
+
+    def __init__(self):
+        # Layout part -> {placeholder type -> size in points or None}
+        self._layouts: Dict[Any, Dict[Any, Optional[float]]] = {}
+        # Master part -> {style name -> size in points or None}
+        self._masters: Dict[Any, Dict[str, Optional[int]]] = {}
+
+    def layout_font_size(
+        self, slide_layout: Any, placeholder_type: Any
+    ) -> Optional[float]:
+        """Default font size of the layout placeholder of the given type."""
+        index = self._layouts.get(slide_layout.part)
+        if index is None:
+            index = self._layouts[slide_layout.part] = self._index_layout(slide_layout)
+        return index.get(placeholder_type)
+
+    def master_font_size(self, slide_master: Any, style_name: str) -> Optional[int]:
+        """Font size of a master text style ("titleStyle" or "bodyStyle")."""
+        index = self._masters.get(slide_master.part)
+        if index is None:
+            index = self._masters[slide_master.part] = self._index_master(slide_master)
+        return index.get(style_name)
+
+    @staticmethod
+    def _index_layout(slide_layout: Any) -> Dict[Any, Optional[float]]:
+        index: Dict[Any, Optional[float]] = {}
+        try:
+            for layout_placeholder in slide_layout.placeholders:
+                shape_type = layout_placeholder.placeholder_format.type
+                if shape_type in index:
+                    # Only the first placeholder of each type is used
+                    continue
+                index[shape_type] = None
+                # Find first defRPr element with sz (size) attribute
+                for elem in layout_placeholder.element.iter():
+                    if "defRPr" in elem.tag and (sz := elem.get("sz")):
+                        index[shape_type] = float(sz) / 100.0  # EMUs to points
+                        break
+        except Exception:
+            # Placeholders after an unreadable one have no default size
+            pass
+        return index
+
+    @staticmethod
+    def _index_master(slide_master: Any) -> Dict[str, Optional[int]]:
+        index: Dict[str, Optional[int]] = {}
+        for child in slide_master.element.iter():
+            tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
+            if tag not in ("titleStyle", "bodyStyle") or tag in index:
+                continue
+            for elem in child.iter():
+                if "sz" in elem.attrib:
+                    index[tag] = int(elem.attrib["sz"]) // 100
+                    break
+        return index
+
+
 class ShapeData:
     """Data structure for shape properties extracted from a PowerPoint shape."""
 
@@ -286,61 +653,8 @@ class ShapeData:
         Returns:
             Path to the font file, or None if not found
         """
-        system = platform.system()
-
-        # Common font file variations to try
-        font_variations = [
-            font_name,
-            font_name.lower(),
-            font_name.replace(" ", ""),
-            font_name.replace(" ", "-"),
-        ]
-
-        # Define font directories and extensions by platform
-        if system == "Darwin":  # macOS
-            font_dirs = [
-                "/System/Library/Fonts/",
-                "/Library/Fonts/",
-                "~/Library/Fonts/",
-            ]
-            extensions = [".ttf", ".otf", ".ttc", ".dfont"]
-        else:  # Linux
-            font_dirs = [
-                "/usr/share/fonts/truetype/",
-                "/usr/local/share/fonts/",
-                "~/.fonts/",
-            ]
-            extensions = [".ttf", ".otf"]
-
-        # Try to find the font file
-        from pathlib import Path
-
-        for font_dir in font_dirs:
-            font_dir_path = Path(font_dir).expanduser()
-            if not font_dir_path.exists():
-                continue
-
-            # First try exact matches
-            for variant in font_variations:
-                for ext in extensions:
-                    font_path = font_dir_path / f"{variant}{ext}"
-                    if font_path.exists():
-                        return str(font_path)
-
-            # Then try fuzzy matching - find files containing the font name
-            try:
-                for file_path in font_dir_path.iterdir():
-                    if file_path.is_file():
-                        file_name_lower = file_path.name.lower()
-                        font_name_lower = font_name.lower().replace(" ", "")
-                        if font_name_lower in file_name_lower and any(
-                            file_name_lower.endswith(ext) for ext in extensions
-                        ):
-                            return str(file_path)
-            except (OSError, PermissionError):
-                continue
-
-        return None
+        face = find_font(font_name)
+        return face.path if face else None
 
     @staticmethod
     def get_slide_dimensions(slide: Any) -> tuple[Optional[int], Optional[int]]:
@@ -359,12 +673,15 @@ class ShapeData:
             return None, None
 
     @staticmethod
-    def get_default_font_size(shape: BaseShape, slide_layout: Any) -> Optional[float]:
+    def get_default_font_size(
+        shape: BaseShape, slide_layout: Any, styles: Optional[StyleResolver] = None
+    ) -> Optional[float]:
         """Extract default font size from slide layout for a placeholder shape.
 
         Args:
             shape: Placeholder shape
             slide_layout: Slide layout containing the placeholder definition
+            styles: Style resolver shared by the shapes of a presentation
 
         Returns:
             Default font size in points, or None if not found
@@ -374,13 +691,9 @@ class ShapeData:
                 return None
 
             shape_type = shape.placeholder_format.type  # type: ignore
-            for layout_placeholder in slide_layout.placeholders:
-                if layout_placeholder.placeholder_format.type == shape_type:
-                    # Find first defRPr element with sz (size) attribute
-                    for elem in layout_placeholder.element.iter():
-                        if "defRPr" in elem.tag and (sz := elem.get("sz")):
-                            return float(sz) / 100.0  # Convert EMUs to points
-                    break
+            return (styles or StyleResolver()).layout_font_size(
+                slide_layout, shape_type
+            )
         except Exception:
             pass
         return None
@@ -391,6 +704,8 @@ class ShapeData:
         absolute_left: Optional[int] = None,
         absolute_top: Optional[int] = None,
         slide: Optional[Any] = None,
+        styles: Optional[StyleResolver] = None,
+        fields: Optional[Iterable[str]] = None,
     ):
         """Initialize from a PowerPoint shape object.
 
@@ -399,8 +714,14 @@ class ShapeData:
             absolute_left: Absolute left position in EMUs (for shapes in groups)
             absolute_top: Absolute top position in EMUs (for shapes in groups)
             slide: Optional slide object to get dimensions and layout information
+            styles: Optional style resolver shared by all shapes of the presentation
+            fields: Fields to compute (see FIELDS, default: all). Overflow
+                estimation and bullet checks only run when requested.
         """
         self.shape = shape  # Store reference to original shape
+        self.styles = styles or StyleResolver()
+        self._paragraphs: Optional[List[ParagraphData]] = None
+        self.fields = ALL_FIELDS if fields is None else frozenset(fields)
         self.shape_id: str = ""  # Will be set after sorting
 
         # Get slide dimensions from slide object
@@ -418,9 +739,13 @@ class ShapeData:
                 )
 
                 # Get default font size from layout
-                if slide and hasattr(slide, "slide_layout"):
+                if (
+                    "formatting" in self.fields
+                    and slide
+                    and hasattr(slide, "slide_layout")
+                ):
                     self.default_font_size = self.get_default_font_size(
-                        shape, slide.slide_layout
+                        shape, slide.slide_layout, self.styles
                     )
 
         # Get position information
@@ -461,21 +786,23 @@ class ShapeData:
             str, float
         ] = {}  # Dict of shape_id -> overlap area in sq inches
         self.warnings: List[str] = []
-        self._estimate_frame_overflow()
-        self._calculate_slide_overflow()
-        self._detect_bullet_issues()
+        if "overflow" in self.fields:
+            self._estimate_frame_overflow()
+            self._calculate_slide_overflow()
+        if "warnings" in self.fields:
+            self._detect_bullet_issues()
 
     @property
     def paragraphs(self) -> List[ParagraphData]:
-        """Calculate paragraphs from the shape's text frame."""
-        if not self.shape or not hasattr(self.shape, "text_frame"):
-            return []
-
-        paragraphs = []
-        for paragraph in self.shape.text_frame.paragraphs:  # type: ignore
-            if paragraph.text.strip():
-                paragraphs.append(ParagraphData(paragraph))
-        return paragraphs
+        """Non-empty paragraphs of the shape's text frame, extracted once."""
+        if self._paragraphs is None:
+            self._paragraphs = []
+            if self.shape and hasattr(self.shape, "text_frame"):
+                text_frame = self.shape.text_frame  # type: ignore
+                for index, paragraph in enumerate(text_frame.paragraphs):
+                    if paragraph.text.strip():
+                        self._paragraphs.append(ParagraphData(paragraph, index))
+        return self._paragraphs
 
     def _get_default_font_size(self) -> int:
         """Get default font size from theme text styles or use conservative default."""
@@ -495,12 +822,9 @@ class ShapeData:
                 style_name = "titleStyle"
 
             # Find font size in theme styles
-            for child in slide_master.element.iter():
-                tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
-                if tag == style_name:
-                    for elem in child.iter():
-                        if "sz" in elem.attrib:
-                            return int(elem.attrib["sz"]) // 100
+            font_size = self.styles.master_font_size(slide_master, style_name)
+            if font_size is not None:
+                return font_size
         except Exception:
             pass
 
@@ -531,83 +855,60 @@ class ShapeData:
             self.inches_to_pixels(usable_height),
         )
 
-    def _wrap_text_line(self, line: str, max_width_px: int, draw, font) -> List[str]:
-        """Wrap a single line of text to fit within max_width_px."""
-        if not line:
-            return [""]
-
-        # Use textlength for efficient width calculation
-        if draw.textlength(line, font=font) <= max_width_px:
-            return [line]
-
-        # Need to wrap - split into words
-        wrapped = []
-        words = line.split(" ")
-        current_line = ""
-
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            if draw.textlength(test_line, font=font) <= max_width_px:
-                current_line = test_line
-            else:
-                if current_line:
-                    wrapped.append(current_line)
-                current_line = word
-
-        if current_line:
-            wrapped.append(current_line)
+    def _text_frame(self) -> Optional[Any]:
+        """Return the shape's text frame, or None if it has no paragraphs."""
+        if not self.shape or not hasattr(self.shape, "text_frame"):
+            return None
 
-        return wrapped
+        text_frame = self.shape.text_frame  # type: ignore
+        if not text_frame or not text_frame.paragraphs:
+            return None
+        return text_frame
 
     def _estimate_frame_overflow(self) -> None:
         """Estimate if text overflows the shape bounds using PIL text measurement."""
-        if not self.shape or not hasattr(self.shape, "text_frame"):
+        text_frame = self._text_frame()
+        if text_frame is None:
             return
 
-        text_frame = self.shape.text_frame  # type: ignore
-        if not text_frame or not text_frame.paragraphs:
-            return
+        # Text measurement needs PIL, which other fields do not
+        from text_layout import wrap_line
 
         # Get usable dimensions after accounting for margins
         usable_width_px, usable_height_px = self._get_usable_dimensions(text_frame)
         if usable_width_px <= 0 or usable_height_px <= 0:
             return
 
-        # Set up PIL for text measurement
-        dummy_img = Image.new("RGB", (1, 1))
-        draw = ImageDraw.Draw(dummy_img)
-
         # Get default font size from placeholder or use conservative estimate
         default_font_size = self._get_default_font_size()
 
         # Calculate total height of all paragraphs
         total_height_px = 0
 
-        for para_idx, paragraph in enumerate(text_frame.paragraphs):
-            if not paragraph.text.strip():
-                continue
-
-            para_data = ParagraphData(paragraph)
+        for para_data in self.paragraphs:
+            para_idx = para_data.index
 
             # Load font for this paragraph
             font_name = para_data.font_name or "Arial"
             font_size = int(para_data.font_size or default_font_size)
 
             font = None
-            font_path = self.get_font_path(font_name)
-            if font_path:
-                try:
-                    font = ImageFont.truetype(font_path, size=font_size)
-                except Exception:
-                    font = ImageFont.load_default()
-            else:
-                font = ImageFont.load_default()
+            with phase("font lookup"):
+                face = find_font(font_name)
+                if face:
+                    try:
+                        font = load_font(face.path, font_size, face.index)
+                    except Exception:
+                        font = load_font(None)
+                else:
+                    font = load_font(None)
 
             # Wrap all lines in this paragraph
             all_wrapped_lines = []
-            for line in paragraph.text.split("\n"):
-                wrapped = self._wrap_text_line(line, usable_width_px, draw, font)
-                all_wrapped_lines.extend(wrapped)
+            with phase("text measurement"):
+                for line in para_data.raw_text.split("\n"):
+                    wrapped = wrap_line(line, usable_width_px, font)
+                    all_wrapped_lines.extend(wrapped)
 
             if all_wrapped_lines:
                 # Calculate line height
@@ -659,11 +960,8 @@ class ShapeData:
 
     def _detect_bullet_issues(self) -> None:
         """Detect bullet point formatting issues in paragraphs."""
-        if not self.shape or not hasattr(self.shape, "text_frame"):
-            return
-
-        text_frame = self.shape.text_frame  # type: ignore
-        if not text_frame or not text_frame.paragraphs:
+        text_frame = self._text_frame()
+        if text_frame is None:
             return
 
         # Common bullet symbols that indicate manual bullets
@@ -678,6 +976,28 @@ class ShapeData:
                 )
                 break
 
+    def restore(self, shape_dict: ShapeDict, fields: Iterable[str]) -> None:
+        """Take analysis results from a cached shape dict instead of computing them.
+
+        Args:
+            shape_dict: The shape's to_dict() output from an inventory that
+                computed at least these fields
+            fields: Fields the restored shape provides
+        """
+        self.fields = frozenset(fields)
+        self.default_font_size = shape_dict.get("default_font_size")  # type: ignore
+        overflow: Dict[str, Any] = shape_dict.get("overflow") or {}  # type: ignore
+        self.frame_overflow_bottom = overflow.get("frame", {}).get("overflow_bottom")
+        self.slide_overflow_right = overflow.get("slide", {}).get("overflow_right")
+        self.slide_overflow_bottom = overflow.get("slide", {}).get("overflow_bottom")
+        overlap: Dict[str, Any] = shape_dict.get("overlap") or {}  # type: ignore
+        self.overlapping_shapes = dict(overlap.get("overlapping_shapes", {}))
+        self.warnings = list(shape_dict.get("warnings") or [])  # type: ignore
+        if "overflow" in self.fields:
+            # The overflow estimate reads every paragraph through python-pptx,
+            # which adds empty <a:pPr> elements; leave the XML in the same state
+            _ = self.paragraphs
+
     @property
     def has_any_issues(self) -> bool:
         """Check if shape has any issues (overflow, overlap, or warnings)."""
@@ -689,34 +1009,40 @@ class ShapeData:
             or len(self.warnings) > 0
         )
 
-    def to_dict(self) -> ShapeDict:
-        """Convert to dictionary for JSON serialization."""
-        result: ShapeDict = {
-            "left": self.left,
-            "top": self.top,
-            "width": self.width,
-            "height": self.height,
-        }
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> ShapeDict:
+        """Convert to dictionary for JSON serialization.
+
+        Args:
+            fields: Fields to include (default: the fields this shape computed)
+        """
+        fields = self.fields if fields is None else frozenset(fields)
+        result: ShapeDict = {}
 
-        # Add optional fields if present
-        if self.placeholder_type:
-            result["placeholder_type"] = self.placeholder_type
+        if "geometry" in fields:
+            result["left"] = self.left
+            result["top"] = self.top
+            result["width"] = self.width
+            result["height"] = self.height
 
-        if self.default_font_size:
+            # Add optional fields if present
+            if self.placeholder_type:
+                result["placeholder_type"] = self.placeholder_type
+
+        if "formatting" in fields and self.default_font_size:
             result["default_font_size"] = self.default_font_size
 
         # Add overflow information only if there is overflow
         overflow_data = {}
 
         # Add frame overflow if present
-        if self.frame_overflow_bottom is not None:
+        if "overflow" in fields and self.frame_overflow_bottom is not None:
             overflow_data["frame"] = {"overflow_bottom": self.frame_overflow_bottom}
 
         # Add slide overflow if present
         slide_overflow = {}
-        if self.slide_overflow_right is not None:
+        if "overflow" in fields and self.slide_overflow_right is not None:
             slide_overflow["overflow_right"] = self.slide_overflow_right
-        if self.slide_overflow_bottom is not None:
+        if "overflow" in fields and self.slide_overflow_bottom is not None:
             slide_overflow["overflow_bottom"] = self.slide_overflow_bottom
         if slide_overflow:
             overflow_data["slide"] = slide_overflow
@@ -726,18 +1052,36 @@ class ShapeData:
             result["overflow"] = overflow_data
 
         # Add overlap field if there are overlapping shapes
-        if self.overlapping_shapes:
+        if "overlap" in fields and self.overlapping_shapes:
             result["overlap"] = {"overlapping_shapes": self.overlapping_shapes}
 
         # Add warnings field if there are warnings
-        if self.warnings:
+        if "warnings" in fields and self.warnings:
             result["warnings"] = self.warnings
 
         # Add paragraphs after placeholder_type
-        result["paragraphs"] = [para.to_dict() for para in self.paragraphs]
+        if "formatting" in fields:
+            result["paragraphs"] = [para.to_dict() for para in self.paragraphs]
+        elif "text" in fields:
+            # Plain text needs no formatting lookups
+            result["paragraphs"] = [{"text": text} for text in self.paragraph_texts()]
 
         return result
 
+    def paragraph_texts(self) -> List[str]:
+        """Return the stripped text of the non-empty paragraphs."""
+        if self._paragraphs is not None:
+            return [para.text for para in self._paragraphs]
+        text_frame = self._text_frame()
+        if text_frame is None:
+            return []
+        texts = []
+        for paragraph in text_frame.paragraphs:
+            text = paragraph.text.strip()
+            if text:
+                texts.append(text)
+        return texts
+
 
 def is_valid_shape(shape: BaseShape) -> bool:
     """Check if a shape contains meaningful text content."""
@@ -879,40 +1223,59 @@ def calculate_overlap(
     return False, 0
 
 
-def detect_overlaps(shapes: List[ShapeData]) -> None:
+def detect_overlaps(shapes: List[ShapeData], tolerance: float = 0.05) -> None:
     """Detect overlapping shapes and update their overlapping_shapes dictionaries.
 
     This function requires each ShapeData to have its shape_id already set.
     It modifies the shapes in-place, adding shape IDs with overlap areas in square inches.
 
+    Shapes are swept left to right, so only pairs that overlap horizontally by
+    more than the tolerance are compared with calculate_overlap. This is
+    O(n log n + k) for k horizontally overlapping pairs instead of comparing
+    every pair, which matters on slides with hundreds of text boxes.
+
     Args:
         shapes: List of ShapeData objects with shape_id attributes set
+        tolerance: Minimum overlap in inches to consider as overlapping
     """
-    n = len(shapes)
-
-    # Compare each pair of shapes
-    for i in range(n):
-        for j in range(i + 1, n):
-            shape1 = shapes[i]
-            shape2 = shapes[j]
-
-            # Ensure shape IDs are set
-            assert shape1.shape_id, f"Shape at index {i} has no shape_id"
-            assert shape2.shape_id, f"Shape at index {j} has no shape_id"
-
-            rect1 = (shape1.left, shape1.top, shape1.width, shape1.height)
-            rect2 = (shape2.left, shape2.top, shape2.width, shape2.height)
+    for i, shape in enumerate(shapes):
+        # Ensure shape IDs are set
+        assert shape.shape_id, f"Shape at index {i} has no shape_id"
+
+    rects = [(s.left, s.top, s.width, s.height) for s in shapes]
+
+    # Shapes whose right edge is still past the sweep position, by right edge
+    active: List[Tuple[float, int]] = []
+    pairs = []
+    for j in sorted(range(len(shapes)), key=lambda k: rects[k][0]):
+        left, _, width, _ = rects[j]
+        while active and active[0][0] - left <= tolerance:
+            heapq.heappop(active)
+
+        for _, i in active:
+            overlaps, overlap_area = calculate_overlap(
+                rects[min(i, j)], rects[max(i, j)], tolerance
+            )
+            if overlaps:
+                pairs.append((min(i, j), max(i, j), overlap_area))
 
-            overlaps, overlap_area = calculate_overlap(rect1, rect2)
+        heapq.heappush(active, (left + width, j))
 
-            if overlaps:
-                # Add shape IDs with overlap area in square inches
-                shape1.overlapping_shapes[shape2.shape_id] = overlap_area
-                shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+    # Record pairs in index order so each dictionary lists its overlapping
+    # shapes in the same order as a pairwise comparison would
+    for i, j, overlap_area in sorted(pairs):
+        # Add shape IDs with overlap area in square inches
+        shapes[i].overlapping_shapes[shapes[j].shape_id] = overlap_area
+        shapes[j].overlapping_shapes[shapes[i].shape_id] = overlap_area
 
 
 def extract_text_inventory(
-    pptx_path: Path, prs: Optional[Any] = None, issues_only: bool = False
+    pptx_path: Path,
+    prs: Optional[Any] = None,
+    issues_only: bool = False,
+    fields: Optional[Iterable[str]] = None,
+    cache: bool = False,
+    reuse: Optional[SlideReuse] = None,
 ) -> InventoryData:
     """Extract text content from all slides in a PowerPoint presentation.
 
@@ -920,6 +1283,15 @@ def extract_text_inventory(
         pptx_path: Path to the PowerPoint file
         prs: Optional Presentation object to use. If not provided, will load from pptx_path.
         issues_only: If True, only include shapes that have overflow or overlap issues
+        fields: Fields to compute (see FIELDS, default: all). Callers that only
+            need geometry or text skip overflow measurement and overlap checks.
+        cache: If True, analysis results of slides whose content (with their
+            layout and master) was analyzed before are taken from the
+            inventory cache, and the other slides' results are stored there.
+            The shapes still come from prs, which must be unmodified since it
+            was loaded from pptx_path.
+        reuse: Records which slides were taken from the cache and which
+            were analyzed
 
     Returns a nested dictionary: {slide-N: {shape-N: ShapeData}}
     Shapes are sorted by visual position (top-to-bottom, left-to-right).
@@ -927,17 +1299,70 @@ def extract_text_inventory(
     converted to dictionaries for JSON serialization using to_dict().
     """
     if prs is None:
-        prs = Presentation(str(pptx_path))
+        with phase("load"):
+            prs = Presentation(str(pptx_path))
     inventory: InventoryData = {}
+    styles = StyleResolver()
+    compute_fields = _compute_fields(fields, issues_only)
+    digests = slide_digests(pptx_path) if cache else None
+    # Slide digest -> unfiltered shape dicts of the slides analyzed here
+    computed: Dict[str, Dict[str, ShapeDict]] = {}
 
     for slide_idx, slide in enumerate(prs.slides):
+        cached = None
+        if digests is not None:
+            cached = load_cached_slide(digests[slide_idx], compute_fields)
+            if reuse is not None:
+                reused = reuse.reused if cached is not None else reuse.recomputed
+                reused.append(slide_idx)
+
+        slide_inventory = extract_slide_inventory(
+            slide, styles, issues_only, fields, cached=cached
+        )
+        if digests is not None and cached is None and not issues_only:
+            computed[digests[slide_idx]] = _shapes_to_dicts(slide_inventory, None)
+        if slide_inventory:
+            inventory[f"slide-{slide_idx}"] = slide_inventory
+
+    if computed:
+        cache_slides(computed, compute_fields)
+
+    return inventory
+
+
+def extract_slide_inventory(
+    slide: Any,
+    styles: StyleResolver,
+    issues_only: bool = False,
+    fields: Optional[Iterable[str]] = None,
+    cached: Optional[Dict[str, ShapeDict]] = None,
+) -> Dict[str, ShapeData]:
+    """Extract the text shapes of one slide as {shape-N: ShapeData}.
+
+    Args:
+        slide: Slide object
+        styles: Style resolver shared by the slides of the presentation
+        issues_only: If True, only include shapes that have overflow or overlap issues
+        fields: Fields to compute (see FIELDS, default: all)
+        cached: The slide's shape dicts from a cached inventory of the same
+            deck. Analysis results are restored from them instead of being
+            computed; the slide is analyzed if its shapes do not match.
+
+    Returns:
+        Shapes sorted by visual position (empty if the slide has no text shapes)
+    """
+    with phase("shape collection"):
         # Collect all valid shapes from this slide with absolute positions
         shapes_with_positions = []
         for shape in slide.shapes:  # type: ignore
             shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
 
         if not shapes_with_positions:
-            continue
+            return {}
+
+        requested_fields = fields
+        # Issues must be known to filter on them, even if they are not output
+        fields = _compute_fields(fields, issues_only)
 
         # Convert to ShapeData with absolute positions and slide reference
         shape_data_list = [
@@ -946,35 +1371,45 @@ def extract_text_inventory(
                 swp.absolute_left,
                 swp.absolute_top,
                 slide,
+                styles,
+                frozenset() if cached is not None else fields,
             )
             for swp in shapes_with_positions
         ]
 
         # Sort by visual position and assign stable IDs in one step
         sorted_shapes = sort_shapes_by_position(shape_data_list)
-        for idx, shape_data in enumerate(sorted_shapes):
-            shape_data.shape_id = f"shape-{idx}"
-
+    for idx, shape_data in enumerate(sorted_shapes):
+        shape_data.shape_id = f"shape-{idx}"
+
+    if cached is not None:
+        if set(cached) != {shape_data.shape_id for shape_data in sorted_shapes}:
+            return extract_slide_inventory(slide, styles, issues_only, requested_fields)
+        for shape_data in sorted_shapes:
+            shape_data.restore(cached[shape_data.shape_id], fields)
+    elif "overlap" in fields and len(sorted_shapes) > 1:
         # Detect overlaps using the stable shape IDs
-        if len(sorted_shapes) > 1:
+        with phase("overlap detection"):
             detect_overlaps(sorted_shapes)
 
-        # Filter for issues only if requested (after overlap detection)
-        if issues_only:
-            sorted_shapes = [sd for sd in sorted_shapes if sd.has_any_issues]
+    # Filter for issues only if requested (after overlap detection)
+    if issues_only:
+        sorted_shapes = [sd for sd in sorted_shapes if sd.has_any_issues]
 
-        if not sorted_shapes:
-            continue
+    # Create slide inventory using the stable shape IDs
+    return {shape_data.shape_id: shape_data for shape_data in sorted_shapes}
 
-        # Create slide inventory using the stable shape IDs
-        inventory[f"slide-{slide_idx}"] = {
-            shape_data.shape_id: shape_data for shape_data in sorted_shapes
-        }
 
-    return inventory
-
-
-def get_inventory_as_dict(pptx_path: Path, issues_only: bool = False) -> InventoryDict:
+def get_inventory_as_dict(
+    pptx_path: Path,
+    issues_only: bool = False,
+    jobs: int = 1,
+    fields: Optional[Iterable[str]] = None,
+    slides: Optional[SlideSelection] = None,
+    cache: bool = False,
+    engine: str = "pptx",
+    reuse: Optional[SlideReuse] = None,
+) -> InventoryDict:
     """Extract text inventory and return as JSON-serializable dictionaries.
 
     This is a convenience wrapper around extract_text_inventory that returns
@@ -984,20 +1419,390 @@ def get_inventory_as_dict(pptx_path: Path, issues_only: bool = False) -> Invento
     Args:
         pptx_path: Path to the PowerPoint file
         issues_only: If True, only include shapes that have overflow or overlap issues
+        jobs: Number of worker processes. With more than one, slides are
+            distributed over processes that each open the presentation; the
+            result is identical to a serial run.
+        fields: Fields to compute and include (see FIELDS, default: all)
+        slides: Slides to analyze (default: all); other slides are skipped
+        cache: If True, cached results are used for slides whose content
+            (with their layout and master) was analyzed before, and the
+            results of the other slides are stored in the cache
+        engine: "pptx" to read the deck through python-pptx, or "xml" to read
+            the slide XML directly (see inventory_xml.py); both produce the
+            same inventory
+        reuse: Records which slides were taken from the cache and which
+            were analyzed
 
     Returns:
         Nested dictionary with all data serialized for JSON
     """
-    inventory = extract_text_inventory(pptx_path, issues_only=issues_only)
+    return dict(
+        iter_inventory_dicts(
+            pptx_path, issues_only, jobs, fields, slides, cache, engine, reuse
+        )
+    )
+
+
+def iter_inventory_dicts(
+    pptx_path: Path,
+    issues_only: bool = False,
+    jobs: int = 1,
+    fields: Optional[Iterable[str]] = None,
+    slides: Optional[SlideSelection] = None,
+    cache: bool = False,
+    engine: str = "pptx",
+    reuse: Optional[SlideReuse] = None,
+) -> Iterator[Tuple[str, Dict[str, ShapeDict]]]:
+    """Extract the inventory slide by slide, as JSON-ready dictionaries.
+
+    Each slide is yielded as soon as it has been analyzed, so callers can
+    write it out and drop it before the next one is extracted. Arguments are
+    the same as for get_inventory_as_dict.
+
+    Yields:
+        (slide-N, {shape-N: shape dict}) in slide order, for slides with text shapes
+    """
+    if not cache:
+        yield from _iter_slide_dicts(
+            pptx_path, issues_only, jobs, fields, slides, engine
+        )
+        return
+
+    # The cache holds unfiltered slides; fields and issues are selected here
+    fields = ALL_FIELDS if fields is None else frozenset(fields)
+    compute_fields = _compute_fields(fields, issues_only)
+    digests = slide_digests(pptx_path)
+    slide_indices = (
+        list(range(len(digests))) if slides is None else slides.indices(len(digests))
+    )
+    cached = {
+        slide_idx: load_cached_slide(digests[slide_idx], compute_fields, engine)
+        for slide_idx in slide_indices
+    }
+    missing = [slide_idx for slide_idx in slide_indices if cached[slide_idx] is None]
+    if reuse is not None:
+        reuse.reused.extend(idx for idx in slide_indices if cached[idx] is not None)
+        reuse.recomputed.extend(missing)
+
+    # Only opened if some slides were not cached
+    results = _iter_slide_results(
+        pptx_path, False, jobs, compute_fields, missing, engine
+    )
+    computed: Dict[str, Dict[str, ShapeDict]] = {}
+    for slide_idx in slide_indices:
+        shapes = cached.pop(slide_idx)
+        if shapes is None:
+            _, shapes = next(results)
+            computed[digests[slide_idx]] = shapes
+
+        selected = {
+            shape_key: select_shape_fields(shape_dict, fields)
+            for shape_key, shape_dict in shapes.items()
+            if not issues_only or ISSUE_FIELDS.intersection(shape_dict)
+        }
+        if selected:
+            yield f"slide-{slide_idx}", selected
+
+    if computed:
+        cache_slides(computed, compute_fields, engine)
+
+
+def _iter_slide_dicts(
+    pptx_path: Path,
+    issues_only: bool,
+    jobs: int,
+    fields: Optional[Iterable[str]],
+    slides: Optional[SlideSelection],
+    engine: str,
+) -> Iterator[Tuple[str, Dict[str, ShapeDict]]]:
+    """Analyze the selected slides of a deck (see iter_inventory_dicts)."""
+    for slide_idx, shapes in _iter_slide_results(
+        pptx_path, issues_only, jobs, fields, slides, engine
+    ):
+        if shapes:
+            yield f"slide-{slide_idx}", shapes
+
+
+def _iter_slide_results(
+    pptx_path: Path,
+    issues_only: bool,
+    jobs: int,
+    fields: Optional[Iterable[str]],
+    slides: Union[SlideSelection, List[int], None],
+    engine: str,
+) -> Iterator[Tuple[int, Dict[str, ShapeDict]]]:
+    """Analyze slides in order, yielding (index, shapes) also for slides without text.
 
-    # Convert ShapeData objects to dictionaries
+    Args:
+        slides: Selection or sorted list of slide indices (default: all)
+    """
+    if slides == []:
+        return
+    fields = None if fields is None else frozenset(fields)
+    with open_slide_extractor(pptx_path, engine) as (slide_count, extract_slide):
+        if slides is None:
+            slide_indices = list(range(slide_count))
+        elif isinstance(slides, SlideSelection):
+            slide_indices = slides.indices(slide_count)
+        else:
+            slide_indices = slides
+
+        if jobs > 1:
+            chunks = _iter_inventory_parallel(
+                pptx_path, issues_only, jobs, fields, slide_indices, engine
+            )
+        else:
+            chunks = (
+                {
+                    slide_idx: _shapes_to_dicts(
+                        extract_slide(slide_idx, issues_only, fields), fields
+                    )
+                }
+                for slide_idx in slide_indices
+            )
+
+        for chunk_results in chunks:
+            yield from chunk_results.items()
+
+
+@contextlib.contextmanager
+def open_slide_extractor(
+    pptx_path: Path, engine: str = "pptx"
+) -> Iterator[Tuple[int, Callable[..., Dict[str, ShapeData]]]]:
+    """Open a deck for extracting its slides one at a time, closing it on exit.
+
+    Args:
+        pptx_path: Path to the PowerPoint file
+        engine: "pptx" (python-pptx) or "xml" (inventory_xml.XmlDeck)
+
+    Yields:
+        tuple: (number of slides, function taking a slide index, issues_only
+            and fields that returns the slide's shapes as
+            extract_slide_inventory does)
+    """
+    if engine == "xml":
+        # Only needed for the XML engine
+        from inventory_xml import XmlDeck
+
+        with phase("load"):
+            deck = XmlDeck(pptx_path)
+        with deck:
+            yield deck.slide_count, deck.extract_slide
+        return
+    if engine != "pptx":
+        raise ValueError(f"Unknown inventory engine '{engine}'")
+
+    with phase("load"):
+        prs = Presentation(str(pptx_path))
+    styles = StyleResolver()
+
+    def extract_slide(
+        slide_idx: int,
+        issues_only: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Dict[str, ShapeData]:
+        return extract_slide_inventory(
+            prs.slides[slide_idx], styles, issues_only, fields
+        )
+
+    yield len(prs.slides), extract_slide
+
+
+def _compute_fields(fields: Optional[Iterable[str]], issues_only: bool) -> frozenset:
+    """Return the fields to compute for the requested fields."""
+    fields = ALL_FIELDS if fields is None else frozenset(fields)
+    return fields | ISSUE_FIELDS if issues_only else fields
+
+
+def select_shape_fields(shape_dict: ShapeDict, fields: Iterable[str]) -> ShapeDict:
+    """Reduce a shape dict to the given fields, as to_dict(fields) would output it."""
+    keys = {key for field in fields for key in FIELD_KEYS.get(field, ())}
+    result: ShapeDict = {key: value for key, value in shape_dict.items() if key in keys}
+    paragraphs: List[ParagraphDict] = shape_dict.get("paragraphs") or []  # type: ignore
+    if "formatting" in fields:
+        result["paragraphs"] = paragraphs
+    elif "text" in fields:
+        result["paragraphs"] = [{"text": para["text"]} for para in paragraphs]
+    return result
+
+
+def slide_digests(pptx_path: Path) -> List[str]:
+    """Return a content digest per slide covering the slide, its layout and master.
+
+    A slide's inventory depends only on these parts and the slide size, so
+    slides with the same digest have the same inventory.
+    """
+    from inventory_xml import XmlDeck
+
+    with phase("cache"), XmlDeck(pptx_path) as deck:
+        return [deck.slide_digest(slide_idx) for slide_idx in range(deck.slide_count)]
+
+
+def _slide_cache_key(digest: str, fields: frozenset, engine: str = "pptx") -> str:
+    params: Dict[str, Any] = {"version": INVENTORY_VERSION, "fields": sorted(fields)}
+    if engine != "pptx":
+        params["engine"] = engine
+    if "overflow" in fields:
+        from text_layout import measure_backend
+
+        # Overflow estimates depend on which fonts are installed and how
+        # text is measured
+        params["fonts"] = get_font_index().dirs
+        if measure_backend() != "pil":
+            params["measure"] = measure_backend()
+    return content_key(digest, params)
+
+
+def load_cached_slide(
+    digest: str, fields: Iterable[str], engine: str = "pptx"
+) -> Optional[Dict[str, ShapeDict]]:
+    """Return the cached unfiltered shape dicts of a slide that cover fields.
+
+    A result computed with exactly these fields is looked up first, then one
+    computed with all fields (as inventory.py stores by default).
+
+    Args:
+        digest: The slide's digest (see slide_digests)
+        fields: Fields the result must include
+        engine: Engine the result was computed with
+    """
+    fields = frozenset(fields)
+    with phase("cache"):
+        for cached_fields in dict.fromkeys([fields, ALL_FIELDS]):
+            shapes = load_entry(_slide_cache_key(digest, cached_fields, engine))
+            if shapes is not None:
+                return shapes
+    return None
+
+
+def cache_slides(
+    slides: Dict[str, Dict[str, ShapeDict]],
+    fields: Iterable[str],
+    engine: str = "pptx",
+) -> None:
+    """Store unfiltered shape dicts computed with fields, by slide digest."""
+    fields = frozenset(fields)
+    with phase("cache"):
+        store_entries(
+            {
+                _slide_cache_key(digest, fields, engine): shapes
+                for digest, shapes in slides.items()
+            }
+        )
+
+
+def inventory_to_dict(
+    inventory: InventoryData, fields: Optional[Iterable[str]] = None
+) -> InventoryDict:
+    """Convert ShapeData objects to dictionaries for JSON serialization.
+
+    Args:
+        inventory: Inventory of ShapeData objects
+        fields: Fields to include (default: all computed fields)
+    """
     dict_inventory: InventoryDict = {}
     for slide_key, shapes in inventory.items():
-        dict_inventory[slide_key] = {
-            shape_key: shape_data.to_dict() for shape_key, shape_data in shapes.items()
+        dict_inventory[slide_key] = _shapes_to_dicts(shapes, fields)
+    return dict_inventory
+
+
+def _shapes_to_dicts(
+    slide_inventory: Dict[str, ShapeData], fields: Optional[frozenset]
+) -> Dict[str, ShapeDict]:
+    """Convert the shapes of one slide to JSON-ready dictionaries."""
+    with phase("serialization"):
+        return {
+            shape_key: shape_data.to_dict(fields)
+            for shape_key, shape_data in slide_inventory.items()
         }
 
-    return dict_inventory
+
+# Slides per task handed to a worker process; small enough to balance slides
+# of very different complexity across workers
+PARALLEL_CHUNK_SIZE = 4
+
+# Per-process slide extractor of inventory worker processes
+_worker_extract_slide: Optional[Callable[..., Dict[str, ShapeData]]] = None
+
+# Keeps the deck of an inventory worker process open while the process lives
+_worker_deck = contextlib.ExitStack()
+
+
+def _iter_inventory_parallel(
+    pptx_path: Path,
+    issues_only: bool,
+    jobs: int,
+    fields: Optional[frozenset],
+    slide_indices: List[int],
+    engine: str,
+) -> Iterator[Dict[int, Dict[str, ShapeDict]]]:
+    """Extract slides in worker processes, yielding chunks in slide order."""
+    chunks = [
+        slide_indices[start : start + PARALLEL_CHUNK_SIZE]
+        for start in range(0, len(slide_indices), PARALLEL_CHUNK_SIZE)
+    ]
+    if not chunks:
+        return
+    jobs = max(1, min(jobs, len(chunks)))
+
+    with multiprocessing.Pool(
+        jobs, initializer=_init_inventory_worker, initargs=(str(pptx_path), engine)
+    ) as pool:
+        # imap keeps the order of the chunks while workers run ahead
+        yield from pool.imap(
+            functools.partial(
+                _extract_slides_worker, issues_only=issues_only, fields=fields
+            ),
+            chunks,
+        )
+
+
+def _init_inventory_worker(pptx_path: str, engine: str) -> None:
+    """Open the presentation once per worker process."""
+    global _worker_extract_slide
+    _, _worker_extract_slide = _worker_deck.enter_context(
+        open_slide_extractor(Path(pptx_path), engine)
+    )
+
+
+def _extract_slides_worker(
+    slide_indices: List[int], issues_only: bool, fields: Optional[frozenset]
+) -> Dict[int, Dict[str, ShapeDict]]:
+    """Extract the given slides in a worker process as JSON-ready dictionaries."""
+    assert _worker_extract_slide is not None
+    return {
+        slide_idx: _shapes_to_dicts(
+            _worker_extract_slide(slide_idx, issues_only, fields), fields
+        )
+        for slide_idx in slide_indices
+    }
+
+
+def save_inventory_dict(json_inventory: InventoryDict, output_path: Path) -> None:
+    """Save an inventory that is already JSON-serializable to a JSON file."""
+    with phase("serialization"), open(output_path, "w", encoding="utf-8") as f:
+        json.dump(json_inventory, f, indent=2, ensure_ascii=False)
+
+
+def save_inventory_jsonl(
+    slides: Iterable[Tuple[str, Dict[str, ShapeDict]]], output_path: Path
+) -> Tuple[int, int]:
+    """Write slides to a JSON Lines file as they arrive, one record per slide.
+
+    Each line is {"slide": "slide-N", "shapes": {shape-N: shape dict}}.
+
+    Returns:
+        tuple: (number of slides, number of shapes) written
+    """
+    total_slides = total_shapes = 0
+    with open(output_path, "w", encoding="utf-8") as f:
+        for slide_key, shapes in slides:
+            record = {"slide": slide_key, "shapes": shapes}
+            with phase("serialization"):
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            total_slides += 1
+            total_shapes += len(shapes)
+    return total_slides, total_shapes
 
 
 def save_inventory(inventory: InventoryData, output_path: Path) -> None:
@@ -1005,15 +1810,7 @@ def save_inventory(inventory: InventoryData, output_path: Path) -> None:
 
     Converts ShapeData objects to dictionaries for JSON serialization.
     """
-    # Convert ShapeData objects to dictionaries
-    json_inventory: InventoryDict = {}
-    for slide_key, shapes in inventory.items():
-        json_inventory[slide_key] = {
-            shape_key: shape_data.to_dict() for shape_key, shape_data in shapes.items()
-        }
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(json_inventory, f, indent=2, ensure_ascii=False)
+    save_inventory_dict(inventory_to_dict(inventory), output_path)
 
 
 if __name__ == "__main__":
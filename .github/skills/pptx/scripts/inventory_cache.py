@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk cache for inventory results.
+
+The documented workflow analyzes the same deck several times: inventory.py,
+then replace.py and thumbnail.py, which run the same extraction on their
+input, and again after every edit. Entries are keyed by a SHA-256 digest of
+the content a result was computed from (a slide with its layout and master)
+together with whatever else the result depends on (inventory version,
+selected fields, installed fonts), so renamed or copied content still hits
+and edited content never does. Values are stored as zlib-compressed compact JSON. The cache is
+bounded in size; the least recently used entries are evicted first.
+
+Usage:
+    from inventory_cache import content_key, load_entry, store_entries
+
+    key = content_key(digest, {"version": 1, "fields": ["text"]})
+    value = load_entry(key)
+    if value is None:
+        value = compute()
+        store_entries({key: value})
+
+    python inventory_cache.py            # Show cache location and size
+    python inventory_cache.py --clear    # Remove all entries
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Where entries are cached between runs
+CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME", "~/.cache")).expanduser()
+    / "pptx-skill"
+    / "inventory"
+)
+
+# Total size of cached entries (bytes) above which the oldest are evicted
+CACHE_SIZE_LIMIT = 64 * 1024 * 1024
+
+# File name suffix of cache entries
+ENTRY_SUFFIX = ".inv"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the inventory cache")
+    parser.add_argument("--clear", action="store_true", help="Remove all entries")
+    args = parser.parse_args()
+
+    if args.clear:
+        removed = clear_cache()
+        print(f"Removed {removed} entries from {CACHE_DIR}")
+        return
+
+    entries = list(CACHE_DIR.glob(f"*{ENTRY_SUFFIX}"))
+    size = sum(entry.stat().st_size for entry in entries)
+    print(f"{CACHE_DIR}: {len(entries)} entries, {size / 1024:.0f} KiB")
+
+
+def content_key(digest: str, params: Any) -> str:
+    """Return the cache key for a content digest and JSON-serializable parameters."""
+    material = json.dumps([digest, params], sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def load_entry(key: str, cache_dir: Path = CACHE_DIR) -> Optional[Any]:
+    """Return a cached value, or None if there is no (readable) entry."""
+    entry = cache_dir / f"{key}{ENTRY_SUFFIX}"
+    try:
+        with open(entry, "rb") as f:
+            value = json.loads(zlib.decompress(f.read()))
+        # Mark as recently used for eviction
+        os.utime(entry)
+    except (OSError, ValueError, zlib.error):
+        return None
+    return value
+
+
+def store_entries(
+    entries: Dict[str, Any],
+    cache_dir: Path = CACHE_DIR,
+    size_limit: int = CACHE_SIZE_LIMIT,
+) -> None:
+    """Store JSON-serializable values by key, evicting old entries once afterwards.
+
+    Silently skipped if the cache is not writable.
+    """
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for key, value in entries.items():
+            data = zlib.compress(
+                json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode(
+                    "utf-8"
+                )
+            )
+            if len(data) > size_limit:
+                continue
+            fd, temp_name = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_name, cache_dir / f"{key}{ENTRY_SUFFIX}")
+        evict(cache_dir, size_limit)
+    except OSError:
+        pass
+
+
+def evict(cache_dir: Path = CACHE_DIR, size_limit: int = CACHE_SIZE_LIMIT) -> None:
+    """Remove least recently used entries until the cache fits in size_limit."""
+    entries = []
+    for entry in cache_dir.glob(f"*{ENTRY_SUFFIX}"):
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, entry))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries):
+        if total <= size_limit:
+            break
+        entry.unlink(missing_ok=True)
+        total -= size
+
+
+def clear_cache(cache_dir: Path = CACHE_DIR) -> int:
+    """Remove all entries and return how many were removed."""
+    removed = 0
+    for entry in cache_dir.glob(f"*{ENTRY_SUFFIX}"):
+        entry.unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+
+if __name__ == "__main__":
+    main()
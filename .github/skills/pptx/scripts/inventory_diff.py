@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Compare the text of two PowerPoint decks.
+
+Lists which text changed between a template and its output, or between two
+revisions of a deck, without producing and diffing two full inventories.
+Slides are compared by their content digest (the slide with its layout,
+master and the slide size, see XmlDeck.slide_digest) and aligned like lines
+in a text diff, so inserted, removed and moved slides are recognized. Only
+slides whose digests differ are read, with the XML engine, and their text
+shapes are compared by a fingerprint of their text and formatting (the
+inventory's "text" and "formatting" fields). The work is proportional to
+the number of changed slides rather than the size of the decks.
+
+Shapes are paired by their shape ID in the slide XML, which PowerPoint and
+replace.py keep, then by identical fingerprints (e.g. a copied or recreated
+shape with unchanged text). Unpaired shapes are reported as added or
+removed. Shape keys (shape-N) are those of the inventory of each deck.
+
+Usage:
+    python inventory.py diff template.pptx output.pptx
+    python inventory.py diff old.pptx new.pptx --format json
+
+    from inventory_diff import diff_decks
+
+    changes = diff_decks("old.pptx", "new.pptx")  # [{"slide": ..., ...}]
+
+Like diff, the exit status is 0 if the decks have the same text, 1 if not.
+Slides that only moved have the same text: they are listed but do not count
+as changes.
+"""
+
+import argparse
+import difflib
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from inventory import ShapeDict
+from inventory_xml import P, XmlDeck
+
+# Shape fields whose values are compared
+DIFF_FIELDS = frozenset({"text", "formatting"})
+
+# Slide and shape changes as JSON-ready dictionaries (see diff_decks)
+SlideChange = Dict[str, Any]
+ShapeChange = Dict[str, Any]
+
+
+class DiffShape:
+    """A text shape of a changed slide, with its fingerprint."""
+
+    __slots__ = ("key", "xml_id", "name", "data", "fingerprint")
+
+    def __init__(self, key: str, shape_data: Any):
+        self.key = key
+        c_nv_pr = shape_data.shape.find(f"{P}nvSpPr/{P}cNvPr")
+        self.xml_id = None if c_nv_pr is None else c_nv_pr.get("id")
+        self.name = "" if c_nv_pr is None else c_nv_pr.get("name", "")
+        self.data: ShapeDict = shape_data.to_dict(DIFF_FIELDS)
+        self.fingerprint = hashlib.sha256(
+            json.dumps(self.data, sort_keys=True).encode("utf-8")
+        ).digest()
+
+    @property
+    def texts(self) -> List[str]:
+        return [para["text"] for para in self.data.get("paragraphs", [])]
+
+
+def main(argv: Optional[List[str]] = None):
+    """Entry point of `inventory.py diff` (and of this script)."""
+    parser = argparse.ArgumentParser(
+        prog="inventory.py diff",
+        description="List the text and formatting changes between two decks.",
+    )
+    parser.add_argument("before", help="Original PowerPoint file (.pptx)")
+    parser.add_argument("after", help="Changed PowerPoint file (.pptx)")
+    parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format: text (compact change list, default) or json",
+    )
+    args = parser.parse_args(argv)
+
+    for path in (args.before, args.after):
+        if not Path(path).exists():
+            print(f"Error: Input file not found: {path}")
+            sys.exit(2)
+
+    try:
+        changes = diff_decks(Path(args.before), Path(args.after))
+    except Exception as e:
+        print(f"Error comparing presentations: {e}")
+        sys.exit(2)
+
+    if args.format == "json":
+        print(json.dumps(changes, indent=2, ensure_ascii=False))
+    else:
+        print(format_changes(changes))
+    sys.exit(1 if any(slide["change"] != "moved" for slide in changes) else 0)
+
+
+def diff_decks(before_path: Path, after_path: Path) -> List[SlideChange]:
+    """Compare the text shapes of two decks.
+
+    Args:
+        before_path: Path to the original deck
+        after_path: Path to the changed deck
+
+    Returns:
+        One dictionary per slide with text changes, in the order of the
+        changed deck (removed slides where they were):
+        {"slide": "slide-N" (or None if removed), "before": "slide-M" (or
+        None if added), "change": "added" | "removed" | "modified" |
+        "moved" (same content at another position), "shapes": [shape
+        changes]}. Each shape change has "shape" and
+        "before" keys (None if added / removed), "name", "change" ("added",
+        "removed" or "modified"), "text" ({"removed": [...], "added": [...]}
+        paragraph texts, if the text changed) and "formatting" ({"property":
+        [before, after]} with properties like "paragraphs[0].font_size", if
+        the formatting of unchanged paragraphs changed).
+    """
+    with XmlDeck(before_path) as before_deck, XmlDeck(after_path) as after_deck:
+        before_digests = [
+            before_deck.slide_digest(idx) for idx in range(before_deck.slide_count)
+        ]
+        after_digests = [
+            after_deck.slide_digest(idx) for idx in range(after_deck.slide_count)
+        ]
+
+        matcher = difflib.SequenceMatcher(None, before_digests, after_digests, False)
+        blocks = [
+            (list(range(i1, i2)), list(range(j1, j2)))
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+            if tag != "equal"
+        ]
+        # Unchanged slides that moved elsewhere are not compared
+        unmatched: Dict[str, List[int]] = {}
+        for before_indices, _ in blocks:
+            for idx in before_indices:
+                unmatched.setdefault(before_digests[idx], []).append(idx)
+        moved = {}
+        for _, after_indices in blocks:
+            for idx in after_indices:
+                candidates = unmatched.get(after_digests[idx])
+                if candidates:
+                    moved[idx] = candidates.pop(0)
+        moved_before = set(moved.values())
+
+        changes: List[SlideChange] = []
+        for before_indices, after_indices in blocks:
+            for after_idx in after_indices:
+                if after_idx in moved:
+                    changes.append(
+                        {
+                            "slide": _slide_key(after_idx),
+                            "before": _slide_key(moved[after_idx]),
+                            "change": "moved",
+                            "shapes": [],
+                        }
+                    )
+            # Changed slides are paired in order; the rest were added or removed
+            before_indices = [idx for idx in before_indices if idx not in moved_before]
+            after_indices = [idx for idx in after_indices if idx not in moved]
+            pairs: List[Tuple[Optional[int], Optional[int]]] = list(
+                zip(before_indices, after_indices)
+            )
+            pairs += [(idx, None) for idx in before_indices[len(pairs) :]]
+            pairs += [(None, idx) for idx in after_indices[len(pairs) :]]
+            for before_idx, after_idx in pairs:
+                shapes = diff_shapes(
+                    _slide_shapes(before_deck, before_idx),
+                    _slide_shapes(after_deck, after_idx),
+                )
+                if not shapes:
+                    continue
+                if before_idx is None:
+                    change = "added"
+                elif after_idx is None:
+                    change = "removed"
+                else:
+                    change = "modified"
+                changes.append(
+                    {
+                        "slide": _slide_key(after_idx),
+                        "before": _slide_key(before_idx),
+                        "change": change,
+                        "shapes": shapes,
+                    }
+                )
+        return changes
+
+
+def diff_shapes(before: List[DiffShape], after: List[DiffShape]) -> List[ShapeChange]:
+    """Compare the text shapes of two versions of a slide."""
+    # Pair by shape ID first, then unpaired shapes by identical content
+    by_id: Dict[Optional[str], List[DiffShape]] = {}
+    for shape in before:
+        by_id.setdefault(shape.xml_id, []).append(shape)
+    pairs: List[Tuple[Optional[DiffShape], Optional[DiffShape]]] = []
+    unpaired = []
+    for shape in after:
+        candidates = by_id.get(shape.xml_id) if shape.xml_id is not None else None
+        if candidates:
+            pairs.append((candidates.pop(0), shape))
+        else:
+            unpaired.append(shape)
+
+    by_fingerprint: Dict[bytes, List[DiffShape]] = {}
+    for candidates in by_id.values():
+        for shape in candidates:
+            by_fingerprint.setdefault(shape.fingerprint, []).append(shape)
+    for shape in unpaired:
+        candidates = by_fingerprint.get(shape.fingerprint)
+        pairs.append((candidates.pop(0) if candidates else None, shape))
+    pairs += [
+        (shape, None) for candidates in by_fingerprint.values() for shape in candidates
+    ]
+
+    changes = []
+    for old, new in pairs:
+        if old is not None and new is not None and old.fingerprint == new.fingerprint:
+            continue
+        changes.append(_shape_change(old, new))
+    # In the order of the changed slide, removed shapes last
+    after_order = {shape.key: idx for idx, shape in enumerate(after)}
+    before_order = {shape.key: idx for idx, shape in enumerate(before)}
+    changes.sort(
+        key=lambda change: (
+            after_order.get(change["shape"], len(after_order)),
+            before_order.get(change["before"], 0),
+        )
+    )
+    return changes
+
+
+def _shape_change(old: Optional[DiffShape], new: Optional[DiffShape]) -> ShapeChange:
+    """Describe how a shape changed (old or new is None if added or removed)."""
+    change: ShapeChange = {
+        "shape": new.key if new else None,
+        "before": old.key if old else None,
+        "name": (new or old).name,  # type: ignore
+        "change": "modified",
+    }
+    if old is None or new is None:
+        change["change"] = "added" if old is None else "removed"
+    old_texts = old.texts if old else []
+    new_texts = new.texts if new else []
+
+    if old_texts != new_texts:
+        matcher = difflib.SequenceMatcher(None, old_texts, new_texts, False)
+        removed, added = [], []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag != "equal":
+                removed += old_texts[i1:i2]
+                added += new_texts[j1:j2]
+        change["text"] = {"removed": removed, "added": added}
+
+    if old is not None and new is not None:
+        formatting = _formatting_changes(old.data, new.data)
+        if formatting:
+            change["formatting"] = formatting
+    return change
+
+
+def _formatting_changes(old: ShapeDict, new: ShapeDict) -> Dict[str, List[Any]]:
+    """Formatting properties that differ, of the shape and unchanged paragraphs."""
+    changes: Dict[str, List[Any]] = {}
+    if old.get("default_font_size") != new.get("default_font_size"):
+        changes["default_font_size"] = [
+            old.get("default_font_size"),
+            new.get("default_font_size"),
+        ]
+    old_paragraphs: List[Dict[str, Any]] = old.get("paragraphs", [])  # type: ignore
+    new_paragraphs: List[Dict[str, Any]] = new.get("paragraphs", [])  # type: ignore
+    if len(old_paragraphs) != len(new_paragraphs):
+        return changes
+    for idx, (old_para, new_para) in enumerate(zip(old_paragraphs, new_paragraphs)):
+        if old_para["text"] != new_para["text"]:
+            continue
+        for prop in dict.fromkeys([*old_para, *new_para]):
+            if old_para.get(prop) != new_para.get(prop):
+                changes[f"paragraphs[{idx}].{prop}"] = [
+                    old_para.get(prop),
+                    new_para.get(prop),
+                ]
+    return changes
+
+
+def format_changes(changes: List[SlideChange]) -> str:
+    """Format changes as a compact list, "-" and "+" marking removed and added text."""
+    if not changes:
+        return "No text changes"
+    lines = []
+    for slide in changes:
+        title = slide["slide"] or slide["before"]
+        if slide["change"] == "moved":
+            title += f" (moved from {slide['before']})"
+        elif slide["change"] != "modified":
+            title += f" ({slide['change']})"
+        elif slide["before"] != slide["slide"]:
+            title += f" (was {slide['before']})"
+        lines.append(title)
+        for shape in slide["shapes"]:
+            label = shape["shape"] or shape["before"]
+            if shape["name"]:
+                label += f" [{shape['name']}]"
+            if shape["change"] != "modified":
+                label += f" ({shape['change']})"
+            elif shape["before"] != shape["shape"]:
+                label += f" (was {shape['before']})"
+            lines.append(f"  {label}")
+            text = shape.get("text", {})
+            lines += [f"    - {line}" for line in text.get("removed", [])]
+            lines += [f"    + {line}" for line in text.get("added", [])]
+            for prop, (old, new) in shape.get("formatting", {}).items():
+                lines.append(f"    {prop}: {old} -> {new}")
+    moved = sum(slide["change"] == "moved" for slide in changes)
+    shapes = sum(len(slide["shapes"]) for slide in changes)
+    summary = f"{len(changes) - moved} slides changed, {shapes} shapes changed"
+    if moved:
+        summary += f", {moved} slides moved"
+    lines.append(summary)
+    return "\n".join(lines)
+
+
+def _slide_shapes(deck: XmlDeck, slide_idx: Optional[int]) -> List[DiffShape]:
+    if slide_idx is None:
+        return []
+    shapes = deck.extract_slide(slide_idx, fields=DIFF_FIELDS)
+    return [DiffShape(key, shape_data) for key, shape_data in shapes.items()]
+
+
+def _slide_key(slide_idx: Optional[int]) -> Optional[str]:
+    return None if slide_idx is None else f"slide-{slide_idx}"
+
+
+if __name__ == "__main__":
+    main()
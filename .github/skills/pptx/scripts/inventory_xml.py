@@ -0,0 +1,772 @@
+#!/usr/bin/env python3
+"""
+Read text inventories straight from the slide XML.
+
+python-pptx loads every part of the package and builds a proxy object for
+each shape, paragraph, run and font it is asked about; placeholder positions
+are resolved by walking the layout's and master's placeholders again for
+every shape. On large decks that bookkeeping costs more than the analysis
+itself. XmlDeck opens the .pptx as a zip file, parses only the presentation,
+slide, layout and master parts with lxml, and reads the same values from the
+elements directly: group offsets, placeholder positions inherited from the
+layout and master, paragraph and run properties. Layouts and masters are
+parsed and indexed once per deck.
+
+The result is the same inventory as with python-pptx (inventory.py
+--engine pptx); benchmark_inventory.py checks that both engines agree. The
+values are converted with python-pptx's own enums and XML types, so they
+match down to the float rounding. Unlike python-pptx, reading never adds
+elements to the XML, and the deck is not modified.
+
+Usage:
+    from inventory_xml import XmlDeck
+
+    with XmlDeck("deck.pptx") as deck:
+        for slide_idx in range(deck.slide_count):
+            shapes = deck.extract_slide(slide_idx)  # {shape-N: XmlShapeData}
+
+    python inventory.py deck.pptx inventory.json --engine xml
+"""
+
+import hashlib
+import posixpath
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import lxml.etree
+from inventory import (
+    ALL_FIELDS,
+    ParagraphData,
+    ShapeData,
+    _compute_fields,
+    detect_overlaps,
+    sort_shapes_by_position,
+)
+from pptx.enum.dml import MSO_THEME_COLOR
+from pptx.enum.shapes import PP_PLACEHOLDER
+from pptx.enum.text import MSO_TEXT_UNDERLINE_TYPE, PP_ALIGN
+from pptx.oxml.simpletypes import (
+    ST_Coordinate,
+    ST_Coordinate32,
+    ST_PositiveCoordinate,
+    ST_TextSpacingPercentOrPercentString,
+    XsdBoolean,
+)
+from pptx.util import Centipoints, Emu
+from profiling import phase
+
+# Same options as python-pptx, so whitespace-only text reads the same
+XML_PARSER = lxml.etree.XMLParser(
+    remove_blank_text=True, resolve_entities=False, no_network=True
+)
+
+A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_RELS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# Relationship types (the part after the last "/")
+RT_OFFICE_DOCUMENT = "officeDocument"
+RT_SLIDE_LAYOUT = "slideLayout"
+RT_SLIDE_MASTER = "slideMaster"
+
+# Children of a shape tree that are shapes (see python-pptx CT_GroupShape)
+SHAPE_TAGS = frozenset(
+    P + tag for tag in ("sp", "grpSp", "graphicFrame", "cxnSp", "pic", "contentPart")
+)
+
+# Element holding a shape's a:xfrm, by shape tag
+XFRM_PATHS = {
+    P + "sp": f"{P}spPr/{A}xfrm",
+    P + "cxnSp": f"{P}spPr/{A}xfrm",
+    P + "pic": f"{P}spPr/{A}xfrm",
+    P + "grpSp": f"{P}grpSpPr/{A}xfrm",
+    P + "graphicFrame": f"{P}xfrm",
+}
+
+# Non-visual properties holding p:ph, by shape tag
+NV_PR_PATHS = {
+    P + "sp": f"{P}nvSpPr/{P}nvPr",
+    P + "cxnSp": f"{P}nvCxnSpPr/{P}nvPr",
+    P + "pic": f"{P}nvPicPr/{P}nvPr",
+    P + "grpSp": f"{P}nvGrpSpPr/{P}nvPr",
+    P + "graphicFrame": f"{P}nvGraphicFramePr/{P}nvPr",
+}
+
+# Master placeholder type a layout placeholder inherits its position from
+# (python-pptx LayoutPlaceholder._base_placeholder)
+BASE_PLACEHOLDER_TYPES = {
+    PP_PLACEHOLDER.BODY: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.CHART: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.BITMAP: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.CENTER_TITLE: PP_PLACEHOLDER.TITLE,
+    PP_PLACEHOLDER.ORG_CHART: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.DATE: PP_PLACEHOLDER.DATE,
+    PP_PLACEHOLDER.FOOTER: PP_PLACEHOLDER.FOOTER,
+    PP_PLACEHOLDER.MEDIA_CLIP: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.OBJECT: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.PICTURE: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.SLIDE_NUMBER: PP_PLACEHOLDER.SLIDE_NUMBER,
+    PP_PLACEHOLDER.SUBTITLE: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.TABLE: PP_PLACEHOLDER.BODY,
+    PP_PLACEHOLDER.TITLE: PP_PLACEHOLDER.TITLE,
+}
+
+# Paragraph alignments reported in the inventory (LEFT is the default)
+ALIGNMENTS = {
+    PP_ALIGN.CENTER: "CENTER",
+    PP_ALIGN.RIGHT: "RIGHT",
+    PP_ALIGN.JUSTIFY: "JUSTIFY",
+}
+
+# Fill elements of run properties; only the first one present counts
+FILL_TAGS = frozenset(
+    A + tag
+    for tag in ("noFill", "solidFill", "gradFill", "blipFill", "pattFill", "grpFill")
+)
+
+# Default text frame insets in EMUs (a:bodyPr lIns/rIns, tIns/bIns)
+DEFAULT_INSET_X = 91440
+DEFAULT_INSET_Y = 45720
+
+
+class XmlDeck:
+    """A .pptx opened for inventory extraction without python-pptx."""
+
+    def __init__(self, pptx_path):
+        """Open the package and read the slide list.
+
+        Args:
+            pptx_path: Path to the PowerPoint file
+        """
+        self.path = Path(pptx_path)
+        self._zip = zipfile.ZipFile(self.path)
+        self._parts: Dict[str, Any] = {}
+        self._rels: Dict[str, Dict[str, Tuple[str, str]]] = {}
+        # Layout and master part name -> PartStyles
+        self._styles: Dict[str, "PartStyles"] = {}
+        # Part name -> SHA-256 of its content
+        self._digests: Dict[str, bytes] = {}
+
+        presentation = self._related_part("", RT_OFFICE_DOCUMENT)
+        prs = self._part(presentation)
+        sld_sz = prs.find(f"{P}sldSz")
+        self.slide_width: Optional[int] = (
+            None if sld_sz is None else int(sld_sz.get("cx"))
+        )
+        self.slide_height: Optional[int] = (
+            None if sld_sz is None else int(sld_sz.get("cy"))
+        )
+
+        rels = self._part_rels(presentation)
+        self._slides: List[str] = [
+            rels[sld_id.get(f"{R}id")][1]
+            for sld_id in prs.iterfind(f"{P}sldIdLst/{P}sldId")
+        ]
+
+    def close(self) -> None:
+        """Close the underlying archive."""
+        self._zip.close()
+
+    def __enter__(self) -> "XmlDeck":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def slide_count(self) -> int:
+        return len(self._slides)
+
+    def extract_slide(
+        self,
+        slide_idx: int,
+        issues_only: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Dict[str, "XmlShapeData"]:
+        """Extract the text shapes of one slide as {shape-N: XmlShapeData}.
+
+        Same as inventory.extract_slide_inventory for the python-pptx slide.
+
+        Args:
+            slide_idx: Index of the slide in presentation order
+            issues_only: If True, only include shapes that have overflow or overlap issues
+            fields: Fields to compute (see inventory.FIELDS, default: all)
+
+        Returns:
+            Shapes sorted by visual position (empty if the slide has no text shapes)
+        """
+        with phase("shape collection"):
+            slide = self.slide(slide_idx)
+            shapes_with_positions = []
+            spTree = slide.element.find(f"{P}cSld/{P}spTree")
+            for shape_elm in _iter_shape_elms(spTree):
+                shapes_with_positions.extend(
+                    collect_shape_elms(shape_elm, slide, placeholders=True)
+                )
+
+            if not shapes_with_positions:
+                return {}
+
+            # Issues must be known to filter on them, even if they are not output
+            fields = _compute_fields(fields, issues_only)
+
+            sorted_shapes = sort_shapes_by_position(
+                [
+                    XmlShapeData(sp, left, top, width, height, slide, fields)
+                    for sp, left, top, width, height in shapes_with_positions
+                ]
+            )
+        for idx, shape_data in enumerate(sorted_shapes):
+            shape_data.shape_id = f"shape-{idx}"
+
+        if "overlap" in fields and len(sorted_shapes) > 1:
+            with phase("overlap detection"):
+                detect_overlaps(sorted_shapes)
+
+        if issues_only:
+            sorted_shapes = [sd for sd in sorted_shapes if sd.has_any_issues]
+
+        return {shape_data.shape_id: shape_data for shape_data in sorted_shapes}
+
+    def slide_digest(self, slide_idx: int) -> str:
+        """SHA-256 hex digest of what a slide's inventory is computed from.
+
+        Covers the slide part, its layout and master parts, and the slide
+        size; other parts of the package do not affect the slide's shapes.
+        """
+        slide = self._slides[slide_idx]
+        layout = self._related_part(slide, RT_SLIDE_LAYOUT)
+        master = self._related_part(layout, RT_SLIDE_MASTER)
+        digest = hashlib.sha256(f"{self.slide_width}x{self.slide_height}".encode())
+        for part_name in (slide, layout, master):
+            part_digest = self._digests.get(part_name)
+            if part_digest is None:
+                part_digest = self._digests[part_name] = hashlib.sha256(
+                    self._zip.read(part_name)
+                ).digest()
+            digest.update(part_digest)
+        return digest.hexdigest()
+
+    def slide(self, slide_idx: int, element: Optional[Any] = None) -> "XmlSlide":
+        """Return the slide at slide_idx with its layout and master styles.
+
+        Args:
+            slide_idx: Index of the slide in presentation order
+            element: p:sld element to read instead of the one in the package,
+                e.g. the slide of a python-pptx Presentation edited in memory
+        """
+        part_name = self._slides[slide_idx]
+        layout = self._related_part(part_name, RT_SLIDE_LAYOUT)
+        if element is None:
+            element = self._part(part_name)
+        return XmlSlide(element, self, self.layout_styles(layout))
+
+    def layout_styles(self, layout: str) -> "PartStyles":
+        """Return the placeholders and text styles of a layout and its master."""
+        styles = self._styles.get(layout)
+        if styles is None:
+            master = self._related_part(layout, RT_SLIDE_MASTER)
+            if master not in self._styles:
+                self._styles[master] = PartStyles(self._part(master))
+            styles = self._styles[layout] = PartStyles(
+                self._part(layout), self._styles[master]
+            )
+        return styles
+
+    def _part(self, part_name: str) -> Any:
+        element = self._parts.get(part_name)
+        if element is None:
+            element = self._parts[part_name] = lxml.etree.fromstring(
+                self._zip.read(part_name), XML_PARSER
+            )
+        return element
+
+    def _part_rels(self, part_name: str) -> Dict[str, Tuple[str, str]]:
+        """Return {rId: (relationship type, target part name)} of a part."""
+        rels = self._rels.get(part_name)
+        if rels is None:
+            base_dir, name = posixpath.split(part_name)
+            rels_name = posixpath.join(base_dir, "_rels", f"{name}.rels")
+            rels = self._rels[part_name] = {}
+            if rels_name in self._zip.NameToInfo:
+                root = lxml.etree.fromstring(self._zip.read(rels_name), XML_PARSER)
+                for rel in root.iterfind(f"{PKG_RELS}Relationship"):
+                    if rel.get("TargetMode") == "External":
+                        continue
+                    target = rel.get("Target")
+                    if target.startswith("/"):
+                        target = target[1:]
+                    else:
+                        target = posixpath.normpath(posixpath.join(base_dir, target))
+                    rels[rel.get("Id")] = (rel.get("Type"), target)
+        return rels
+
+    def _related_part(self, part_name: str, rel_type: str) -> str:
+        """Return the first part related to part_name with the given type."""
+        for type_uri, target in self._part_rels(part_name).values():
+            if type_uri.rsplit("/", 1)[-1] == rel_type:
+                return target
+        raise KeyError(f"No {rel_type} relationship from '{part_name or '/'}'")
+
+
+class XmlSlide:
+    """A slide element with the deck and the styles of its layout."""
+
+    def __init__(self, element: Any, deck: XmlDeck, layout: "PartStyles"):
+        self.element = element
+        self.deck = deck
+        self.layout = layout
+
+
+class PartStyles:
+    """Placeholders and text style sizes of a slide layout or master.
+
+    Built once per part; the lookups follow python-pptx (placeholders) and
+    inventory.StyleResolver (font sizes).
+    """
+
+    def __init__(self, element: Any, base: Optional["PartStyles"] = None):
+        """Index the part's placeholders.
+
+        Args:
+            element: Root element of the layout or master part
+            base: Styles of the master, for a layout
+        """
+        self.element = element
+        self.master = base
+        self.placeholders: List[Any] = [
+            shape_elm
+            for shape_elm in _iter_shape_elms(element.find(f"{P}cSld/{P}spTree"))
+            if _ph(shape_elm) is not None
+        ]
+        self._font_sizes: Optional[Dict[Any, Optional[float]]] = None
+        self._style_sizes: Optional[Dict[str, Optional[int]]] = None
+
+    def layout_placeholder(self, idx: int) -> Optional[Any]:
+        """First placeholder with the given idx (LayoutPlaceholders.get)."""
+        for shape_elm in self.placeholders:
+            if _ph_idx(shape_elm) == idx:
+                return shape_elm
+        return None
+
+    def master_placeholder(self, ph_type: Any) -> Optional[Any]:
+        """First placeholder of the given type (MasterPlaceholders.get)."""
+        for shape_elm in self.placeholders:
+            if _ph_type(shape_elm) == ph_type:
+                return shape_elm
+        return None
+
+    def layout_font_size(self, placeholder_type: Any) -> Optional[float]:
+        """Default font size of the layout placeholder of the given type."""
+        if self._font_sizes is None:
+            self._font_sizes = {}
+            try:
+                for shape_elm in self.placeholders:
+                    shape_type = _ph_type(shape_elm)
+                    if shape_type in self._font_sizes:
+                        # Only the first placeholder of each type is used
+                        continue
+                    self._font_sizes[shape_type] = None
+                    # Find first defRPr element with sz (size) attribute
+                    for elem in shape_elm.iter():
+                        if "defRPr" in elem.tag and (sz := elem.get("sz")):
+                            self._font_sizes[shape_type] = float(sz) / 100.0
+                            break
+            except Exception:
+                # Placeholders after an unreadable one have no default size
+                pass
+        return self._font_sizes.get(placeholder_type)
+
+    def master_font_size(self, style_name: str) -> Optional[int]:
+        """Font size of a master text style ("titleStyle" or "bodyStyle")."""
+        if self._style_sizes is None:
+            style_sizes: Dict[str, Optional[int]] = {}
+            for child in self.element.iter():
+                tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
+                if tag not in ("titleStyle", "bodyStyle") or tag in style_sizes:
+                    continue
+                for elem in child.iter():
+                    if "sz" in elem.attrib:
+                        style_sizes[tag] = int(elem.attrib["sz"]) // 100
+                        break
+            self._style_sizes = style_sizes
+        return self._style_sizes.get(style_name)
+
+
+class XmlTextFrame:
+    """The parts of a text frame the overflow estimate reads (a:txBody)."""
+
+    def __init__(self, txBody: Any):
+        body_pr = txBody.find(f"{A}bodyPr")
+        self.margin_left = _inset(body_pr, "lIns", DEFAULT_INSET_X)
+        self.margin_right = _inset(body_pr, "rIns", DEFAULT_INSET_X)
+        self.margin_top = _inset(body_pr, "tIns", DEFAULT_INSET_Y)
+        self.margin_bottom = _inset(body_pr, "bIns", DEFAULT_INSET_Y)
+        self.paragraphs = [XmlParagraph(p) for p in txBody.iterfind(f"{A}p")]
+
+
+class XmlParagraph:
+    """An a:p element with its text as python-pptx reports it."""
+
+    __slots__ = ("element", "text")
+
+    def __init__(self, element: Any):
+        self.element = element
+        self.text = paragraph_text(element)
+
+
+class XmlParagraphData(ParagraphData):
+    """ParagraphData read from an a:p element."""
+
+    __slots__ = ()
+
+    def __init__(self, paragraph: XmlParagraph, index: int = 0):
+        """Initialize from a paragraph of an XmlTextFrame.
+
+        Args:
+            paragraph: The paragraph
+            index: Position of the paragraph in its text frame
+        """
+        self.index = index
+        self.raw_text = paragraph.text  # Unstripped, as measured for overflow
+        self.text = self.raw_text.strip()
+        self.bullet = False
+        self.level = None
+        self.alignment = None
+        self.space_before = None
+        self.space_after = None
+        self.font_name = None
+        self.font_size = None
+        self.bold = None
+        self.italic = None
+        self.underline = None
+        self.color = None
+        self.theme_color = None
+        self.line_spacing = None
+
+        p = paragraph.element
+        pPr = p.find(f"{A}pPr")
+        if pPr is not None:
+            if (
+                pPr.find(f"{A}buChar") is not None
+                or pPr.find(f"{A}buAutoNum") is not None
+            ):
+                self.bullet = True
+                self.level = int(pPr.get("lvl", 0))
+
+            algn = pPr.get("algn")
+            if algn is not None:
+                self.alignment = ALIGNMENTS.get(PP_ALIGN.from_xml(algn))
+
+            self.space_before = _spacing_pt(pPr.find(f"{A}spcBef"))
+            self.space_after = _spacing_pt(pPr.find(f"{A}spcAft"))
+
+        # Extract font properties from first run
+        first_run = p.find(f"{A}r")
+        rPr = None if first_run is None else first_run.find(f"{A}rPr")
+        if rPr is not None:
+            self._read_run_properties(rPr)
+
+        # Add line spacing if set
+        lnSpc = None if pPr is None else pPr.find(f"{A}lnSpc")
+        if lnSpc is not None:
+            spcPts = lnSpc.find(f"{A}spcPts")
+            if spcPts is not None:
+                self.line_spacing = round(Centipoints(int(spcPts.get("val"))).pt, 2)
+            else:
+                # Multiplier - convert to points
+                multiplier = ST_TextSpacingPercentOrPercentString.convert_from_xml(
+                    lnSpc.find(f"{A}spcPct").get("val")
+                )
+                font_size = self.font_size if self.font_size else 12.0
+                self.line_spacing = round(multiplier * font_size, 2)
+
+    def _read_run_properties(self, rPr: Any) -> None:
+        latin = rPr.find(f"{A}latin")
+        if latin is not None and latin.get("typeface"):
+            self.font_name = latin.get("typeface")
+        sz = rPr.get("sz")
+        if sz is not None and int(sz):
+            self.font_size = Centipoints(int(sz)).pt
+        if rPr.get("b") is not None:
+            self.bold = XsdBoolean.convert_from_xml(rPr.get("b"))
+        if rPr.get("i") is not None:
+            self.italic = XsdBoolean.convert_from_xml(rPr.get("i"))
+        u = rPr.get("u")
+        if u is not None:
+            underline = MSO_TEXT_UNDERLINE_TYPE.from_xml(u)
+            if underline is MSO_TEXT_UNDERLINE_TYPE.NONE:
+                self.underline = False
+            elif underline is MSO_TEXT_UNDERLINE_TYPE.SINGLE_LINE:
+                self.underline = True
+            else:
+                self.underline = underline
+
+        # Only a solid fill has a color python-pptx reports
+        fill = next((child for child in rPr if child.tag in FILL_TAGS), None)
+        if fill is None or fill.tag != f"{A}solidFill" or not len(fill):
+            return
+        color = fill[0]
+        if color.tag == f"{A}srgbClr":
+            self.color = color.get("val").upper()
+        elif color.tag == f"{A}schemeClr":
+            theme_color = MSO_THEME_COLOR.from_xml(color.get("val"))
+            if theme_color:
+                self.theme_color = theme_color.name
+
+
+class XmlShapeData(ShapeData):
+    """ShapeData read from a p:sp element of an XmlDeck slide.
+
+    Overflow estimates, warnings, to_dict() and restore() are shared with
+    ShapeData; only reading the shape differs.
+    """
+
+    def __init__(
+        self,
+        sp: Any,
+        absolute_left: int,
+        absolute_top: int,
+        width: int,
+        height: int,
+        slide: XmlSlide,
+        fields: Optional[Iterable[str]] = None,
+    ):
+        """Initialize from a text shape element.
+
+        Args:
+            sp: The p:sp element (should be pre-validated)
+            absolute_left: Absolute left position in EMUs
+            absolute_top: Absolute top position in EMUs
+            width: Effective width in EMUs
+            height: Effective height in EMUs
+            slide: Slide the shape is on
+            fields: Fields to compute (see inventory.FIELDS, default: all)
+        """
+        self.shape = sp
+        self.slide = slide
+        self._paragraphs: Optional[List[ParagraphData]] = None
+        self._frame: Optional[XmlTextFrame] = None
+        self.fields = ALL_FIELDS if fields is None else frozenset(fields)
+        self.shape_id = ""
+
+        self.slide_width_emu = slide.deck.slide_width
+        self.slide_height_emu = slide.deck.slide_height
+
+        self.placeholder_type = None
+        self.default_font_size = None
+        ph_type = _ph_type(sp)
+        if ph_type is not None:
+            self.placeholder_type = ph_type.name
+            if "formatting" in self.fields:
+                try:
+                    self.default_font_size = slide.layout.layout_font_size(ph_type)
+                except Exception:
+                    pass
+
+        self.left = round(self.emu_to_inches(absolute_left), 2)
+        self.top = round(self.emu_to_inches(absolute_top), 2)
+        self.width = round(self.emu_to_inches(width), 2)
+        self.height = round(self.emu_to_inches(height), 2)
+
+        self.left_emu = absolute_left
+        self.top_emu = absolute_top
+        self.width_emu = width
+        self.height_emu = height
+
+        self.frame_overflow_bottom = None
+        self.slide_overflow_right = None
+        self.slide_overflow_bottom = None
+        self.overlapping_shapes = {}
+        self.warnings = []
+        if "overflow" in self.fields:
+            self._estimate_frame_overflow()
+            self._calculate_slide_overflow()
+        if "warnings" in self.fields:
+            self._detect_bullet_issues()
+
+    @property
+    def paragraphs(self) -> List[ParagraphData]:
+        """Non-empty paragraphs of the shape's text frame, extracted once."""
+        if self._paragraphs is None:
+            self._paragraphs = [
+                XmlParagraphData(paragraph, index)
+                for index, paragraph in enumerate(self._get_frame().paragraphs)
+                if paragraph.text.strip()
+            ]
+        return self._paragraphs
+
+    def _get_frame(self) -> XmlTextFrame:
+        if self._frame is None:
+            self._frame = XmlTextFrame(self.shape.find(f"{P}txBody"))
+        return self._frame
+
+    def _text_frame(self) -> Optional[XmlTextFrame]:
+        text_frame = self._get_frame()
+        return text_frame if text_frame.paragraphs else None
+
+    def _get_default_font_size(self) -> int:
+        """Get default font size from theme text styles or use conservative default."""
+        try:
+            style_name = "bodyStyle"
+            if self.placeholder_type and "TITLE" in self.placeholder_type:
+                style_name = "titleStyle"
+            font_size = self.slide.layout.master.master_font_size(style_name)
+            if font_size is not None:
+                return font_size
+        except Exception:
+            pass
+        return 14
+
+
+def collect_shape_elms(
+    shape_elm: Any,
+    slide: XmlSlide,
+    parent_left: int = 0,
+    parent_top: int = 0,
+    placeholders: bool = False,
+) -> List[Tuple[Any, int, int, int, int]]:
+    """Recursively collect text shapes with absolute positions and sizes.
+
+    Mirrors inventory.collect_shapes_with_absolute_positions. Group children
+    are offset by the group's position only, as with python-pptx.
+
+    Args:
+        shape_elm: Shape element of a shape tree
+        slide: Slide the shape is on
+        parent_left: Accumulated left offset from parent groups (in EMUs)
+        parent_top: Accumulated top offset from parent groups (in EMUs)
+        placeholders: True for direct children of the slide's shape tree,
+            whose placeholders inherit missing positions from the layout
+
+    Returns:
+        List of (p:sp element, left, top, width, height) tuples in EMUs
+    """
+    if shape_elm.tag == f"{P}grpSp":
+        group_left = _xfrm_value(shape_elm, "left") or 0
+        group_top = _xfrm_value(shape_elm, "top") or 0
+        result = []
+        for child in _iter_shape_elms(shape_elm):
+            result.extend(
+                collect_shape_elms(
+                    child, slide, parent_left + group_left, parent_top + group_top
+                )
+            )
+        return result
+
+    if shape_elm.tag != f"{P}sp" or not is_valid_shape_elm(shape_elm):
+        return []
+
+    inherit = placeholders and _ph(shape_elm) is not None
+    left, top, width, height = (
+        _placeholder_value(shape_elm, slide, attr)
+        if inherit
+        else _xfrm_value(shape_elm, attr)
+        for attr in ("left", "top", "width", "height")
+    )
+    return [(shape_elm, parent_left + left, parent_top + top, width, height)]
+
+
+def is_valid_shape_elm(sp: Any) -> bool:
+    """Check if a p:sp element contains meaningful text (inventory.is_valid_shape)."""
+    txBody = sp.find(f"{P}txBody")
+    if txBody is None:
+        return False
+
+    text = "\n".join(paragraph_text(p) for p in txBody.iterfind(f"{A}p")).strip()
+    if not text:
+        return False
+
+    # Skip slide numbers and numeric footers
+    ph_type = _ph_type(sp)
+    if ph_type == PP_PLACEHOLDER.SLIDE_NUMBER:
+        return False
+    if ph_type == PP_PLACEHOLDER.FOOTER and text.isdigit():
+        return False
+    return True
+
+
+def paragraph_text(p: Any) -> str:
+    """Text of an a:p element: runs and fields, line breaks as vertical tabs."""
+    parts = []
+    for child in p:
+        tag = child.tag
+        if tag == f"{A}r" or tag == f"{A}fld":
+            t = child.find(f"{A}t")
+            parts.append("" if t is None else t.text or "")
+        elif tag == f"{A}br":
+            parts.append("\v")
+    return "".join(parts)
+
+
+def _iter_shape_elms(sp_tree: Any) -> Iterable[Any]:
+    return (child for child in sp_tree if child.tag in SHAPE_TAGS)
+
+
+def _ph(shape_elm: Any) -> Optional[Any]:
+    nv_pr = NV_PR_PATHS.get(shape_elm.tag)
+    return None if nv_pr is None else shape_elm.find(f"{nv_pr}/{P}ph")
+
+
+def _ph_type(shape_elm: Any) -> Optional[Any]:
+    """PP_PLACEHOLDER type of a placeholder element, None for other shapes."""
+    ph = _ph(shape_elm)
+    return None if ph is None else PP_PLACEHOLDER.from_xml(ph.get("type", "obj"))
+
+
+def _ph_idx(shape_elm: Any) -> Optional[int]:
+    ph = _ph(shape_elm)
+    return None if ph is None else int(ph.get("idx", 0))
+
+
+def _xfrm_value(shape_elm: Any, attr: str) -> Optional[int]:
+    """A shape's own left, top, width or height in EMUs, None if not set."""
+    xfrm_path = XFRM_PATHS.get(shape_elm.tag)
+    xfrm = None if xfrm_path is None else shape_elm.find(xfrm_path)
+    if xfrm is None:
+        return None
+    if attr in ("left", "top"):
+        off = xfrm.find(f"{A}off")
+        if off is None:
+            return None
+        return ST_Coordinate.convert_from_xml(off.get("x" if attr == "left" else "y"))
+    ext = xfrm.find(f"{A}ext")
+    if ext is None:
+        return None
+    return ST_PositiveCoordinate.convert_from_xml(
+        ext.get("cx" if attr == "width" else "cy")
+    )
+
+
+def _placeholder_value(sp: Any, slide: XmlSlide, attr: str) -> Optional[int]:
+    """Effective position of a slide placeholder: its own, the layout's or the master's."""
+    value = _xfrm_value(sp, attr)
+    if value is not None:
+        return value
+
+    layout_elm = slide.layout.layout_placeholder(_ph_idx(sp))
+    if layout_elm is None:
+        return None
+    value = _xfrm_value(layout_elm, attr)
+    if value is not None or layout_elm.tag != f"{P}sp":
+        return value
+
+    base_type = BASE_PLACEHOLDER_TYPES[_ph_type(layout_elm)]
+    master_elm = slide.layout.master.master_placeholder(base_type)
+    return None if master_elm is None else _xfrm_value(master_elm, attr)
+
+
+def _inset(body_pr: Any, name: str, default: int) -> int:
+    value = None if body_pr is None else body_pr.get(name)
+    return Emu(default) if value is None else ST_Coordinate32.convert_from_xml(value)
+
+
+def _spacing_pt(spacing: Any) -> Optional[float]:
+    """Points of an a:spcBef/a:spcAft element, if set in points and non-zero."""
+    spcPts = None if spacing is None else spacing.find(f"{A}spcPts")
+    if spcPts is None:
+        return None
+    length = Centipoints(int(spcPts.get("val")))
+    return length.pt if length else None
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Per-phase timing of inventory.py and replace.py.
+
+The scripts mark their phases (loading the package, collecting shapes, font
+lookup, text measurement, overlap detection, serialization, ...) with
+phase(name). While a PhaseProfiler is active, each phase's wall time, number
+of calls and growth of the peak RSS are collected; otherwise phase() does
+nothing. Phases nest: a phase's own time excludes the phases started inside
+it, and the report shows them as a tree.
+
+Optionally every phase also gets its own cProfile profile, and the profile
+of the slowest phase can be written out for pstats (cProfile slows the
+scripts down considerably, so timings are only comparable without it).
+
+Phases in worker processes (inventory.py --jobs N) are not collected.
+
+Usage:
+    from profiling import PhaseProfiler
+
+    with PhaseProfiler() as profiler:
+        get_inventory_as_dict(Path("deck.pptx"))
+    print(profiler.report())
+
+    # Or from the command line:
+    python inventory.py deck.pptx inventory.json --profile
+    python replace.py deck.pptx replacements.json out.pptx --profile-stats out.prof
+    python -m pstats out.prof
+"""
+
+import contextlib
+import cProfile
+import sys
+import time
+from dataclasses import dataclass
+from typing import ContextManager, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Names of a phase and the phases it runs in, outermost first
+PhasePath = Tuple[str, ...]
+
+# The profiler phases are collected by, if any
+_active: Optional["PhaseProfiler"] = None
+
+# Returned by phase() while no profiler is active
+_NO_PHASE = contextlib.nullcontext()
+
+
+@dataclass
+class PhaseStats:
+    """Collected statistics of one phase."""
+
+    calls: int = 0
+    total: float = 0.0  # Wall time in seconds, including nested phases
+    own: float = 0.0  # Wall time in seconds, excluding nested phases
+    rss_growth_kb: int = 0  # Growth of the peak RSS, excluding nested phases
+
+
+def phase(name: str) -> ContextManager:
+    """Mark a phase for the active profiler (no-op if none is active).
+
+    Args:
+        name: Phase name, e.g. "text measurement"
+    """
+    if _active is None:
+        return _NO_PHASE
+    return _active.phase(name)
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Return the peak resident set size of this process in KiB, if known."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS, KiB elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class PhaseProfiler:
+    """Collects phase statistics while active (see phase()).
+
+    Args:
+        cprofile: Also profile each phase with cProfile (see dump_stats)
+    """
+
+    def __init__(self, cprofile: bool = False):
+        self.phases: Dict[PhasePath, PhaseStats] = {}
+        self.wall_time = 0.0
+        self._cprofile = cprofile
+        self._profiles: Dict[PhasePath, cProfile.Profile] = {}
+        self._stack: List[PhasePath] = []
+        self._started = 0.0
+        self._mark = 0.0  # Time the innermost phase last resumed
+        self._rss_mark = 0  # Peak RSS when the innermost phase last resumed
+        self._previous: Optional[PhaseProfiler] = None
+
+    def start(self) -> None:
+        """Collect the phases of this process until stop()."""
+        global _active
+        self._previous, _active = _active, self
+        self._started = self._mark = time.perf_counter()
+        self._rss_mark = peak_rss_kb() or 0
+
+    def stop(self) -> None:
+        """Stop collecting; phases still running are not counted."""
+        global _active
+        self._switch(None)
+        self.wall_time += time.perf_counter() - self._started
+        self._stack.clear()
+        _active = self._previous
+
+    def __enter__(self) -> "PhaseProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Collect the statistics of a phase, nested in the running phase."""
+        path = (self._stack[-1] if self._stack else ()) + (name,)
+        stats = self.phases.setdefault(path, PhaseStats())
+        stats.calls += 1
+        started = time.perf_counter()
+        self._switch(path)
+        self._stack.append(path)
+        try:
+            yield
+        finally:
+            # stop() may have run inside the phase
+            if self._stack and self._stack[-1] == path:
+                self._switch(self._stack[-2] if len(self._stack) > 1 else None)
+                self._stack.pop()
+                stats.total += time.perf_counter() - started
+
+    def _switch(self, path: Optional[PhasePath]) -> None:
+        """Charge the time since the last switch to the innermost phase."""
+        now = time.perf_counter()
+        rss = peak_rss_kb() or 0
+        if self._stack:
+            current = self._stack[-1]
+            stats = self.phases[current]
+            stats.own += now - self._mark
+            stats.rss_growth_kb += rss - self._rss_mark
+            if self._cprofile:
+                self._profiles[current].disable()
+        if self._cprofile and path is not None:
+            self._profiles.setdefault(path, cProfile.Profile()).enable()
+        self._mark = now
+        self._rss_mark = rss
+
+    def slowest_phase(self) -> Optional[PhasePath]:
+        """Return the phase with the most own time, if any ran."""
+        if not self.phases:
+            return None
+        return max(self.phases, key=lambda path: self.phases[path].own)
+
+    def dump_stats(self, output_path: str) -> Optional[str]:
+        """Write the cProfile profile of the slowest phase for pstats.
+
+        Returns:
+            The phase written (as "outer > inner"), or None without profiles
+        """
+        slowest = self.slowest_phase()
+        if slowest not in self._profiles:
+            return None
+        self._profiles[slowest].dump_stats(output_path)
+        return " > ".join(slowest)
+
+    def report(self) -> str:
+        """Format the phases as a table, nested phases below their parents."""
+        peak = peak_rss_kb()
+        peak_text = f"{peak / 1024:.1f} MB" if peak is not None else "n/a"
+        lines = [
+            f"Profile: {self.wall_time:.3f}s wall time, peak RSS {peak_text}",
+            f"  {'phase':<34} {'calls':>7} {'total':>9} {'own':>9} {'share':>6} "
+            f"{'RSS growth':>11}",
+        ]
+        # Parents before their nested phases, in the order phases first ran
+        order = {path: i for i, path in enumerate(self.phases)}
+        for path in sorted(
+            self.phases, key=lambda p: [order[p[: i + 1]] for i in range(len(p))]
+        ):
+            stats = self.phases[path]
+            name = "  " * (len(path) - 1) + path[-1]
+            share = stats.own / self.wall_time if self.wall_time else 0.0
+            lines.append(
+                f"  {name:<34} {stats.calls:>7} {stats.total:>8.3f}s "
+                f"{stats.own:>8.3f}s {share:>6.1%} "
+                f"{'+' + format(stats.rss_growth_kb / 1024, '.1f') + ' MB':>11}"
+            )
+        other = self.wall_time - sum(stats.own for stats in self.phases.values())
+        lines.append(
+            f"  {'(outside phases)':<34} {'':>7} {'':>9} {other:>8.3f}s "
+            f"{other / self.wall_time if self.wall_time else 0.0:>6.1%}"
+        )
+        return "\n".join(lines)
@@ -2,25 +2,69 @@
 """Apply text replacements to PowerPoint presentation.
 
 Usage:
-    python replace.py <input.pptx> <replacements.json> <output.pptx>
+    python replace.py <input.pptx> <replacements.json> <output.pptx> [--profile]
+        [--profile-stats out.prof]
+        [--auto-fit font-size|line-spacing] [--min-font-size 10]
+    python replace.py <template.pptx> --batch manifest.jsonl [--jobs N]
 
 The replacements JSON should have the structure output by inventory.py.
 ALL text shapes identified by inventory.py will have their text cleared
 unless "paragraphs" is specified in the replacements for that shape.
+
+With --auto-fit, replaced shapes whose text overflows their frame get the
+largest font size (all paragraphs scaled alike) or line spacing at which the
+estimated overflow disappears, but no paragraph below --min-font-size points
+(smaller ones keep their size) or --min-line-spacing times the specified
+spacing; the sizes written are reported.
+
+With --batch, many decks are produced from one template: the template is
+loaded and inventoried once, and each line of the manifest applies one set
+of replacements to a copy of it:
+
+    {"replacements": "alice.json", "output": "out/alice.pptx"}
+    {"replacements": {"slide-0": {...}}, "output": "out/bob.pptx"}
+
+Relative paths are relative to the manifest. A job that fails validation or
+the overflow check does not stop the others; the exit status is 1 if any
+job failed.
 """
 
+import argparse
+import contextlib
+import copy
+import io
 import json
+import math
+import multiprocessing
 import sys
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
-
-from inventory import InventoryData, extract_text_inventory
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from inventory import (
+    InventoryData,
+    ShapeData,
+    extract_text_inventory,
+    print_profile,
+    sort_shapes_by_position,
+)
+from inventory_xml import P, XmlDeck, XmlShapeData, is_valid_shape_elm
+from lxml import etree
 from pptx import Presentation
 from pptx.dml.color import RGBColor
 from pptx.enum.dml import MSO_THEME_COLOR
 from pptx.enum.text import PP_ALIGN
 from pptx.oxml.xmlchemy import OxmlElement
+from pptx.shapes.autoshape import Shape
 from pptx.util import Pt
+from profiling import PhaseProfiler, phase
+
+# Quantities automatic fitting adjusts (see AutoFit)
+AUTO_FIT_MODES = ("font-size", "line-spacing")
+
+# Line spacing is reduced in steps of this fraction of the current spacing
+LINE_SPACING_STEP = 0.05
 
 
 def clear_paragraph_bullets(paragraph):
@@ -140,6 +184,61 @@ def apply_font_properties(run, para_data: Dict[str, Any]):
             print(f"  WARNING: Unknown theme color name '{theme_name}'")
 
 
+class ParagraphPlans:
+    """Paragraph formatting compiled once per signature and applied by cloning.
+
+    apply_paragraph_properties goes through python-pptx setters for every
+    paragraph. Apart from the run's text, the XML it produces only depends
+    on the formatting in the paragraph's replacement data and on the XML
+    the paragraph starts from: an added paragraph, or the first paragraph
+    of a cleared text frame with its paragraph properties. The first
+    paragraph of each such signature is formatted with
+    apply_paragraph_properties and its resulting children (pPr, the run,
+    endParaRPr) are kept; later ones get clones of them and only their text
+    set, so the XML is the same as with apply_paragraph_properties.
+    """
+
+    def __init__(self):
+        # (formatting, starting XML) -> (formatted children, printed warnings)
+        self._plans: Dict[Tuple[str, bytes], Tuple[List[Any], str]] = {}
+
+    def apply(self, paragraph: Any, para_data: Dict[str, Any]) -> None:
+        """Format a paragraph and set its text, like apply_paragraph_properties."""
+        p = paragraph._p
+        try:
+            formatting = json.dumps(
+                {key: value for key, value in para_data.items() if key != "text"},
+                sort_keys=True,
+            )
+        except TypeError:
+            # Values that are not from JSON have no signature
+            apply_paragraph_properties(paragraph, para_data)
+            return
+        signature = (formatting, etree.tostring(p, with_tail=False))
+
+        plan = self._plans.get(signature)
+        if plan is None:
+            output = io.StringIO()
+            try:
+                with contextlib.redirect_stdout(output):
+                    apply_paragraph_properties(paragraph, para_data)
+            finally:
+                print(output.getvalue(), end="")
+            self._plans[signature] = (
+                [copy.deepcopy(child) for child in p],
+                output.getvalue(),
+            )
+            return
+
+        children, warnings = plan
+        for child in list(p):
+            p.remove(child)
+        p.extend(copy.deepcopy(child) for child in children)
+        if warnings:
+            print(warnings, end="")
+        paragraph.runs[0].text = para_data.get("text", "")
+
+
 def detect_frame_overflow(inventory: InventoryData) -> Dict[str, Dict[str, float]]:
     """Detect text overflow in shapes (text exceeding shape bounds).
 
@@ -159,6 +258,193 @@ def detect_frame_overflow(inventory: InventoryData) -> Dict[str, Dict[str, float
     return overflow_map
 
 
+def inventory_replaced_shapes(
+    deck: XmlDeck, prs: Any, replaced: Dict[str, List[Tuple[Any, ShapeData]]]
+) -> InventoryData:
+    """Inventory the replaced shapes as extract_text_inventory would the output.
+
+    All other shapes of the inventory were cleared and no longer have text,
+    so the inventory of the output consists of the replaced shapes that have
+    text. They are analyzed in memory with the XML engine, which unlike
+    python-pptx does not add elements to the XML while reading (reading
+    font.color adds an empty <a:solidFill/>); their positions are those of
+    the original inventory. Shape keys are numbered among these shapes, as
+    in the inventory of the output.
+
+    Args:
+        deck: The original presentation (for layouts and masters)
+        prs: The presentation with the replacements applied
+        replaced: The replaced shapes of prs with their ShapeData in the
+            original inventory, by slide key
+
+    Returns a nested dictionary: {slide-N: {shape-N: XmlShapeData}} with
+    overflow and warnings computed.
+    """
+    inventory: InventoryData = {}
+    for slide_key, shapes in replaced.items():
+        slide_index = int(slide_key.split("-")[1])
+        slide = deck.slide(slide_index, prs.slides[slide_index]._element)
+        positions = {shape._element: shape_data for shape, shape_data in shapes}
+
+        # In document order, as shapes are collected for an inventory
+        shape_data_list = [
+            XmlShapeData(
+                sp,
+                positions[sp].left_emu,
+                positions[sp].top_emu,
+                positions[sp].width_emu,
+                positions[sp].height_emu,
+                slide,
+                {"overflow", "warnings"},
+            )
+            for sp in slide.element.iter(f"{P}sp")
+            if sp in positions and is_valid_shape_elm(sp)
+        ]
+        sorted_shapes = sort_shapes_by_position(shape_data_list)
+        for idx, shape_data in enumerate(sorted_shapes):
+            shape_data.shape_id = f"shape-{idx}"
+        if sorted_shapes:
+            inventory[slide_key] = {
+                shape_data.shape_id: shape_data for shape_data in sorted_shapes
+            }
+    return inventory
+
+
+@dataclass(frozen=True)
+class AutoFit:
+    """Bounds of the automatic fit of replaced shapes whose text overflows.
+
+    The text is only ever made smaller than the replacements specify, never
+    larger, and not below these bounds.
+    """
+
+    mode: str = "font-size"  # One of AUTO_FIT_MODES
+    min_font_size: float = 10.0  # Smallest font size in points
+    min_line_spacing: float = 0.8  # Smallest line spacing, relative to the current
+
+
+def fit_shape(
+    shape: Any, shape_data: XmlShapeData, fit: AutoFit
+) -> Optional[Tuple[XmlShapeData, str]]:
+    """Shrink the text of a replaced shape until it fits its frame.
+
+    Binary-searches the largest font size (scaling all paragraphs alike, but
+    none below fit.min_font_size and leaving smaller ones as they are) or
+    line spacing within the bounds of fit at which the estimated frame
+    overflow disappears. Each probe sets the size on the shape and estimates
+    its overflow again; words are measured once per font and size (see
+    text_layout.token_width), so probes mostly add up cached widths, and line
+    spacing probes do not measure anything new. If the text overflows even
+    at the bound, the bound is used.
+
+    Args:
+        shape: The replaced shape
+        shape_data: Its inventory after the replacement (overflow computed)
+        fit: Mode and bounds
+
+    Returns:
+        tuple: (inventory of the shape at the chosen size, description of
+            the change), or None if the shape was left unchanged
+    """
+    if shape_data.frame_overflow_bottom is None or not shape_data.paragraphs:
+        return None
+
+    paragraphs = shape.text_frame.paragraphs
+    default_font_size = shape_data._get_default_font_size()
+    # Font size and line height the overflow estimate used for each paragraph
+    font_sizes = [
+        (paragraphs[para.index], para.font_size or default_font_size)
+        for para in shape_data.paragraphs
+    ]
+    line_heights = [
+        (paragraph, para.line_spacing or int(size))
+        for (paragraph, size), para in zip(font_sizes, shape_data.paragraphs)
+    ]
+
+    if fit.mode == "font-size":
+        largest = max(size for _, size in font_sizes)
+        candidates = [
+            float(size)
+            for size in range(math.ceil(fit.min_font_size), math.ceil(largest))
+        ]
+
+        def scale(base: float, size: float) -> float:
+            if base <= fit.min_font_size:
+                return base
+            return max(round(base * size / largest * 2) / 2, fit.min_font_size)
+
+        def set_size(size: float) -> None:
+            for paragraph, base in font_sizes:
+                if base <= fit.min_font_size:
+                    continue
+                for run in paragraph.runs:
+                    run.font.size = Pt(scale(base, size))
+
+        def describe(size: float) -> str:
+            # The sizes written, from the largest paragraph size down
+            changes = [
+                f"{base:g} -> {scale(base, size):g}"
+                for base in sorted({base for _, base in font_sizes}, reverse=True)
+                if scale(base, size) != base
+            ]
+            return f"font size {', '.join(changes)} pt"
+
+    else:
+        steps = int(round((1 - fit.min_line_spacing) / LINE_SPACING_STEP, 6))
+        candidates = [
+            round(1 - step * LINE_SPACING_STEP, 2) for step in range(steps, 0, -1)
+        ]
+
+        def set_size(factor: float) -> None:
+            for paragraph, base in line_heights:
+                paragraph.line_spacing = Pt(round(base * factor, 2))
+
+        def describe(factor: float) -> str:
+            return f"line spacing {factor:.0%}"
+
+    if not candidates:
+        return None
+
+    probed_sizes: List[float] = []
+
+    def probe(size: float) -> XmlShapeData:
+        set_size(size)
+        probed_sizes.append(size)
+        return XmlShapeData(
+            shape_data.shape,
+            shape_data.left_emu,
+            shape_data.top_emu,
+            shape_data.width_emu,
+            shape_data.height_emu,
+            shape_data.slide,
+            shape_data.fields,
+        )
+
+    # Largest candidate without overflow; candidates are in ascending order
+    best: Optional[Tuple[float, XmlShapeData]] = None
+    low, high = 0, len(candidates) - 1
+    while low <= high:
+        middle = (low + high) // 2
+        probed = probe(candidates[middle])
+        if probed.frame_overflow_bottom is None:
+            best = (candidates[middle], probed)
+            low = middle + 1
+        else:
+            high = middle - 1
+
+    if best is None:
+        size = candidates[0]
+        fitted = probe(size) if probed_sizes[-1] != size else probed
+        return fitted, (
+            f'{describe(size)}, still overflows by {fitted.frame_overflow_bottom:.2f}"'
+        )
+    size, fitted = best
+    if probed_sizes[-1] != size:
+        # A smaller size was probed last
+        fitted = probe(size)
+    return fitted, describe(size)
+
+
 def validate_replacements(inventory: InventoryData, replacements: Dict) -> List[str]:
     """Validate that all shapes in replacements exist in inventory.
 
@@ -211,174 +497,593 @@ def check_duplicate_keys(pairs):
     return result
 
 
-def apply_replacements(pptx_file: str, json_file: str, output_file: str):
-    """Apply text replacements from JSON to PowerPoint presentation."""
-
-    # Load presentation
-    prs = Presentation(pptx_file)
-
-    # Get inventory of all text shapes (returns ShapeData objects)
-    # Pass prs to use same Presentation instance
-    inventory = extract_text_inventory(Path(pptx_file), prs)
-
-    # Detect text overflow in original presentation
-    original_overflow = detect_frame_overflow(inventory)
-
-    # Load replacement data with duplicate key detection
+def load_replacements(json_file: Union[str, Path]) -> Dict:
+    """Load replacement data with duplicate key detection."""
     with open(json_file, "r") as f:
-        replacements = json.load(f, object_pairs_hook=check_duplicate_keys)
-
-    # Validate replacements
-    errors = validate_replacements(inventory, replacements)
-    if errors:
-        print("ERROR: Invalid shapes in replacement JSON:")
-        for error in errors:
-            print(f"  - {error}")
-        print("\nPlease check the inventory and update your replacement JSON.")
-        print(
-            "You can regenerate the inventory with: python inventory.py <input.pptx> <output.json>"
-        )
-        raise ValueError(f"Found {len(errors)} validation error(s)")
+        return json.load(f, object_pairs_hook=check_duplicate_keys)
 
-    # Track statistics
-    shapes_processed = 0
-    shapes_cleared = 0
-    shapes_replaced = 0
 
-    # Process each slide from inventory
-    for slide_key, shapes_dict in inventory.items():
-        if not slide_key.startswith("slide-"):
-            continue
+def apply_replacements(
+    pptx_file: str, json_file: str, output_file: str, fit: Optional[AutoFit] = None
+):
+    """Apply text replacements from JSON to PowerPoint presentation."""
+    with ReplacementTemplate(pptx_file, fit) as template:
+        with phase("validation"):
+            replacements = load_replacements(json_file)
+        template.apply(replacements, output_file, copy=False)
 
-        slide_index = int(slide_key.split("-")[1])
 
-        if slide_index >= len(prs.slides):
-            print(f"Warning: Slide {slide_index} not found")
-            continue
+class ReplacementTemplate:
+    """A presentation loaded and inventoried once, to apply replacements to.
 
-        # Process each shape from inventory
-        for shape_key, shape_data in shapes_dict.items():
-            shapes_processed += 1
+    apply() can work on copies of the presentation, so one template serves
+    any number of replacement sets (see apply_batch). A copy is loaded from
+    the presentation as it was after the inventory, so its output is the
+    same as that of a separate replace.py run.
+    """
 
-            # Get the shape directly from ShapeData
-            shape = shape_data.shape
-            if not shape:
-                print(f"Warning: {shape_key} has no shape reference")
-                continue
+    def __init__(self, pptx_file: str, fit: Optional[AutoFit] = None):
+        """Load and inventory a presentation.
+
+        Args:
+            pptx_file: Path to the PowerPoint file
+            fit: Shrink the text of replaced shapes that overflow their
+                frame, within these bounds (see fit_shape)
+        """
+        self.pptx_file = pptx_file
+        self.fit = fit
+
+        # Load presentation
+        with phase("load"):
+            self.prs = Presentation(pptx_file)
+
+        # Get inventory of all text shapes (returns ShapeData objects)
+        # Pass prs to use same Presentation instance
+        with phase("inventory"):
+            self.inventory = extract_text_inventory(
+                Path(pptx_file), self.prs, fields={"text", "overflow"}, cache=True
+            )
+
+        # Detect text overflow in original presentation
+        self.original_overflow = detect_frame_overflow(self.inventory)
+
+        # Layouts and masters of the original, for the overflow check of
+        # every copy
+        self.deck = XmlDeck(pptx_file)
+
+        # The saved presentation, and the position of each inventory shape
+        # among the p:sp elements of its slide, for copies
+        self._package: Optional[bytes] = None
+        self._shape_indices: Dict[Tuple[str, str], int] = {}
+
+        # Replacement paragraphs compiled to XML, shared by all copies
+        self._paragraph_plans = ParagraphPlans()
+
+    def close(self) -> None:
+        """Close the original presentation's archive."""
+        self.deck.close()
+
+    def __enter__(self) -> "ReplacementTemplate":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def copy(self) -> Tuple[Any, Dict[Tuple[str, str], Any]]:
+        """Load a copy of the presentation.
+
+        Returns:
+            tuple: (presentation, {(slide key, shape key): shape} for the
+                inventory shapes)
+        """
+        with phase("copy"):
+            if self._package is None:
+                buffer = io.BytesIO()
+                self.prs.save(buffer)
+                self._package = buffer.getvalue()
+                self._shape_indices = self._index_shapes(self.prs)
+
+            prs = Presentation(io.BytesIO(self._package))
+            shapes = {}
+            slide_elms: Dict[str, List[Any]] = {}
+            for (slide_key, shape_key), idx in self._shape_indices.items():
+                slide = prs.slides[int(slide_key.split("-")[1])]
+                if slide_key not in slide_elms:
+                    slide_elms[slide_key] = list(slide._element.iter(f"{P}sp"))
+                shapes[slide_key, shape_key] = Shape(
+                    slide_elms[slide_key][idx], slide.shapes
+                )
+        return prs, shapes
+
+    def _index_shapes(self, prs: Any) -> Dict[Tuple[str, str], int]:
+        indices = {}
+        for slide_key, shapes_dict in self.inventory.items():
+            slide = prs.slides[int(slide_key.split("-")[1])]
+            order = {sp: idx for idx, sp in enumerate(slide._element.iter(f"{P}sp"))}
+            for shape_key, shape_data in shapes_dict.items():
+                indices[slide_key, shape_key] = order[shape_data.shape._element]
+        return indices
+
+    def apply(
+        self, replacements: Dict, output_file: str, copy: bool = True
+    ) -> Dict[str, Any]:
+        """Apply replacements and save the result if it passes the checks.
+
+        Args:
+            replacements: Replacement data (see load_replacements)
+            output_file: Path to save the presentation to
+            copy: Apply to a copy (see copy()); otherwise the loaded
+                presentation is modified, which can then not be reused
+
+        Returns:
+            dict: Shapes processed, cleared and replaced, and the auto-fit
+                of each fitted shape as printed ("fitted")
+
+        Raises:
+            ValueError: If the replacements refer to unknown shapes, or make
+                overflow worse or cause formatting warnings
+        """
+        inventory = self.inventory
+        if copy:
+            prs, shapes = self.copy()
+        else:
+            prs, shapes = self.prs, None
+
+        # Validate replacements
+        with phase("validation"):
+            errors = validate_replacements(inventory, replacements)
+        if errors:
+            print("ERROR: Invalid shapes in replacement JSON:")
+            for error in errors:
+                print(f"  - {error}")
+            print("\nPlease check the inventory and update your replacement JSON.")
+            print(
+                "You can regenerate the inventory with: python inventory.py <input.pptx> <output.json>"
+            )
+            raise ValueError(f"Found {len(errors)} validation error(s)")
+        # Track statistics
+        shapes_processed = 0
+        shapes_cleared = 0
+        shapes_replaced = 0
+        # Shapes given new text with their inventory data, by slide key
+        replaced: Dict[str, List[Tuple[Any, ShapeData]]] = {}
+
+        with phase("apply replacements"):
+            # Process each slide from inventory
+            for slide_key, shapes_dict in inventory.items():
+                if not slide_key.startswith("slide-"):
+                    continue
+
+                slide_index = int(slide_key.split("-")[1])
+
+                if slide_index >= len(prs.slides):
+                    print(f"Warning: Slide {slide_index} not found")
+                    continue
+
+                # Process each shape from inventory
+                for shape_key, shape_data in shapes_dict.items():
+                    shapes_processed += 1
+
+                    # Get the shape directly from ShapeData, or from the copy
+                    if shapes is None:
+                        shape = shape_data.shape
+                    else:
+                        shape = shapes[slide_key, shape_key]
+                    if not shape:
+                        print(f"Warning: {shape_key} has no shape reference")
+                        continue
+
+                    # ShapeData already validates text_frame in __init__
+                    text_frame = shape.text_frame  # type: ignore
+
+                    text_frame.clear()  # type: ignore
+                    shapes_cleared += 1
+
+                    # Check for replacement paragraphs
+                    replacement_shape_data = replacements.get(slide_key, {}).get(
+                        shape_key, {}
+                    )
+                    if "paragraphs" not in replacement_shape_data:
+                        continue
+
+                    shapes_replaced += 1
+                    replaced.setdefault(slide_key, []).append((shape, shape_data))
+
+                    # Add replacement paragraphs
+                    for i, para_data in enumerate(replacement_shape_data["paragraphs"]):
+                        if i == 0:
+                            p = text_frame.paragraphs[0]  # type: ignore
+                        else:
+                            p = text_frame.add_paragraph()  # type: ignore
 
-            # ShapeData already validates text_frame in __init__
-            text_frame = shape.text_frame  # type: ignore
+                        self._paragraph_plans.apply(p, para_data)
 
-            text_frame.clear()  # type: ignore
-            shapes_cleared += 1
+        # Check for issues after replacements, on the replaced shapes only
+        with phase("overflow check"):
+            updated_inventory = inventory_replaced_shapes(self.deck, prs, replaced)
 
-            # Check for replacement paragraphs
-            replacement_shape_data = replacements.get(slide_key, {}).get(shape_key, {})
-            if "paragraphs" not in replacement_shape_data:
-                continue
+        fitted = []
+        if self.fit is not None:
+            with phase("auto-fit"):
+                fitted = self._fit_shapes(updated_inventory, replaced)
+            if fitted:
+                print(f"Auto-fit ({self.fit.mode}):")
+                for line in fitted:
+                    print(f"  - {line}")
 
-            shapes_replaced += 1
+        updated_overflow = detect_frame_overflow(updated_inventory)
 
-            # Add replacement paragraphs
-            for i, para_data in enumerate(replacement_shape_data["paragraphs"]):
-                if i == 0:
-                    p = text_frame.paragraphs[0]  # type: ignore
-                else:
-                    p = text_frame.add_paragraph()  # type: ignore
+        # Check if any text overflow got worse
+        overflow_errors = []
+        for slide_key, shape_overflows in updated_overflow.items():
+            for shape_key, new_overflow in shape_overflows.items():
+                # Get original overflow (0 if there was no overflow before)
+                original = self.original_overflow.get(slide_key, {}).get(shape_key, 0.0)
+
+                # Error if overflow increased
+                if new_overflow > original + 0.01:  # Small tolerance for rounding
+                    increase = new_overflow - original
+                    overflow_errors.append(
+                        f'{slide_key}/{shape_key}: overflow worsened by {increase:.2f}" '
+                        f'(was {original:.2f}", now {new_overflow:.2f}")'
+                    )
+
+        # Collect warnings from updated shapes
+        warnings = []
+        for slide_key, shapes_dict in updated_inventory.items():
+            for shape_key, shape_data in shapes_dict.items():
+                if shape_data.warnings:
+                    for warning in shape_data.warnings:
+                        warnings.append(f"{slide_key}/{shape_key}: {warning}")
+
+        # Fail if there are any issues
+        if overflow_errors or warnings:
+            print("\nERROR: Issues detected in replacement output:")
+            if overflow_errors:
+                print("\nText overflow worsened:")
+                for error in overflow_errors:
+                    print(f"  - {error}")
+            if warnings:
+                print("\nFormatting warnings:")
+                for warning in warnings:
+                    print(f"  - {warning}")
+            print("\nPlease fix these issues before saving.")
+            raise ValueError(
+                f"Found {len(overflow_errors)} overflow error(s) and {len(warnings)} warning(s)"
+            )
+
+        # Save the presentation
+        with phase("save"):
+            prs.save(output_file)
+
+        # Report results
+        print(f"Saved updated presentation to: {output_file}")
+        print(f"Processed {len(prs.slides)} slides")
+        print(f"  - Shapes processed: {shapes_processed}")
+        print(f"  - Shapes cleared: {shapes_cleared}")
+        print(f"  - Shapes replaced: {shapes_replaced}")
+        return {
+            "shapes_processed": shapes_processed,
+            "shapes_cleared": shapes_cleared,
+            "shapes_replaced": shapes_replaced,
+            "fitted": fitted,
+        }
 
-                apply_paragraph_properties(p, para_data)
+    def _fit_shapes(
+        self,
+        updated_inventory: InventoryData,
+        replaced: Dict[str, List[Tuple[Any, ShapeData]]],
+    ) -> List[str]:
+        """Fit the overflowing replaced shapes, updating their inventory.
+
+        Returns:
+            list: The chosen size of each changed shape, as "slide/shape: size"
+                with the shape keys of the replacements
+        """
+        assert self.fit is not None
+        fitted = []
+        for slide_key, shapes_dict in updated_inventory.items():
+            by_element = {
+                shape._element: (shape, shape_data)
+                for shape, shape_data in replaced[slide_key]
+            }
+            for shape_key, updated in shapes_dict.items():
+                shape, shape_data = by_element[updated.shape]
+                result = fit_shape(shape, updated, self.fit)  # type: ignore
+                if result is None:
+                    continue
+                shapes_dict[shape_key], description = result
+                fitted.append(f"{slide_key}/{shape_data.shape_id}: {description}")
+        return fitted
+
+
+def read_manifest(manifest_file: Path) -> List[Dict[str, Any]]:
+    """Read the jobs of a batch manifest (see the module docstring).
+
+    Returns:
+        list: {"replacements": path or data, "output": path} per job, with
+            paths resolved relative to the manifest
+
+    Raises:
+        ValueError: If a line is not a job
+    """
+    base = manifest_file.parent
+    jobs = []
+    with open(manifest_file, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line, object_pairs_hook=check_duplicate_keys)
+            except ValueError as e:
+                raise ValueError(f"Manifest line {line_number}: {e}") from e
+            if (
+                not isinstance(job, dict)
+                or not isinstance(job.get("output"), str)
+                or not isinstance(job.get("replacements"), (str, dict))
+            ):
+                raise ValueError(
+                    f"Manifest line {line_number}: expected "
+                    '{"replacements": <file or object>, "output": <file>}'
+                )
+            replacements = job["replacements"]
+            if isinstance(replacements, str):
+                replacements = str(base / replacements)
+            jobs.append(
+                {"replacements": replacements, "output": str(base / job["output"])}
+            )
+    return jobs
+
+
+def apply_batch(
+    pptx_file: str,
+    jobs: List[Dict[str, Any]],
+    processes: int = 1,
+    fit: Optional[AutoFit] = None,
+) -> bool:
+    """Apply the replacement sets of a batch to one template.
+
+    Each job's output is what a separate replace.py run would save. Results
+    are printed per job as they finish, in manifest order.
+
+    Args:
+        pptx_file: Path to the template presentation
+        jobs: Jobs as returned by read_manifest
+        processes: Number of worker processes, each loading the template once
+        fit: Bounds to fit overflowing replaced shapes within, if any
+
+    Returns:
+        bool: True if all jobs succeeded
+    """
+    start = time.perf_counter()
+    failed = 0
+    results = _iter_batch_results(pptx_file, jobs, processes, fit)
+    for number, result in enumerate(results, 1):
+        prefix = f"[{number}/{len(jobs)}] {result['output']}"
+        if result["error"] is None:
+            fitted = result["fitted"]
+            print(
+                f"{prefix}: saved in {result['seconds']:.2f}s "
+                f"({result['shapes_replaced']} shapes replaced"
+                f"{f', {len(fitted)} fitted' if fitted else ''})"
+            )
+            for line in fitted:
+                print(f"    - {line}")
+        else:
+            failed += 1
+            print(f"{prefix}: FAILED in {result['seconds']:.2f}s: {result['error']}")
+            for line in result["log"].strip("\n").splitlines():
+                print(f"    {line}")
+
+    print(
+        f"\n{len(jobs) - failed} of {len(jobs)} decks saved, {failed} failed "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    return failed == 0
+
+
+def _iter_batch_results(
+    pptx_file: str,
+    jobs: List[Dict[str, Any]],
+    processes: int,
+    fit: Optional[AutoFit],
+) -> Iterator[Dict[str, Any]]:
+    if processes > 1 and len(jobs) > 1:
+        with multiprocessing.Pool(
+            min(processes, len(jobs)),
+            initializer=_init_batch_worker,
+            initargs=(pptx_file, fit),
+        ) as pool:
+            yield from pool.imap(_run_batch_job_worker, jobs)
+        return
+
+    with ReplacementTemplate(pptx_file, fit) as template:
+        for job in jobs:
+            yield run_batch_job(template, job)
+
+
+def run_batch_job(template: ReplacementTemplate, job: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply one job of a batch to a copy of the template.
+
+    Returns:
+        dict: The job's "output", "seconds", "error" (None if saved),
+            "shapes_replaced", "fitted" (see ReplacementTemplate.apply) and
+            "log" (what the job printed)
+    """
+    start = time.perf_counter()
+    log = io.StringIO()
+    result: Dict[str, Any] = {"output": job["output"], "error": None}
+    try:
+        with contextlib.redirect_stdout(log):
+            replacements = job["replacements"]
+            if not isinstance(replacements, dict):
+                with phase("validation"):
+                    replacements = load_replacements(replacements)
+            Path(job["output"]).parent.mkdir(parents=True, exist_ok=True)
+            stats = template.apply(replacements, job["output"])
+        result["shapes_replaced"] = stats["shapes_replaced"]
+        result["fitted"] = stats["fitted"]
+    except Exception as e:
+        result["error"] = str(e) or type(e).__name__
+    result["seconds"] = time.perf_counter() - start
+    result["log"] = log.getvalue()
+    return result
 
-    # Check for issues after replacements
-    # Save to a temporary file and reload to avoid modifying the presentation during inventory
-    # (extract_text_inventory accesses font.color which adds empty <a:solidFill/> elements)
-    import tempfile
 
-    with tempfile.NamedTemporaryFile(suffix=".pptx", delete=False) as tmp:
-        tmp_path = Path(tmp.name)
-        prs.save(str(tmp_path))
+# Per-process template of batch worker processes
+_worker_template: Optional[ReplacementTemplate] = None
 
-    try:
-        updated_inventory = extract_text_inventory(tmp_path)
-        updated_overflow = detect_frame_overflow(updated_inventory)
-    finally:
-        tmp_path.unlink()  # Clean up temp file
-
-    # Check if any text overflow got worse
-    overflow_errors = []
-    for slide_key, shape_overflows in updated_overflow.items():
-        for shape_key, new_overflow in shape_overflows.items():
-            # Get original overflow (0 if there was no overflow before)
-            original = original_overflow.get(slide_key, {}).get(shape_key, 0.0)
-
-            # Error if overflow increased
-            if new_overflow > original + 0.01:  # Small tolerance for rounding
-                increase = new_overflow - original
-                overflow_errors.append(
-                    f'{slide_key}/{shape_key}: overflow worsened by {increase:.2f}" '
-                    f'(was {original:.2f}", now {new_overflow:.2f}")'
-                )
 
-    # Collect warnings from updated shapes
-    warnings = []
-    for slide_key, shapes_dict in updated_inventory.items():
-        for shape_key, shape_data in shapes_dict.items():
-            if shape_data.warnings:
-                for warning in shape_data.warnings:
-                    warnings.append(f"{slide_key}/{shape_key}: {warning}")
-
-    # Fail if there are any issues
-    if overflow_errors or warnings:
-        print("\nERROR: Issues detected in replacement output:")
-        if overflow_errors:
-            print("\nText overflow worsened:")
-            for error in overflow_errors:
-                print(f"  - {error}")
-        if warnings:
-            print("\nFormatting warnings:")
-            for warning in warnings:
-                print(f"  - {warning}")
-        print("\nPlease fix these issues before saving.")
-        raise ValueError(
-            f"Found {len(overflow_errors)} overflow error(s) and {len(warnings)} warning(s)"
-        )
+def _init_batch_worker(pptx_file: str, fit: Optional[AutoFit]) -> None:
+    """Load and inventory the template once per worker process."""
+    global _worker_template
+    _worker_template = ReplacementTemplate(pptx_file, fit)
 
-    # Save the presentation
-    prs.save(output_file)
 
-    # Report results
-    print(f"Saved updated presentation to: {output_file}")
-    print(f"Processed {len(prs.slides)} slides")
-    print(f"  - Shapes processed: {shapes_processed}")
-    print(f"  - Shapes cleared: {shapes_cleared}")
-    print(f"  - Shapes replaced: {shapes_replaced}")
+def _run_batch_job_worker(job: Dict[str, Any]) -> Dict[str, Any]:
+    assert _worker_template is not None
+    return run_batch_job(_worker_template, job)
 
 
 def main():
     """Main entry point for command-line usage."""
-    if len(sys.argv) != 4:
-        print(__doc__)
-        sys.exit(1)
-
-    input_pptx = Path(sys.argv[1])
-    replacements_json = Path(sys.argv[2])
-    output_pptx = Path(sys.argv[3])
+    parser = argparse.ArgumentParser(
+        description="Apply text replacements to a PowerPoint presentation."
+    )
+    parser.add_argument("input", help="Input PowerPoint file (.pptx)")
+    parser.add_argument("replacements", nargs="?", help="Replacements JSON file")
+    parser.add_argument("output", nargs="?", help="Output PowerPoint file (.pptx)")
+    parser.add_argument(
+        "--batch",
+        default=None,
+        metavar="MANIFEST",
+        help="JSON Lines file with one "
+        '{"replacements": ..., "output": ...} job per line, applied to copies '
+        "of the input, which is loaded and inventoried once",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="With --batch, number of worker processes to run jobs in (default: 1)",
+    )
+    parser.add_argument(
+        "--auto-fit",
+        choices=AUTO_FIT_MODES,
+        default=None,
+        help="Shrink the font size or line spacing of replaced shapes whose text "
+        "overflows their frame to the largest that fits, and report it",
+    )
+    parser.add_argument(
+        "--min-font-size",
+        type=float,
+        default=AutoFit.min_font_size,
+        metavar="PT",
+        help="With --auto-fit font-size, smallest font size in points "
+        f"(default: {AutoFit.min_font_size:g})",
+    )
+    parser.add_argument(
+        "--min-line-spacing",
+        type=float,
+        default=AutoFit.min_line_spacing,
+        metavar="FRACTION",
+        help="With --auto-fit line-spacing, smallest line spacing as a fraction "
+        f"of the specified one (default: {AutoFit.min_line_spacing:g})",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Report wall time, calls and peak RSS growth per phase, including "
+        "the overflow check of the replaced shapes",
+    )
+    parser.add_argument(
+        "--profile-stats",
+        default=None,
+        metavar="FILE",
+        help="Like --profile, and write the cProfile stats of the slowest phase "
+        "to FILE for pstats (slows the run down)",
+    )
+    args = parser.parse_args()
+    if args.batch:
+        if args.replacements or args.output:
+            parser.error("--batch takes the replacements and outputs from the manifest")
+    elif not (args.replacements and args.output):
+        parser.error("the following arguments are required: replacements, output")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.min_font_size <= 0:
+        parser.error("--min-font-size must be positive")
+    if not 0 < args.min_line_spacing <= 1:
+        parser.error("--min-line-spacing must be greater than 0 and at most 1")
+    fit = None
+    if args.auto_fit:
+        fit = AutoFit(args.auto_fit, args.min_font_size, args.min_line_spacing)
+
+    input_pptx = Path(args.input)
 
     if not input_pptx.exists():
         print(f"Error: Input file '{input_pptx}' not found")
         sys.exit(1)
 
+    if args.batch:
+        run_batch(args, input_pptx, fit)
+        return
+
+    replacements_json = Path(args.replacements)
+    output_pptx = Path(args.output)
+
     if not replacements_json.exists():
         print(f"Error: Replacements JSON file '{replacements_json}' not found")
         sys.exit(1)
 
+    profiler = None
+    if args.profile or args.profile_stats:
+        profiler = PhaseProfiler(cprofile=args.profile_stats is not None)
+        profiler.start()
+
     try:
-        apply_replacements(str(input_pptx), str(replacements_json), str(output_pptx))
+        apply_replacements(
+            str(input_pptx), str(replacements_json), str(output_pptx), fit
+        )
     except Exception as e:
         print(f"Error applying replacements: {e}")
         import traceback
 
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+            print_profile(profiler, args.profile_stats)
+
+
+def run_batch(
+    args: argparse.Namespace, input_pptx: Path, fit: Optional[AutoFit]
+) -> None:
+    """Run replace.py --batch; exits with status 1 if a job failed."""
+    manifest = Path(args.batch)
+    if not manifest.exists():
+        print(f"Error: Manifest file '{manifest}' not found")
+        sys.exit(1)
+    try:
+        jobs = read_manifest(manifest)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    profiler = None
+    if args.profile or args.profile_stats:
+        profiler = PhaseProfiler(cprofile=args.profile_stats is not None)
+        profiler.start()
+    try:
+        succeeded = apply_batch(str(input_pptx), jobs, args.jobs, fit)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+            print_profile(profiler, args.profile_stats)
+    if not succeeded:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
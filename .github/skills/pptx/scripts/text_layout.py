@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Line wrapping for text overflow estimates.
+
+Wrapping a line by re-measuring the growing candidate line after every word
+is quadratic in the number of words, and the same words are measured again
+for every shape. Here each word is measured once per font and cached; line
+widths are accumulated by adding word and space widths. Kerning and shaping
+can make a joined string slightly narrower or wider than the sum of its
+parts, so whenever the sum lands within a tolerance of the available width
+the candidate line is measured exactly before deciding where to break. The
+resulting lines are the same as with exact measurement of every candidate
+(benchmark_line_wrap.py checks this).
+
+Break opportunities follow a simplified UAX #14: lines break at spaces, and
+also between ideographs, kana and other CJK characters, which are written
+without spaces. Kinsoku rules keep closing brackets, punctuation, small kana
+and the prolonged sound mark off the start of a line and opening brackets off
+its end. CJK characters are measured once each, so a paragraph of Japanese
+text wraps in linear time.
+
+With the "glyphs" measurement backend (opt-in, needs NumPy), wrap_line
+delegates to glyph_layout.wrap_line_glyphs, which sums cached per-character
+advances instead of measuring with PIL; it is faster and approximate.
+
+Usage:
+    from text_layout import wrap_line
+
+    lines = wrap_line("Some long text", max_width_px=240, font=font)
+
+    set_measure_backend("glyphs")  # or PPTX_TEXT_MEASURE=glyphs
+"""
+
+import os
+import re
+from typing import Dict, List, Tuple
+
+from PIL import Image, ImageDraw
+
+# Maximum number of cached (font, token) widths before the cache is reset
+WIDTH_CACHE_SIZE = 200_000
+
+# Largest width change (in em) that kerning or shaping may cause at one word
+# boundary; sums within this margin of the line width are measured exactly
+KERNING_TOLERANCE = 0.1
+
+# Characters that are written without spaces and may be broken between
+# (UAX #14 classes ID, H2/H3, CJ and fullwidth forms)
+CJK_RANGES = (
+    "\u2e80-\u2fff"  # CJK radicals, Kangxi radicals
+    "\u3000-\u303f"  # CJK symbols and punctuation
+    "\u3040-\u309f"  # Hiragana
+    "\u30a0-\u30ff"  # Katakana
+    "\u3100-\u31ff"  # Bopomofo, Katakana phonetic extensions
+    "\u3200-\u4dbf"  # Enclosed CJK, CJK extension A
+    "\u4e00-\u9fff"  # CJK unified ideographs
+    "\uac00-\ud7af"  # Hangul syllables
+    "\uf900-\ufaff"  # CJK compatibility ideographs
+    "\ufe30-\ufe4f"  # CJK compatibility forms
+    "\uff00-\uffef"  # Halfwidth and fullwidth forms
+    "\U00020000-\U0003ffff"  # CJK extensions B and later
+)
+CJK_PATTERN = re.compile(f"[{CJK_RANGES}]")
+
+# Kinsoku: characters that may not start a line (UAX #14 CL, CP, EX, IS, NS,
+# PO and small kana) ...
+NO_BREAK_BEFORE = set(
+    "、。，．・：；？！゛゜ヽヾゝゞ々〻ー゠〜～‐–—…‥"
+    "）〕］｝〉》」』】〙〗〟｠’”»"
+    "ぁぃぅぇぉっゃゅょゎゕゖァィゥェォッャュョヮヵヶㇰㇱㇲㇳㇴㇵㇶㇷㇸㇹㇺㇻㇼㇽㇾㇿ"
+    "ｧｨｩｪｫｬｭｮｯｰ｡､｣"
+    ")]}!?,.:;%％"
+)
+# ... and characters that may not end one (UAX #14 OP)
+NO_BREAK_AFTER = set("（〔［｛〈《「『【〘〖〝｟‘“«｢([{")
+
+# Text measurement backends: exact PIL measurement, or summed glyph advances
+# without / with pair kerning (see glyph_layout.py)
+MEASURE_BACKENDS = ("pil", "glyphs", "glyphs-kerning")
+
+# Environment variable selecting the backend; set_measure_backend() sets it,
+# so worker processes use the same backend
+MEASURE_ENV = "PPTX_TEXT_MEASURE"
+
+_draw = None
+_widths: Dict[Tuple, float] = {}
+
+
+def _get_draw() -> ImageDraw.ImageDraw:
+    global _draw
+    if _draw is None:
+        _draw = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+    return _draw
+
+
+def font_key(font) -> Tuple:
+    """Return a hashable key identifying a loaded font and its size."""
+    return (
+        getattr(font, "path", None),
+        getattr(font, "size", None),
+        getattr(font, "index", 0),
+    )
+
+
+def measure(text: str, font) -> float:
+    """Measure the advance width of text exactly, in pixels."""
+    return _get_draw().textlength(text, font=font)
+
+
+def token_width(token: str, font, key: Tuple = None) -> float:
+    """Return the width of a word (or space), measured once per font."""
+    cache_key = (key or font_key(font), token)
+    width = _widths.get(cache_key)
+    if width is None:
+        if len(_widths) >= WIDTH_CACHE_SIZE:
+            _widths.clear()
+        width = _widths[cache_key] = measure(token, font)
+    return width
+
+
+def measure_backend() -> str:
+    """Return the selected text measurement backend (default: "pil")."""
+    backend = os.environ.get(MEASURE_ENV) or "pil"
+    if backend not in MEASURE_BACKENDS:
+        raise ValueError(
+            f"Unknown {MEASURE_ENV} '{backend}'; choose from {', '.join(MEASURE_BACKENDS)}"
+        )
+    return backend
+
+
+def set_measure_backend(backend: str) -> None:
+    """Select the text measurement backend for this and child processes."""
+    if backend not in MEASURE_BACKENDS:
+        raise ValueError(f"Unknown measurement backend '{backend}'")
+    os.environ[MEASURE_ENV] = backend
+
+
+def split_word(word: str) -> List[str]:
+    """Split a space-free word at its CJK line break opportunities.
+
+    A break is possible between two characters when at least one of them is a
+    CJK character, unless kinsoku forbids it. Words without CJK characters are
+    never split.
+    """
+    if not CJK_PATTERN.search(word):
+        return [word]
+
+    clusters = []
+    start = 0
+    for i in range(1, len(word)):
+        before, after = word[i - 1], word[i]
+        if (
+            (CJK_PATTERN.match(before) or CJK_PATTERN.match(after))
+            and after not in NO_BREAK_BEFORE
+            and before not in NO_BREAK_AFTER
+        ):
+            clusters.append(word[start:i])
+            start = i
+    clusters.append(word[start:])
+    return clusters
+
+
+def wrap_line(line: str, max_width_px: float, font) -> List[str]:
+    """Wrap a single line of text to fit within max_width_px.
+
+    Lines break at spaces (the space is dropped) and at CJK break
+    opportunities (see split_word). Text is placed greedily; an unbreakable
+    cluster wider than the line gets a line of its own.
+
+    Returns:
+        list: The wrapped lines ([""] for an empty line)
+    """
+    backend = measure_backend()
+    if backend != "pil":
+        # NumPy is only needed for this backend
+        from glyph_layout import wrap_line_glyphs
+
+        return wrap_line_glyphs(
+            line, max_width_px, font, kerning=backend == "glyphs-kerning"
+        )
+
+    if not line:
+        return [""]
+
+    if measure(line, font) <= max_width_px:
+        return [line]
+
+    key = font_key(font)
+    space_width = token_width(" ", font, key)
+    tolerance = KERNING_TOLERANCE * (getattr(font, "size", None) or 10)
+
+    wrapped = []
+    # Pieces of the current line, and its width
+    current: List[str] = []
+    current_width = 0.0
+    # Piece boundaries added to current_width since it was last exact
+    boundaries = 0
+
+    for word in line.split(" "):
+        for i, cluster in enumerate(split_word(word)):
+            cluster_width = token_width(cluster, font, key)
+            if not current:
+                # Leading empty words (from repeated spaces) collapse into nothing
+                current = [cluster] if cluster else []
+                current_width, boundaries = cluster_width, 0
+                continue
+
+            # The first cluster of a word follows a space, the others join directly
+            separator = " " if i == 0 else ""
+            separator_width = space_width if i == 0 else 0.0
+            estimate = current_width + separator_width + cluster_width
+            margin = tolerance * (boundaries + 1)
+            if estimate <= max_width_px - margin:
+                fits = True
+            elif estimate > max_width_px + margin:
+                fits = False
+            else:
+                # Close to the break point: decide on the exact width
+                estimate = measure("".join(current) + separator + cluster, font)
+                fits = estimate <= max_width_px
+                boundaries = -1
+
+            if fits:
+                current.append(separator + cluster)
+                current_width = estimate
+                boundaries += 1
+            else:
+                wrapped.append("".join(current))
+                current = [cluster] if cluster else []
+                current_width, boundaries = cluster_width, 0
+
+    if current:
+        wrapped.append("".join(current))
+
+    return wrapped
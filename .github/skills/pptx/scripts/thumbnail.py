@@ -46,13 +46,19 @@ import sys
 import tempfile
 from pathlib import Path
 
+from fonts import load_font
 from inventory import extract_text_inventory
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 from pptx import Presentation
 
+# The soffice conversion client is shared with ooxml/scripts/pack.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "ooxml" / "scripts"))
+from soffice_service import ConversionError, convert_document  # noqa: E402
+
 # Constants
 THUMBNAIL_WIDTH = 300  # Fixed thumbnail width in pixels
 CONVERSION_DPI = 100  # DPI for PDF to image conversion
+PDF_TIMEOUT = 300  # Seconds allowed to render a deck to PDF
 MAX_COLS = 6  # Maximum number of columns
 DEFAULT_COLS = 5  # Default number of columns
 JPEG_QUALITY = 95  # JPEG compression quality
@@ -165,7 +171,7 @@ def get_placeholder_regions(pptx_path):
     slide_dimensions is a tuple of (width_inches, height_inches).
     """
     prs = Presentation(str(pptx_path))
-    inventory = extract_text_inventory(pptx_path, prs)
+    inventory = extract_text_inventory(pptx_path, prs, fields={"geometry"}, cache=True)
     placeholder_regions = {}
 
     # Get actual slide dimensions in inches (EMU to inches conversion)
@@ -212,25 +218,12 @@ def convert_to_images(pptx_path, temp_dir, dpi):
     if hidden_slides:
         print(f"Hidden slides: {sorted(hidden_slides)}")
 
-    pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
-
-    # Convert to PDF
+    # Convert to PDF (through the conversion service when it is running)
     print("Converting to PDF...")
-    result = subprocess.run(
-        [
-            "soffice",
-            "--headless",
-            "--convert-to",
-            "pdf",
-            "--outdir",
-            str(temp_dir),
-            str(pptx_path),
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0 or not pdf_path.exists():
-        raise RuntimeError("PDF conversion failed")
+    try:
+        pdf_path = convert_document(pptx_path, temp_dir, "pdf", timeout=PDF_TIMEOUT)
+    except (ConversionError, FileNotFoundError, subprocess.TimeoutExpired) as e:
+        raise RuntimeError(f"PDF conversion failed: {e}")
 
     # Convert PDF to images
     print(f"Converting to images at {dpi} DPI...")
@@ -347,10 +340,10 @@ def create_grid(
     # Load font with size based on thumbnail width
     try:
         # Use Pillow's default font with size
-        font = ImageFont.load_default(size=font_size)
+        font = load_font(None, font_size)
     except Exception:
         # Fall back to basic default font if size parameter not supported
-        font = ImageFont.load_default()
+        font = load_font(None)
 
     # Place thumbnails
     for i, img_path in enumerate(image_paths):